@@ -5,7 +5,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from ckeditor_uploader.widgets import CKEditorUploadingWidget
 
-from .models import Category, Tag, Post, Comment, LikeDislike
+from .models import Category, Tag, Post, Comment, PostReaction, CommentReaction, AuthorStats
 
 
 # =====================================================
@@ -39,7 +39,7 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title', 'body', 'author__username', 'author__first_name', 'author__last_name')
     prepopulated_fields = {"slug": ("title",)}  # Admin avto to‘ldiradi
     filter_horizontal = ('tags',)
-    readonly_fields = ('views', 'published_at', 'updated_at')
+    readonly_fields = ('views', 'likes_count', 'dislikes_count', 'comments_count', 'word_count', 'reading_time', 'published_at', 'updated_at')
     autocomplete_fields = ['author']  # Qidiriladigan muallif!
 
     fieldsets = (
@@ -54,7 +54,7 @@ class PostAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ("Statistika", {
-            'fields': ('views', 'published_at', 'updated_at'),
+            'fields': ('views', 'likes_count', 'dislikes_count', 'comments_count', 'word_count', 'reading_time', 'published_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
@@ -87,10 +87,12 @@ class PostAdmin(admin.ModelAdmin):
     def likes(self, obj):
         return obj.total_likes()
     likes.short_description = "Like"
+    likes.admin_order_field = 'likes_count'
 
     def comments(self, obj):
         return obj.total_comments()
     comments.short_description = "Izoh"
+    comments.admin_order_field = 'comments_count'
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('author', 'category')
@@ -154,11 +156,10 @@ class CommentAdmin(admin.ModelAdmin):
 # =====================================================
 # LIKE/DISLIKE
 # =====================================================
-@admin.register(LikeDislike)
-class LikeDislikeAdmin(admin.ModelAdmin):
-    list_display = ('user', 'content_type', 'object_id', 'value_display')
-    list_filter = ('value', 'content_type')
+class ReactionAdmin(admin.ModelAdmin):
+    list_filter = ('value',)
     search_fields = ('user__username',)
+    list_select_related = ('user',)
 
     def value_display(self, obj):
         return "Like" if obj.value == 1 else "Dislike"
@@ -167,4 +168,32 @@ class LikeDislikeAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         return False
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(PostReaction)
+class PostReactionAdmin(ReactionAdmin):
+    list_display = ('user', 'post', 'value_display', 'updated_at')
+    list_select_related = ('user', 'post')
+    raw_id_fields = ('post',)
+
+
+@admin.register(CommentReaction)
+class CommentReactionAdmin(ReactionAdmin):
+    list_display = ('user', 'comment_id', 'value_display', 'updated_at')
+    raw_id_fields = ('comment',)
+
+
+# =====================================================
+# MUALLIF STATISTIKASI (signallar yuritadi — faqat ko‘rish)
+# =====================================================
+@admin.register(AuthorStats)
+class AuthorStatsAdmin(admin.ModelAdmin):
+    list_display = ('author', 'post_count', 'total_views', 'total_likes', 'comment_count')
+    search_fields = ('author__username',)
+    ordering = ('-total_views',)
+
+    def has_add_permission(self, request):
+        return False
+    def has_change_permission(self, request, obj=None):
+        return False
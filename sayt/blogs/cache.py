@@ -0,0 +1,44 @@
+# blogs/cache.py
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# ------------------------------------------------------------------
+# Ro‘yxat keshining avlodi (generation) — har bir yozuvda oshiriladi.
+# Eski kalitlar o‘z-o‘zidan eskiradi, hech narsani o‘chirish shart emas.
+# ------------------------------------------------------------------
+LIST_GENERATION_KEY = 'blog_list_generation'
+LIST_CACHE_TIMEOUT = 60 * 5  # 5 minut
+
+
+def _new_generation(previous=None):
+    # Mikrosoniyalar — avvalgi avlodlar bilan hech qachon to‘qnashmaydi
+    return max(time.time_ns() // 1000, (previous or 0) + 1)
+
+
+def get_list_generation():
+    """Joriy avlod raqami (kesh tozalansa — vaqtga asoslangan yangi raqam)"""
+    generation = cache.get(LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(LIST_GENERATION_KEY, _new_generation(), None)
+        generation = cache.get(LIST_GENERATION_KEY)
+    return generation
+
+
+def bump_list_generation():
+    """Avlodni almashtirish — barcha ishchilardagi keshlangan sahifalar eskiradi.
+    incr emas: fayl keshida u atomik emas, parallel ikki yozuv bir xil raqam berardi."""
+    cache.set(LIST_GENERATION_KEY, _new_generation(cache.get(LIST_GENERATION_KEY)), None)
+
+
+def bump_list_generation_on_commit():
+    """Tranzaksiya yakunlangandan keyin oshirish (eski ma'lumot yangi kalitga tushmasin)"""
+    transaction.on_commit(bump_list_generation)
+
+
+def list_page_cache_key(request):
+    """Sahifa kaliti: avlod + yo‘l + so‘rov parametrlari"""
+    query = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"blog_list:{get_list_generation()}:{query}"
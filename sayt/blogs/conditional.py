@@ -0,0 +1,72 @@
+# blogs/conditional.py
+import hashlib
+from functools import wraps
+
+from django.contrib.messages import get_messages
+
+from .cache import get_list_generation
+from .models import Post
+from .viewcounts import view_counts
+
+# ------------------------------------------------------------------
+# Shartli GET (If-None-Match / If-Modified-Since → 304) validatorlari.
+# django.views.decorators.http.condition bilan ishlatiladi — funksiyalar
+# view dan oldin chaqiriladi, 304 da shablon ham, prefetch ham ishlamaydi.
+#
+# Sahifa foydalanuvchiga bog‘liq (like holati, menyu) — ETag da user id bor.
+# Navbatda flash xabar bo‘lsa, validator qaytarilmaydi (sahifa to‘liq chiziladi).
+# Ko‘rishlar condition dan tashqarida (count_post_view) yoziladi — 304 ham ko‘rish.
+# ------------------------------------------------------------------
+
+
+def _user_key(request):
+    return request.user.pk if request.user.is_authenticated else 0
+
+
+def _has_messages(request):
+    return bool(len(get_messages(request)))
+
+
+def _etag(*parts):
+    return hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def post_validators(request, pk):
+    """(updated_at, activity_at) — so‘rov davomida bir marta (etag va last_modified uchun)"""
+    if not hasattr(request, '_post_validators'):
+        request._post_validators = Post.objects.filter(pk=pk, is_published=True).values_list(
+            'updated_at', 'activity_at'
+        ).first()
+    return request._post_validators
+
+
+def count_post_view(view):
+    """Maqola ko‘rishini condition dan oldin buferga yozish: 304 javobda view ishlamaydi"""
+    @wraps(view)
+    def wrapper(request, *args, pk, **kwargs):
+        if post_validators(request, pk) is not None:  # Mavjud va nashr qilingan
+            view_counts.record(pk)
+        return view(request, *args, pk=pk, **kwargs)
+    return wrapper
+
+
+def post_detail_etag(request, pk, **kwargs):
+    validators = post_validators(request, pk)
+    if validators is None or _has_messages(request):
+        return None  # 404 yoki xabar — view o‘zi hal qiladi
+    updated_at, activity_at = validators
+    return _etag('post', pk, updated_at.isoformat(), activity_at.isoformat(), _user_key(request))
+
+
+def post_detail_last_modified(request, pk, **kwargs):
+    validators = post_validators(request, pk)
+    if validators is None or _has_messages(request):
+        return None
+    return max(validators)
+
+
+def post_list_etag(request, *args, **kwargs):
+    # Avlod har qanday maqola / izoh / like / teg o‘zgarishida oshadi (blogs/cache.py)
+    if _has_messages(request):
+        return None
+    return _etag('list', get_list_generation(), request.get_full_path(), _user_key(request))
@@ -0,0 +1,199 @@
+# blogs/counters.py
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from . import events
+
+LIKE = 1
+DISLIKE = -1
+
+# ------------------------------------------------------------------
+# Like/dislike va izoh hisoblagichlari — faqat F() orqali atomik yangilash
+# ------------------------------------------------------------------
+
+
+def reaction_deltas(old_value, new_value):
+    """Eski va yangi qiymatdan {'likes_count': ±1, 'dislikes_count': ±1} farqlari"""
+    deltas = {'likes_count': 0, 'dislikes_count': 0}
+    for value, step in ((old_value, -1), (new_value, 1)):
+        if value == LIKE:
+            deltas['likes_count'] += step
+        elif value == DISLIKE:
+            deltas['dislikes_count'] += step
+    return {field: delta for field, delta in deltas.items() if delta}
+
+
+def apply_deltas(model, pk, deltas):
+    if deltas:
+        model.objects.filter(pk=pk).update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def apply_reaction_change(model, object_id, old_value, new_value):
+    """PostReaction / CommentReaction yaratildi / almashtirildi / o‘chirildi (model — Post yoki Comment)"""
+    deltas = reaction_deltas(old_value, new_value)
+    # Hisoblagich va activity_seq — bitta tranzaksiyada: SSE snapshot ikkalasini izchil ko‘radi
+    with transaction.atomic():
+        apply_deltas(model, object_id, deltas)
+        if model._meta.label == 'blogs.Post':
+            activity = touch_post_activity(pk=object_id)
+            if deltas.get('likes_count'):
+                apply_post_author_likes(object_id, deltas['likes_count'])
+        else:
+            activity = touch_post_activity(comments__pk=object_id)
+    events.publish_reaction(model, object_id, deltas, activity)
+
+
+def apply_comment_change(post_id, was_approved, is_approved):
+    """Izoh yaratildi / o‘zgardi / o‘chirildi (tasdiq holati bilan) — qaytaradi: touch_post_activity natijasi"""
+    delta = int(bool(is_approved)) - int(bool(was_approved))
+    with transaction.atomic():
+        if delta:
+            from .models import Post
+            apply_deltas(Post, post_id, {'comments_count': delta})
+        return touch_post_activity(pk=post_id)
+
+
+def touch_post_activity(**lookup):
+    """Maqolaning activity_at (ETag eskiradi) va activity_seq ini yangilash (izoh yoki reaksiya o‘zgardi).
+
+    Qaytaradi: (post_id, activity_seq) — SSE hodisasi uchun, faqat obunachilar bo‘lsa;
+    aks holda None. Chaqiruvchi tranzaksiya ichida — o‘qilgan seq aynan shu o‘zgarishniki.
+    """
+    from .models import Post
+    Post.objects.filter(**lookup).update(activity_at=timezone.now(), activity_seq=F('activity_seq') + 1)
+    if events.bus.active:
+        return Post.objects.filter(**lookup).values_list('pk', 'activity_seq').first()
+    return None
+
+
+def recount_activity(Post, Comment):
+    """activity_at = max(updated_at, oxirgi izoh vaqti).
+    Modellar argument sifatida — migratsiyada ham ishlatiladi."""
+    last_comment = Subquery(
+        Comment.objects.filter(post=OuterRef('pk')).order_by().values('post')
+        .annotate(last=Max('created_at')).values('last')
+    )
+    return Post.objects.update(activity_at=Greatest('updated_at', Coalesce(last_comment, 'updated_at')))
+
+
+def _reaction_count(reactions, target_field, value):
+    return Coalesce(Subquery(
+        reactions.objects.filter(**{target_field: OuterRef('pk')}, value=value)
+        .order_by().values(target_field).annotate(total=Count('pk')).values('total')
+    ), Value(0))
+
+
+def recount_all(Post, Comment, PostReaction, CommentReaction):
+    """Barcha hisoblagichlarni reaksiya jadvallaridan qayta hisoblash (drift tuzatish).
+    Modellar argument sifatida — migratsiyada ham ishlatiladi."""
+    approved = Coalesce(Subquery(
+        Comment.objects.filter(post=OuterRef('pk'), is_approved=True)
+        .order_by().values('post').annotate(total=Count('pk')).values('total')
+    ), Value(0))
+    posts = Post.objects.update(
+        likes_count=_reaction_count(PostReaction, 'post', LIKE),
+        dislikes_count=_reaction_count(PostReaction, 'post', DISLIKE),
+        comments_count=approved,
+    )
+    comments = Comment.objects.update(
+        likes_count=_reaction_count(CommentReaction, 'comment', LIKE),
+        dislikes_count=_reaction_count(CommentReaction, 'comment', DISLIKE),
+    )
+    return posts, comments
+
+
+# ------------------------------------------------------------------
+# Muallif statistikasi (AuthorStats)
+# Tez yo‘llar faqat mavjud qatorni yangilaydi. Qator yo‘q bo‘lsa (yangi muallif) —
+# commit dan keyin refresh_author_stats(create=True) yaratadi; o‘qish view lari yozmaydi.
+# ------------------------------------------------------------------
+AUTHOR_STATS_FIELDS = ('post_count', 'total_views', 'total_likes', 'comment_count')
+
+
+def apply_author_deltas(author_id, deltas):
+    from .models import AuthorStats
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas and not AuthorStats.objects.filter(author_id=author_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    ):
+        transaction.on_commit(lambda: refresh_author_stats(author_id, create=True))
+
+
+def apply_post_author_likes(post_id, delta):
+    """Nashr qilingan maqolaga like — muallifning total_likes iga (bitta UPDATE)"""
+    from .models import AuthorStats
+    AuthorStats.objects.filter(
+        author__blog_posts__pk=post_id, author__blog_posts__is_published=True
+    ).update(total_likes=F('total_likes') + delta)
+
+
+def apply_author_views(view_deltas):
+    """{post_id: delta} → mualliflar bo‘yicha yig‘ib, bitta UPDATE"""
+    from .models import AuthorStats, Post
+    per_author = defaultdict(int)
+    for pk, author_id in Post.objects.filter(pk__in=view_deltas, is_published=True).values_list('pk', 'author_id'):
+        per_author[author_id] += view_deltas[pk]
+    if per_author:
+        AuthorStats.objects.filter(author_id__in=per_author).update(total_views=F('total_views') + Case(
+            *[When(author_id=author_id, then=Value(delta)) for author_id, delta in per_author.items()],
+            default=Value(0),
+        ))
+
+
+def _author_totals(Post, Comment):
+    posts = Post.objects.filter(author=OuterRef('pk'), is_published=True).order_by().values('author')
+
+    def total(queryset, aggregate):
+        return Coalesce(Subquery(queryset.annotate(total=aggregate).values('total')), Value(0))
+
+    return {
+        'post_count': total(posts, Count('pk')),
+        'total_views': total(posts, Sum('views')),
+        'total_likes': total(posts, Sum('likes_count')),
+        'comment_count': total(Comment.objects.filter(author=OuterRef('pk')).order_by().values('author'), Count('pk')),
+    }
+
+
+def author_totals(author_id):
+    """Muallif statistikasi to‘g‘ridan-to‘g‘ri jadvallardan: {maydon: qiymat} yoki None (foydalanuvchi yo‘q)"""
+    from django.contrib.auth import get_user_model
+    from .models import Comment, Post
+    return get_user_model().objects.filter(pk=author_id).annotate(
+        **_author_totals(Post, Comment)
+    ).values(*AUTHOR_STATS_FIELDS).first()
+
+
+def refresh_author_stats(author_id, create=False):
+    """Bitta muallif statistikasini to‘liq qayta hisoblash — qaytaradi: AuthorStats yoki None"""
+    from .models import AuthorStats
+
+    # Tranzaksiya — hisoblash va yozish bitta holatda (va replikadan emas, asosiy bazadan o‘qiladi)
+    with transaction.atomic():
+        totals = author_totals(author_id)
+        if totals is None:
+            return None  # Foydalanuvchi o‘chirilgan
+        if not AuthorStats.objects.filter(author_id=author_id).update(**totals):
+            if not create:
+                return None
+            try:
+                with transaction.atomic():
+                    AuthorStats.objects.create(author_id=author_id, **totals)
+            except IntegrityError:
+                AuthorStats.objects.filter(author_id=author_id).update(**totals)  # Parallel so‘rov yaratib bo‘ldi
+    return AuthorStats(author_id=author_id, **totals)
+
+
+def recount_author_stats(User, Post, Comment, AuthorStats):
+    """Jadvalni noldan qurish: maqolasi yoki izohi bor barcha mualliflar.
+    Modellar argument sifatida — migratsiyada ham ishlatiladi."""
+    rows = User.objects.annotate(**_author_totals(Post, Comment)).filter(
+        Q(post_count__gt=0) | Q(comment_count__gt=0) | Q(pk__in=AuthorStats.objects.values('author_id'))
+    ).values_list('pk', *AUTHOR_STATS_FIELDS)
+    entries = [AuthorStats(author_id=pk, **dict(zip(AUTHOR_STATS_FIELDS, values))) for pk, *values in rows]
+    AuthorStats.objects.all().delete()
+    AuthorStats.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
@@ -0,0 +1,114 @@
+# blogs/events.py
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+
+# ------------------------------------------------------------------
+# Jarayon ichidagi pub/sub: maqola sahifasidagi SSE oqimlariga
+# like/dislike deltalari va yangi izohlar haqida xabar.
+#
+# Obunachilar — ASGI hodisa siklidagi asyncio.Queue lar (har biriga
+# alohida oqim yoki DB ulanishi kerak emas). Nashr qiluvchi — istalgan
+# oqim (sinxron view, signal): navbatga call_soon_threadsafe orqali.
+# Hodisalar faqat tranzaksiya commit bo‘lgandan keyin yuboriladi.
+#
+# Cheklov: bitta jarayon — yozuv va oqim shu ASGI ishchisida bo‘lishi kerak.
+#
+# Har hodisada seq — o‘zgarishdan keyingi Post.activity_seq. Obuna snapshot dan
+# oldin ochiladi, shuning uchun snapshot ga allaqachon kirgan deltalar ham
+# kelishi mumkin — mijoz seq i snapshot nikidan katta bo‘lmaganlarini tashlaydi.
+# ------------------------------------------------------------------
+MAX_QUEUE = 100  # Sekin mijoz — eng eski hodisalar tashlanadi
+
+
+def _deliver(queue, event):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)  # post_id → {(loop, queue), ...}
+
+    @property
+    def active(self):
+        """Hech kim tinglamasa — nashr qiluvchilar qo‘shimcha so‘rov qilmaydi"""
+        return bool(self._subscribers)
+
+    def subscribe(self, post_id):
+        """Joriy hodisa siklida navbat ochish — qaytaradi: kalit (unsubscribe uchun)"""
+        entry = (asyncio.get_running_loop(), asyncio.Queue(MAX_QUEUE))
+        with self._lock:
+            self._subscribers[post_id].add(entry)
+        return entry
+
+    def unsubscribe(self, post_id, entry):
+        with self._lock:
+            subscribers = self._subscribers.get(post_id)
+            if subscribers is not None:
+                subscribers.discard(entry)
+                if not subscribers:
+                    del self._subscribers[post_id]
+
+    def publish(self, post_id, name, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(post_id, ()))
+        event = (name, data)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_deliver, queue, event)
+            except RuntimeError:
+                pass  # Sikl yopilgan — obunachi o‘zi chiqib ketadi
+
+
+bus = EventBus()
+
+
+def publish_on_commit(post_id, name, data):
+    if bus.active:
+        transaction.on_commit(lambda: bus.publish(post_id, name, data))
+
+
+def format_event(name, data):
+    """SSE kadri"""
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# ------------------------------------------------------------------
+# Nashr qiluvchilar (counters.py va signals.py chaqiradi)
+# ------------------------------------------------------------------
+def publish_reaction(model, object_id, deltas, activity):
+    """Like/dislike o‘zgarishi: {'type': 'post'|'comment', 'id', 'likes': ±1, 'dislikes': ±1, 'seq'}
+
+    activity — touch_post_activity natijasi: (post_id, activity_seq) yoki None.
+    """
+    if activity is None or not deltas:
+        return
+    post_id, seq = activity
+    publish_on_commit(post_id, 'reaction', {
+        'type': 'post' if model._meta.label == 'blogs.Post' else 'comment',
+        'id': int(object_id),
+        'likes': deltas.get('likes_count', 0),
+        'dislikes': deltas.get('dislikes_count', 0),
+        'seq': seq,
+    })
+
+
+def publish_comment(comment, delta, activity, created=False):
+    """Izohlar soni o‘zgardi; yangi tasdiqlangan izoh bo‘lsa — uning qisqa ma'lumoti"""
+    if activity is None or not (delta or created):
+        return
+    post_id, seq = activity
+    data = {'delta': delta, 'seq': seq}
+    if created and comment.is_approved:
+        data['comment'] = {
+            'id': comment.pk,
+            'author': comment.author.get_full_name() or comment.author.get_username(),
+            'content': comment.content[:300],
+        }
+    publish_on_commit(post_id, 'comment', data)
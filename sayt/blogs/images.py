@@ -0,0 +1,122 @@
+# blogs/images.py
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Muqova rasmi uchun kichraytirilgan nusxalar (WebP + JPEG).
+# Nusxalar asl fayl yonida saqlanadi: name.w640.webp, name.w640.jpg
+# Post.image_variants: {"webp": {"640": "blog/...w640.webp"}, "jpeg": {...}}
+# ------------------------------------------------------------------
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# So‘rov oqimidan tashqarida ishlash uchun (saqlashni sekinlashtirmaydi)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-variants')
+
+
+def variant_name(name, width, fmt):
+    root, _ = os.path.splitext(name)
+    return f"{root}.w{width}.{VARIANT_FORMATS[fmt][1]}"
+
+
+def _flatten(image):
+    """JPEG uchun shaffoflikni oq fonga yotqizish"""
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_variants(source):
+    """Fayl yo‘li yoki fayl obyektidan {fmt: {width: bytes}}.
+
+    Django ga bog‘liq emas — jarayonlar hovuzida (process pool) ham ishlaydi.
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        rgb = _flatten(image)
+        widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+
+        rendered = {fmt: {} for fmt in VARIANT_FORMATS}
+        for width in widths:
+            height = max(round(image.height * width / image.width), 1)
+            resized = rgb.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt, (pil_format, _, options) in VARIANT_FORMATS.items():
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, **options)
+                rendered[fmt][width] = buffer.getvalue()
+        return rendered
+
+
+def store_variants(name, rendered, storage=default_storage):
+    variants = {}
+    for fmt, by_width in rendered.items():
+        for width, data in by_width.items():
+            target = variant_name(name, width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+            variants.setdefault(fmt, {})[str(width)] = storage.save(target, ContentFile(data))
+    return variants
+
+
+def delete_variants(variants, keep=(), storage=default_storage):
+    for by_width in (variants or {}).values():
+        for name in by_width.values():
+            if name not in keep and storage.exists(name):
+                storage.delete(name)
+
+
+def save_variants(post_id, image_name, rendered, stale=None):
+    """Nusxalarni saqlab, Post.image_variants ni yangilash (rasm o‘zgarmagan bo‘lsa)"""
+    from .cache import bump_list_generation
+    from .models import Post
+
+    variants = store_variants(image_name, rendered)
+    keep = {name for by_width in variants.values() for name in by_width.values()}
+    delete_variants(stale, keep=keep)
+    # signalsiz yangilash — save() qayta nusxa yaratishni boshlamasin
+    updated = Post.objects.filter(pk=post_id, main_image=image_name).update(image_variants=variants)
+    if updated:
+        bump_list_generation()
+    else:
+        delete_variants(variants)  # Bu orada rasm almashtirilgan
+    return variants
+
+
+def build_variants(post_id, stale=None):
+    from .models import Post
+
+    post = Post.objects.only('pk', 'main_image').filter(pk=post_id).first()
+    if post is None or not post.main_image:
+        return None
+    with post.main_image.open('rb') as image_file:
+        rendered = render_variants(image_file)
+    return save_variants(post.pk, post.main_image.name, rendered, stale)
+
+
+def _build_in_background(post_id, stale):
+    try:
+        build_variants(post_id, stale)
+    except Exception:
+        logger.exception("Rasm nusxalarini yaratib bo‘lmadi (post %s)", post_id)
+    finally:
+        connection.close()
+
+
+def schedule_variants(post_id, stale=None):
+    """Tranzaksiya yakunlangach fon oqimida nusxalarni yaratish"""
+    transaction.on_commit(lambda: _executor.submit(_build_in_background, post_id, stale))
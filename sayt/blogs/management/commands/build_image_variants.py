@@ -0,0 +1,49 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from blogs.images import render_variants, save_variants
+from blogs.models import Post
+
+
+class Command(BaseCommand):
+    help = "Mavjud muqova rasmlari uchun WebP/JPEG nusxalarni parallel yaratish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--force', action='store_true', help="Nusxasi borlarini ham qayta yaratish")
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.exclude(main_image='').only('pk', 'main_image', 'image_variants').order_by('pk')
+        if not options['force']:
+            queryset = queryset.filter(image_variants={})
+        total = queryset.count()
+        done = failed = 0
+        last_pk = 0
+
+        # Og‘ir ish (dekodlash, kichraytirish, kodlash) — alohida jarayonlarda,
+        # saqlash va bazaga yozish — asosiy jarayonda
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                futures = {
+                    pool.submit(render_variants, post.main_image.path): post
+                    for post in batch
+                }
+                for future in as_completed(futures):
+                    post = futures[future]
+                    try:
+                        save_variants(post.pk, post.main_image.name, future.result(), stale=post.image_variants)
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"#{post.pk} {post.main_image.name}: {exc}")
+                    else:
+                        done += 1
+                self.stdout.write(f"{done + failed}/{total}")
+
+        self.stdout.write(self.style.SUCCESS(f"Tayyor: {done} ta maqola, xato: {failed}"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blogs.viewcounts import POLL_INTERVAL, request_flush
+
+
+class Command(BaseCommand):
+    help = "Ishchi jarayonlardan buferdagi ko‘rishlar sonini darhol bazaga yozishni so‘rash"
+
+    def handle(self, *args, **options):
+        # Bufer ishchilar xotirasida — buyruq jarayonida u doim bo‘sh.
+        # So‘rov umumiy kesh (CACHES) orqali yetadi, fon oqimlari uni har POLL_INTERVAL da tekshiradi.
+        request_flush()
+        self.stdout.write(self.style.SUCCESS(
+            f"Yozish so‘raldi: ishchilar buferlarini {POLL_INTERVAL} s ichida bazaga yozadi"
+        ))
@@ -0,0 +1,78 @@
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blogs.cache import bump_list_generation
+from blogs.images import variant_name
+from blogs.models import Post, is_sharded_image_name, post_image_upload_path
+
+
+class Command(BaseCommand):
+    help = "Muqova rasmlarini yangi (muallif/xesh) papkalarga ko‘chirish va FileField qiymatlarini yangilash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--dry-run', action='store_true', help="Faqat nima ko‘chishini ko‘rsatish")
+
+    def handle(self, *args, **options):
+        moved = skipped = missing = 0
+        last_pk = 0
+        queryset = Post.objects.exclude(main_image='').only(
+            'pk', 'slug', 'author_id', 'main_image', 'image_variants'
+        ).order_by('pk')
+
+        # Partiyalab — barcha maqolalar bir vaqtda xotiraga yuklanmaydi
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            changed, obsolete = [], []
+            for post in batch:
+                old_name = post.main_image.name
+                if is_sharded_image_name(old_name, post.author_id):
+                    skipped += 1
+                    continue
+                target = post_image_upload_path(post, old_name)
+                storage = post.main_image.storage
+                if not storage.exists(old_name):
+                    missing += 1
+                    self.stderr.write(f"#{post.pk}: fayl topilmadi — {old_name}")
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f"#{post.pk}: {old_name} → {target}")
+                    moved += 1
+                    continue
+
+                # Avval nusxa (dedup omborida — faqat havola), eski fayllar commit dan keyin o‘chiriladi
+                post.main_image.name = self._copy(storage, old_name, target)
+                variants = {}
+                for fmt, by_width in (post.image_variants or {}).items():
+                    for width, name in by_width.items():
+                        if storage.exists(name):
+                            variants.setdefault(fmt, {})[width] = self._copy(
+                                storage, name, variant_name(post.main_image.name, int(width), fmt)
+                            )
+                            obsolete.append(name)
+                post.image_variants = variants
+                obsolete.append(old_name)
+                changed.append(post)
+
+            if changed:
+                with transaction.atomic():
+                    Post.objects.bulk_update(changed, ['main_image', 'image_variants'])
+                for name in obsolete:
+                    storage.delete(name)
+                moved += len(changed)
+            self.stdout.write(f"... #{last_pk} gacha: ko‘chirildi {moved}, o‘tkazildi {skipped}")
+
+        if moved and not options['dry_run']:
+            bump_list_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f"Tayyor: ko‘chirildi {moved}, allaqachon joyida {skipped}, fayli yo‘q {missing}"
+        ))
+
+    def _copy(self, storage, source, target):
+        with storage.open(source, 'rb') as f:
+            return storage.save(target, File(f))
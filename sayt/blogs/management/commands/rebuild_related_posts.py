@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blogs.related import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "O‘xshash maqolalar indeksini butunlay qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        total = rebuild_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"O‘xshash maqolalar qayta hisoblandi: {total} ta maqola"))
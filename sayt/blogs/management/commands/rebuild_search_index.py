@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blogs import search
+
+
+class Command(BaseCommand):
+    help = "Maqolalar uchun FTS5 qidiruv indeksini qaytadan qurish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError("FTS5 indeksi faqat SQLite bazasida ishlaydi")
+        total = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Qidiruv indeksi qayta qurildi: {total} ta maqola"))
@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blogs.counters import recount_all, recount_author_stats
+from blogs.models import Post, Comment, PostReaction, CommentReaction, AuthorStats
+
+
+class Command(BaseCommand):
+    help = "Like/dislike, izoh va muallif statistikasi hisoblagichlarini qayta hisoblash"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            posts, comments = recount_all(Post, Comment, PostReaction, CommentReaction)
+            authors = recount_author_stats(get_user_model(), Post, Comment, AuthorStats)
+        self.stdout.write(self.style.SUCCESS(
+            f"Qayta hisoblandi: {posts} ta maqola, {comments} ta izoh, {authors} ta muallif"
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blogs.cache import bump_list_generation
+from blogs.models import Post
+from blogs.rendering import rerender_posts
+
+
+class Command(BaseCommand):
+    help = "Maqolalarning tayyor HTML, qisqa matn va o‘qish vaqtini qayta hisoblash (tozalash qoidalari o‘zgarganda)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help="Bir partiyadagi maqolalar soni")
+
+    def handle(self, *args, **options):
+        total = rerender_posts(Post, options['batch_size'])
+        bump_list_generation()  # Ro‘yxat keshidagi qisqa matnlar eskirdi
+        self.stdout.write(self.style.SUCCESS(f"Qayta ishlandi: {total} ta maqola"))
@@ -0,0 +1,51 @@
+import re
+from html import unescape
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+# O‘sha paytdagi blogs.search dan muzlatilgan nusxa — jonli kod o‘zgarsa ham migratsiya o‘zgarmaydi
+FTS_TABLE = 'blogs_post_fts'
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, body, tags, author, tokenize='unicode61 remove_diacritics 2')"
+)
+DROP_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+_SPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(html):
+    return _SPACE_RE.sub(' ', unescape(strip_tags(html or ''))).strip()
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Post = apps.get_model('blogs', 'Post')
+    rows = [
+        (post.pk, post.title, html_to_text(post.body), ' '.join(tag.name for tag in post.tags.all()), post.author.username)
+        for post in Post.objects.filter(is_published=True).select_related('author').prefetch_related('tags')
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CREATE_TABLE_SQL)
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, body, tags, author) VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(DROP_TABLE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
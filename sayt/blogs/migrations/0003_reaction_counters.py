@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _reaction_count(LikeDislike, model_name, value):
+    # O‘sha paytdagi generic LikeDislike jadvalidan (0011 da tipli jadvallarga ko‘chirilgan)
+    return Coalesce(Subquery(
+        LikeDislike.objects.filter(
+            content_type__app_label='blogs', content_type__model=model_name, object_id=OuterRef('pk'), value=value,
+        ).order_by().values('object_id').annotate(total=Count('pk')).values('total')
+    ), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model('blogs', 'Post')
+    Comment = apps.get_model('blogs', 'Comment')
+    LikeDislike = apps.get_model('blogs', 'LikeDislike')
+    approved = Coalesce(Subquery(
+        Comment.objects.filter(post=OuterRef('pk'), is_approved=True)
+        .order_by().values('post').annotate(total=Count('pk')).values('total')
+    ), Value(0))
+    Post.objects.update(
+        likes_count=_reaction_count(LikeDislike, 'post', 1),
+        dislikes_count=_reaction_count(LikeDislike, 'post', -1),
+        comments_count=approved,
+    )
+    Comment.objects.update(
+        likes_count=_reaction_count(LikeDislike, 'comment', 1),
+        dislikes_count=_reaction_count(LikeDislike, 'comment', -1),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0002_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Dislike soni'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Like soni'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Izohlar soni'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Dislike soni'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Like soni'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
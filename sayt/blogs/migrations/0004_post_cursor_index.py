@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0003_reaction_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_published', '-published_at', '-id'], name='blogs_post_is_publ_b87ff0_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def queue_related_rebuild(apps, schema_editor):
+    # Indeks jonli blogs.related bilan ishchida quriladi (manage.py run_jobs) —
+    # ball formulasi keyin o‘zgarsa ham migratsiyada eski nusxa qolmaydi
+    Post = apps.get_model('blogs', 'Post')
+    Job = apps.get_model('jobs', 'Job')
+    if Post.objects.filter(is_published=True).exists():
+        Job.objects.create(name='blogs.rebuild_related', payload={}, max_attempts=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0004_post_cursor_index'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='O‘xshashlik')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='blogs.post')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blogs.post')),
+            ],
+            options={
+                'verbose_name': 'O‘xshash maqola',
+                'verbose_name_plural': 'O‘xshash maqolalar',
+                'indexes': [models.Index(fields=['post', '-score'], name='blogs_relat_post_id_33a737_idx')],
+                'unique_together': {('post', 'related')},
+            },
+        ),
+        migrations.RunPython(queue_related_rebuild, migrations.RunPython.noop),
+    ]
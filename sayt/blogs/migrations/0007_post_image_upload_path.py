@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:40
+
+import blogs.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0006_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='main_image',
+            field=models.ImageField(help_text='Majburiy muqova rasmi', upload_to=blogs.models.post_image_upload_path, verbose_name='Asosiy rasm'),
+        ),
+    ]
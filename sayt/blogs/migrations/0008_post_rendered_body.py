@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:42
+
+from django.db import migrations, models
+
+# Faqat sxema. Mavjud maqolalar joriy tozalash qoidalari bilan alohida to‘ldiriladi:
+#   python manage.py render_post_bodies
+# (migratsiyadagi muzlatilgan sanitizer nusxasi eskirib, xavfsiz bo‘lmay qolishi mumkin edi)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0007_post_image_upload_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='body_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Qisqa matn'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='O‘qish vaqti (daqiqa)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='So‘zlar soni'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+# O‘sha paytdagi blogs.counters.recount_author_stats dan muzlatilgan nusxa
+AUTHOR_STATS_FIELDS = ('post_count', 'total_views', 'total_likes', 'comment_count')
+
+
+def _total(queryset, aggregate):
+    return Coalesce(Subquery(queryset.annotate(total=aggregate).values('total')), Value(0))
+
+
+def fill_author_stats(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Post = apps.get_model('blogs', 'Post')
+    Comment = apps.get_model('blogs', 'Comment')
+    AuthorStats = apps.get_model('blogs', 'AuthorStats')
+
+    posts = Post.objects.filter(author=OuterRef('pk'), is_published=True).order_by().values('author')
+    rows = User.objects.annotate(
+        post_count=_total(posts, Count('pk')),
+        total_views=_total(posts, Sum('views')),
+        total_likes=_total(posts, Sum('likes_count')),
+        comment_count=_total(Comment.objects.filter(author=OuterRef('pk')).order_by().values('author'), Count('pk')),
+    ).filter(Q(post_count__gt=0) | Q(comment_count__gt=0)).values_list('pk', *AUTHOR_STATS_FIELDS)
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(author_id=pk, **dict(zip(AUTHOR_STATS_FIELDS, values))) for pk, *values in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blogs', '0008_post_rendered_body'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='blog_stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Muallif')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Nashr qilingan maqolalar')),
+                ('total_views', models.PositiveIntegerField(default=0, verbose_name='Ko‘rishlar soni')),
+                ('total_likes', models.PositiveIntegerField(default=0, verbose_name='Like soni')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Yozgan izohlari')),
+            ],
+            options={
+                'verbose_name': 'Muallif statistikasi',
+                'verbose_name_plural': 'Mualliflar statistikasi',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
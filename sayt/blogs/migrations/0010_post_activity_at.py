@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:54
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def fill_activity_at(apps, schema_editor):
+    # O‘sha paytdagi blogs.counters.recount_activity dan muzlatilgan nusxa
+    Post = apps.get_model('blogs', 'Post')
+    Comment = apps.get_model('blogs', 'Comment')
+    last_comment = Subquery(
+        Comment.objects.filter(post=OuterRef('pk')).order_by().values('post')
+        .annotate(last=Max('created_at')).values('last')
+    )
+    Post.objects.update(activity_at=Greatest('updated_at', Coalesce(last_comment, 'updated_at')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0009_author_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Oxirgi faollik'),
+        ),
+        migrations.RunPython(fill_activity_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+# (model nomi, reaksiya jadvali, FK maydoni)
+TARGETS = (('post', 'PostReaction', 'post'), ('comment', 'CommentReaction', 'comment'))
+
+
+def copy_reactions(apps, schema_editor):
+    """LikeDislike (content_type + object_id) → PostReaction / CommentReaction"""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    LikeDislike = apps.get_model('blogs', 'LikeDislike')
+    for model_name, table_name, field in TARGETS:
+        content_type = ContentType.objects.filter(app_label='blogs', model=model_name).first()
+        if content_type is None:
+            continue
+        target = apps.get_model('blogs', model_name)
+        table = apps.get_model('blogs', table_name)
+        rows = LikeDislike.objects.filter(
+            content_type=content_type,
+            object_id__in=target.objects.values('pk'),  # Generic bog‘lanishda FK yo‘q edi — yetim qatorlar tashlanadi
+        ).values_list('user_id', 'object_id', 'value').iterator(chunk_size=BATCH_SIZE)
+        batch = []
+        for user_id, object_id, value in rows:
+            batch.append(table(user_id=user_id, value=value, **{f'{field}_id': object_id}))
+            if len(batch) >= BATCH_SIZE:
+                table.objects.bulk_create(batch)
+                batch = []
+        table.objects.bulk_create(batch)
+
+
+def restore_reactions(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    LikeDislike = apps.get_model('blogs', 'LikeDislike')
+    for model_name, table_name, field in TARGETS:
+        content_type, _ = ContentType.objects.get_or_create(app_label='blogs', model=model_name)
+        rows = apps.get_model('blogs', table_name).objects.values_list('user_id', f'{field}_id', 'value')
+        LikeDislike.objects.bulk_create(
+            [LikeDislike(user_id=user_id, content_type=content_type, object_id=object_id, value=value)
+             for user_id, object_id, value in rows.iterator(chunk_size=BATCH_SIZE)],
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0010_post_activity_at'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentReaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Like'), (-1, 'Dislike')])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='blogs.comment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Izoh reaksiyasi',
+                'verbose_name_plural': 'Izoh reaksiyalari',
+            },
+        ),
+        migrations.CreateModel(
+            name='PostReaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Like'), (-1, 'Dislike')])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='blogs.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Maqola reaksiyasi',
+                'verbose_name_plural': 'Maqola reaksiyalari',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='commentreaction',
+            index=models.Index(fields=['comment', 'value'], name='blogs_comme_comment_98ca38_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='commentreaction',
+            constraint=models.UniqueConstraint(fields=('user', 'comment'), name='unique_comment_reaction'),
+        ),
+        migrations.AddIndex(
+            model_name='postreaction',
+            index=models.Index(fields=['post', 'value'], name='blogs_postr_post_id_07c3c3_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='postreaction',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='unique_post_reaction'),
+        ),
+        migrations.RunPython(copy_reactions, restore_reactions),
+        migrations.DeleteModel(
+            name='LikeDislike',
+        ),
+    ]
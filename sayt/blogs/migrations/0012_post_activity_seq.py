@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0011_typed_reactions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='activity_seq',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Faollik tartib raqami'),
+        ),
+    ]
@@ -1,11 +1,30 @@
 # blogs/models.py
+import hashlib
+import os
+import re
+
 from django.db import models
 from django.conf import settings
 from django.utils.text import slugify
+from django.utils import timezone
 from django.urls import reverse
 from ckeditor_uploader.fields import RichTextUploadingField
-from django.contrib.contenttypes.fields import GenericRelation
-from django.contrib.contenttypes.models import ContentType
+
+from . import rendering
+
+
+# Signallar, ko‘rishlar buferi va rasm ishchisi F() / update() bilan yozadigan maydonlar —
+# mavjud qatorni to‘liq save() qilganda xotiradagi eski qiymat bazadagisining ustidan yozilmasin
+BACKGROUND_FIELDS = frozenset({
+    'likes_count', 'dislikes_count', 'comments_count', 'activity_at', 'activity_seq', 'views', 'image_variants',
+})
+
+
+def fields_for_full_save(instance):
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in BACKGROUND_FIELDS
+    ]
 
 
 # ------------------------------------------------------------------
@@ -46,30 +65,22 @@ class Tag(models.Model):
 
 
 # ------------------------------------------------------------------
-# Like / Dislike uchun universal model (Post va Comment ga ham ishlaydi)
+# Muqova rasmi yo‘li: muallif bo‘yicha + xesh prefiksi (256 ta papka)
+# blog/main_images/<author_id>/<xx>/<fayl>
 # ------------------------------------------------------------------
-class LikeDislike(models.Model):
-    LIKE = 1
-    DISLIKE = -1
-    VALUE_CHOICES = (
-        (LIKE, 'Like'),
-        (DISLIKE, 'Dislike'),
-    )
+POST_IMAGE_DIR = 'blog/main_images'
 
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    value = models.SmallIntegerField(choices=VALUE_CHOICES)
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
-    object_id = models.PositiveIntegerField()
-    content_object = GenericRelation('LikeDislike', related_query_name='likes')  # Generic relation
 
-    class Meta:
-        unique_together = ('user', 'content_type', 'object_id')
-        indexes = [
-            models.Index(fields=['content_type', 'object_id']),
-        ]
+def post_image_upload_path(instance, filename):
+    filename = os.path.basename(filename)
+    shard = hashlib.md5(f"{instance.slug}/{filename}".encode()).hexdigest()[:2]
+    return f"{POST_IMAGE_DIR}/{instance.author_id}/{shard}/{filename}"
 
-    def __str__(self):
-        return f"{self.user} → {self.value}"
+
+def is_sharded_image_name(name, author_id):
+    """Fayl allaqachon <muallif>/<xx>/ tartibida. Xeshni qayta hisoblab bo‘lmaydi —
+    get_available_name qo‘shimchasidan keyin nom (va xesh) boshqacha bo‘ladi."""
+    return re.fullmatch(rf"{POST_IMAGE_DIR}/{author_id}/[0-9a-f]{{2}}/[^/]+", name or '') is not None
 
 
 # ------------------------------------------------------------------
@@ -87,15 +98,23 @@ class Post(models.Model):
     )
 
     main_image = models.ImageField(
-        upload_to='blog/main_images/{author.id}',
+        upload_to=post_image_upload_path,
         verbose_name="Asosiy rasm",
         help_text="Majburiy muqova rasmi",
         blank=False,
         null=False 
     )
+    # Kichraytirilgan WebP/JPEG nusxalar (srcset uchun) — fon oqimida to‘ldiriladi
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     body = RichTextUploadingField(verbose_name="Matn")
 
+    # body dan saqlash paytida hosil qilinadi (blogs/rendering.py)
+    body_html = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False, verbose_name="Qisqa matn")
+    word_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="So‘zlar soni")
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="O‘qish vaqti (daqiqa)")
+
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='posts')
     tags = models.ManyToManyField(Tag, blank=True, related_name='posts')
 
@@ -104,17 +123,53 @@ class Post(models.Model):
 
     published_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Oxirgi izoh yoki reaksiya vaqti — shartli GET (304) validatori uchun
+    activity_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Oxirgi faollik")
+    # Har bir izoh / reaksiya o‘zgarishida +1 — SSE snapshot va deltalarini tartiblash uchun
+    activity_seq = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="Faollik tartib raqami")
 
     # Statistikalar
     views = models.PositiveIntegerField(default=0, verbose_name="Ko‘rishlar soni")
-    likes = GenericRelation(LikeDislike, related_query_name='post_likes')
+
+    # Denormallashtirilgan hisoblagichlar (signallar F() orqali yangilaydi)
+    likes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Like soni")
+    dislikes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Dislike soni")
+    comments_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Izohlar soni")
 
     class Meta:
         verbose_name = "Maqola"
         verbose_name_plural = "Maqolalar"
         ordering = ['-published_at']
+        indexes = [
+            # Kursor pagination: (published_at, id) bo‘yicha keyset
+            models.Index(fields=['is_published', '-published_at', '-id']),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Rasm almashtirilganini aniqlash uchun
+        instance._loaded_main_image = instance.__dict__['main_image'] if 'main_image' in instance.__dict__ else None
+        # Muallif statistikasi uchun — nashr holati yoki muallif almashganini aniqlash
+        instance._loaded_is_published = instance.__dict__.get('is_published')
+        instance._loaded_author_id = instance.__dict__.get('author_id')
+        return instance
 
     def save(self, *args, **kwargs):
+        # Rasm almashsa — eski nusxalar endi mos emas
+        update_fields = kwargs.get('update_fields')
+        self._image_changed = (update_fields is None or 'main_image' in update_fields) and (
+            bool(self.main_image) and self.main_image.name != getattr(self, '_loaded_main_image', None)
+        )
+        if self._image_changed:
+            self._stale_image_variants, self.image_variants = self.image_variants, {}
+
+        # Matn o‘zgarganda — tayyor HTML, qisqa matn va o‘qish vaqti
+        if update_fields is None or 'body' in update_fields:
+            self.render_body()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *rendering.RENDERED_FIELDS}
+
         if not self.slug:  # Agar slug bo‘sh bo‘lsa (yangi maqola)
             base_slug = slugify(self.title, allow_unicode=True)
             slug = base_slug
@@ -127,7 +182,20 @@ class Post(models.Model):
             
             self.slug = slug
 
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = fields_for_full_save(self)
+        if self._image_changed and 'update_fields' in kwargs:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'image_variants'}  # Tozalangan {} yozilsin
+
         super().save(*args, **kwargs)
+        self._loaded_main_image = self.main_image.name
+
+    def render_body(self):
+        rendered = rendering.render_body(self.body)
+        self.body_html = rendered.html
+        self.excerpt = rendered.excerpt
+        self.word_count = rendered.word_count
+        self.reading_time = rendered.reading_time
 
     def __str__(self):
         return self.title
@@ -135,19 +203,20 @@ class Post(models.Model):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
 
-    # Helper metodlar
+    # Helper metodlar — saqlangan hisoblagichlardan (COUNT so‘rovisiz)
     def total_likes(self):
-        return self.likes.filter(value=1).count()
+        return self.likes_count
 
     def total_dislikes(self):
-        return self.likes.filter(value=-1).count()
+        return self.dislikes_count
 
     def total_comments(self):
-        return self.comments.filter(is_approved=True).count()
+        return self.comments_count
 
     def increment_views(self):
+        from .viewcounts import view_counts
+        view_counts.record(self.pk)  # Bazaga fon oqimi yozadi
         self.views += 1
-        self.save(update_fields=['views'])
 
 
 # ------------------------------------------------------------------
@@ -165,19 +234,137 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_approved = models.BooleanField(default=True, verbose_name="Tasdiqlangan")
 
-    # Izohga ham like/dislike
-    likes = GenericRelation(LikeDislike, related_query_name='comment_likes')
+    # Izohga ham like/dislike (CommentReaction)
+    likes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Like soni")
+    dislikes_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Dislike soni")
 
     class Meta:
         verbose_name = "Izoh"
         verbose_name_plural = "Izohlar"
         ordering = ['-created_at']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_approved = instance.__dict__.get('is_approved')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not self._state.adding and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = fields_for_full_save(self)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.author} → {self.post.title[:30]}"
 
     def total_likes(self):
-        return self.likes.filter(value=1).count()
+        return self.likes_count
 
     def total_dislikes(self):
-        return self.likes.filter(value=-1).count()
\ No newline at end of file
+        return self.dislikes_count
+
+# ------------------------------------------------------------------
+# Like / Dislike — har bir nishon uchun alohida jadval (to‘g‘ridan-to‘g‘ri FK).
+# Sahifa faqat hisoblagich ustunlarini (likes_count, ...) va joriy
+# foydalanuvchining qatorini o‘qiydi: (user, nishon) unikal indeksi.
+# (nishon, value) indeksi — qayta hisoblash (recount) uchun.
+# ------------------------------------------------------------------
+class Reaction(models.Model):
+    LIKE = 1
+    DISLIKE = -1
+    VALUE_CHOICES = (
+        (LIKE, 'Like'),
+        (DISLIKE, 'Dislike'),
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    value = models.SmallIntegerField(choices=VALUE_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Hisoblagichlar uchun bazadagi asl qiymatni eslab qolamiz
+        instance._loaded_value = instance.__dict__.get('value')
+        return instance
+
+    def __str__(self):
+        return f"{self.user} → {self.value}"
+
+
+class PostReaction(Reaction):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='reactions')
+
+    class Meta:
+        verbose_name = "Maqola reaksiyasi"
+        verbose_name_plural = "Maqola reaksiyalari"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_post_reaction'),
+        ]
+        indexes = [
+            models.Index(fields=['post', 'value']),
+        ]
+
+
+class CommentReaction(Reaction):
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name='reactions')
+
+    class Meta:
+        verbose_name = "Izoh reaksiyasi"
+        verbose_name_plural = "Izoh reaksiyalari"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'comment'], name='unique_comment_reaction'),
+        ]
+        indexes = [
+            models.Index(fields=['comment', 'value']),
+        ]
+
+
+# ------------------------------------------------------------------
+# O‘xshash maqolalar — oldindan hisoblangan (teg/kategoriya o‘xshashligi)
+# ------------------------------------------------------------------
+class RelatedPost(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(verbose_name="O‘xshashlik")
+
+    class Meta:
+        verbose_name = "O‘xshash maqola"
+        verbose_name_plural = "O‘xshash maqolalar"
+        unique_together = ('post', 'related')
+        indexes = [
+            models.Index(fields=['post', '-score']),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} → {self.related_id} ({self.score:.3f})"
+
+
+# ------------------------------------------------------------------
+# Muallif statistikasi — muallif sahifasi sarlavhasi uchun bitta o‘qish.
+# Yozuvlar signallar orqali F() bilan yangilanadi (blogs/counters.py),
+# qator yo‘q bo‘lsa — sahifa birinchi ochilganda to‘liq hisoblanadi.
+# ------------------------------------------------------------------
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='blog_stats',
+        verbose_name="Muallif"
+    )
+    post_count = models.PositiveIntegerField(default=0, verbose_name="Nashr qilingan maqolalar")
+    total_views = models.PositiveIntegerField(default=0, verbose_name="Ko‘rishlar soni")
+    total_likes = models.PositiveIntegerField(default=0, verbose_name="Like soni")
+    comment_count = models.PositiveIntegerField(default=0, verbose_name="Yozgan izohlari")
+
+    class Meta:
+        verbose_name = "Muallif statistikasi"
+        verbose_name_plural = "Mualliflar statistikasi"
+
+    def __str__(self):
+        return f"{self.author} statistikasi"
@@ -0,0 +1,59 @@
+# blogs/pagination.py
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+
+# ------------------------------------------------------------------
+# Keyset (cursor) pagination — (published_at, id) bo‘yicha.
+# COUNT(*) ham, OFFSET ham yo‘q: har qanday chuqurlikdagi sahifa
+# birinchi sahifa kabi bitta indeksli so‘rov.
+# ------------------------------------------------------------------
+CURSOR_ORDERING = ('-published_at', '-pk')
+
+
+def encode_cursor(post):
+    raw = f"{post.published_at.isoformat()}|{post.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        published_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(published_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise Http404("Noto‘g‘ri kursor")
+
+
+class CursorPage:
+    """Django Page ga o‘xshash: shablonlar uchun iteratsiya + has_next()"""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next()
+
+
+def paginate_by_cursor(queryset, cursor, per_page):
+    queryset = queryset.order_by(*CURSOR_ORDERING)
+    if cursor:
+        published_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(published_at__lt=published_at) | Q(published_at=published_at, pk__lt=pk))
+
+    # Bitta ortiqcha qator — keyingi sahifa bor-yo‘qligini bilish uchun
+    rows = list(queryset[:per_page + 1])
+    next_cursor = encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    return CursorPage(rows[:per_page], next_cursor)
@@ -0,0 +1,137 @@
+# blogs/reactions.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Subquery, Value
+
+from .cache import bump_list_generation_on_commit
+from .counters import apply_reaction_change
+from .models import Comment, CommentReaction, Post, PostReaction, Reaction
+
+# Nishon modeli → (reaksiya jadvali, FK maydoni)
+REACTION_TABLES = {
+    Post: (PostReaction, 'post'),
+    Comment: (CommentReaction, 'comment'),
+}
+# API dagi nom → nishon modeli va unga reaksiya bildirish mumkin bo‘lgan qatorlar
+TARGETS = {
+    'post': (Post, {'is_published': True}),
+    'comment': (Comment, {'is_approved': True, 'post__is_published': True}),
+}
+STATES = {'like': Reaction.LIKE, 'dislike': Reaction.DISLIKE, 'none': None, None: None}
+MAX_BATCH = 50
+
+
+class ReactionError(ValueError):
+    pass
+
+
+def reaction_table(model):
+    """Post / Comment → (reaksiya modeli, FK maydoni)"""
+    return REACTION_TABLES[model]
+
+
+def load_user_reactions(objects, user):
+    """Post va Comment obyektlari uchun foydalanuvchi reaksiyalarini bitta so‘rovda yuklash.
+
+    Har bir obyektga ``user_reaction`` (1, -1 yoki None) biriktiriladi.
+    Har jadvaldan faqat joriy foydalanuvchining qatorlari — (user, nishon)
+    unikal indeksi bo‘yicha; jadvallar UNION ALL bilan bitta so‘rovga.
+    """
+    targets = defaultdict(lambda: defaultdict(list))  # model → object_id → [obj, ...]
+    for obj in objects:
+        obj.user_reaction = None
+        targets[type(obj)][obj.pk].append(obj)
+
+    if not targets or not user.is_authenticated:
+        return
+
+    models = list(targets)
+    queries = []
+    for position, model in enumerate(models):
+        table, field = reaction_table(model)
+        queries.append(
+            table.objects.filter(user=user, **{f"{field}_id__in": list(targets[model])}).order_by()
+            .values_list(Value(position, output_field=IntegerField()), f"{field}_id", 'value')
+        )
+    reactions = queries[0].union(*queries[1:], all=True) if len(queries) > 1 else queries[0]
+    for position, object_id, value in reactions:
+        for obj in targets[models[position]][object_id]:
+            obj.user_reaction = value
+
+
+def parse_operations(payload):
+    """{"ops": [{"type": "post", "id": 5, "state": "like" | "dislike" | null}, ...]}
+    → {tur: {id: qiymat}} — bir nishonga bir nechta amal bo‘lsa, oxirgisi."""
+    ops = payload.get('ops') if isinstance(payload, dict) else None
+    if not isinstance(ops, list) or not ops:
+        raise ReactionError("ops ro‘yxati bo‘sh yoki noto‘g‘ri")
+    if len(ops) > MAX_BATCH:
+        raise ReactionError(f"Bir so‘rovda ko‘pi bilan {MAX_BATCH} ta amal")
+    desired = defaultdict(dict)
+    for op in ops:
+        if not isinstance(op, dict) or op.get('type') not in TARGETS or op.get('state') not in STATES:
+            raise ReactionError(f"Noto‘g‘ri amal: {op!r}")
+        try:
+            object_id = int(op.get('id'))
+        except (TypeError, ValueError):
+            raise ReactionError(f"Noto‘g‘ri id: {op!r}")
+        desired[op['type']][object_id] = STATES[op['state']]
+    return desired
+
+
+def apply_reactions(user, desired, toggle=False):
+    """Kerakli holatlarni bitta tranzaksiyada o‘rnatish (takroriy so‘rov — o‘zgarishsiz).
+
+    toggle=True — eski forma API si (bosish = almashtirish): joriy qiymat kerakli
+    qiymatga teng bo‘lsa, reaksiya olib tashlanadi. Joriy qiymat tranzaksiya
+    ichida o‘qiladi — parallel bosishlar bir-birini bekor qilmaydi.
+
+    Har tur uchun: nishonlar + joriy qiymat (1 SELECT), o‘rnatish/almashtirish —
+    INSERT ... ON CONFLICT DO UPDATE (1 so‘rov), olib tashlash — DELETE,
+    hisoblagichlar — faqat o‘zgargan nishonlar uchun F() bilan.
+    Qaytaradi: [{'type', 'id', 'likes', 'dislikes', 'user_like'}, ...] — topilmaganlarsiz,
+    user_like — o‘rnatilgan yakuniy qiymat.
+    """
+    results = []
+    with transaction.atomic():
+        for type_name, states in desired.items():
+            model, visible = TARGETS[type_name]
+            table, field = reaction_table(model)
+            current = table.objects.filter(user=user, **{field: OuterRef('pk')}).values('value')[:1]
+            existing = dict(
+                model.objects.filter(pk__in=states, **visible)
+                .annotate(current=Subquery(current)).values_list('pk', 'current')
+            )
+
+            upserts, removals, applied = [], [], {}
+            for object_id, value in states.items():
+                if object_id not in existing:
+                    continue  # Topilmadi
+                if toggle and existing[object_id] == value:
+                    value = None
+                applied[object_id] = value
+                if existing[object_id] == value:
+                    continue  # Holat allaqachon shunday
+                if value is None:
+                    removals.append(object_id)
+                else:
+                    upserts.append(table(user=user, value=value, **{f'{field}_id': object_id}))
+                    apply_reaction_change(model, object_id, existing[object_id], value)
+
+            if upserts:
+                table.objects.bulk_create(
+                    upserts, update_conflicts=True, unique_fields=['user', field], update_fields=['value', 'updated_at'],
+                )
+                bump_list_generation_on_commit()  # bulk_create signal yubormaydi
+            if removals:
+                # post_delete signallari hisoblagichlarni o‘zi kamaytiradi
+                table.objects.filter(user=user, **{f'{field}_id__in': removals}).delete()
+
+            counts = model.objects.filter(pk__in=existing).values_list('pk', 'likes_count', 'dislikes_count')
+            for object_id, likes, dislikes in counts:
+                results.append({
+                    'type': type_name, 'id': object_id, 'likes': likes, 'dislikes': dislikes,
+                    'user_like': applied[object_id],
+                })
+    return results
@@ -0,0 +1,163 @@
+# blogs/related.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Post, RelatedPost
+
+# ------------------------------------------------------------------
+# O‘xshash maqolalar indeksi.
+# Ball = (teglar Jaccard + kategoriya bonusi) × yangilik koeffitsienti.
+# Faqat o‘zgargan maqolaga ta'sir qiladigan ro‘yxatlar qayta hisoblanadi.
+# ------------------------------------------------------------------
+RELATED_LIMIT = 6
+CATEGORY_WEIGHT = 0.5
+RECENCY_HALF_LIFE_DAYS = 180
+TAG_CANDIDATE_LIMIT = 500  # Bitta teg bo‘yicha eng ko‘pi bilan shuncha yangi maqola
+NEIGHBOUR_LIMIT = TAG_CANDIDATE_LIMIT  # Qayta hisoblashda: teg / kategoriya bo‘yicha eng yangi qo‘shnilar
+
+PostTag = Post.tags.through
+
+
+def similarity(tags_a, tags_b, same_category, published_at, now):
+    union = tags_a | tags_b
+    overlap = len(tags_a & tags_b) / len(union) if union else 0.0
+    base = overlap + (CATEGORY_WEIGHT if same_category else 0.0)
+    age_days = max((now - published_at).total_seconds() / 86400, 0.0)
+    return base * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def _tag_sets(post_ids):
+    tags = defaultdict(set)
+    for post_id, tag_id in PostTag.objects.filter(post_id__in=post_ids).values_list('post_id', 'tag_id'):
+        tags[post_id].add(tag_id)
+    return tags
+
+
+def _candidate_ids(post_id, category_id, tag_ids):
+    """Kamida bitta umumiy teg yoki bir xil kategoriyadagi nashr qilingan maqolalar"""
+    candidates = set()
+    for tag_id in tag_ids:
+        candidates.update(
+            PostTag.objects.filter(tag_id=tag_id, post__is_published=True)
+            .order_by('-post__published_at').values_list('post_id', flat=True)[:TAG_CANDIDATE_LIMIT]
+        )
+    if category_id is not None:
+        # Faqat kategoriya bo‘yicha mos keladiganlar orasida tartib — faqat yangilik bo‘yicha,
+        # shuning uchun eng yangi RELATED_LIMIT tasi yetarli
+        candidates.update(
+            Post.objects.filter(is_published=True, category_id=category_id).exclude(pk=post_id)
+            .order_by('-published_at').values_list('pk', flat=True)[:RELATED_LIMIT]
+        )
+    candidates.discard(post_id)
+    return candidates
+
+
+def compute_related(post, now=None):
+    """Bitta maqola uchun [(related_id, score), ...] — eng yuqori RELATED_LIMIT ta"""
+    now = now or timezone.now()
+    tag_ids = _tag_sets([post.pk])[post.pk]
+    candidate_ids = _candidate_ids(post.pk, post.category_id, tag_ids)
+    if not candidate_ids:
+        return []
+
+    candidate_tags = _tag_sets(candidate_ids)
+    scored = []
+    for pk, category_id, published_at in Post.objects.filter(pk__in=candidate_ids).values_list(
+        'pk', 'category_id', 'published_at'
+    ):
+        same_category = post.category_id is not None and category_id == post.category_id
+        score = similarity(tag_ids, candidate_tags[pk], same_category, published_at, now)
+        if score > 0:
+            scored.append((score, pk))
+    scored.sort(reverse=True)
+    return [(pk, score) for score, pk in scored[:RELATED_LIMIT]]
+
+
+def store_related(posts, now=None):
+    """Berilgan maqolalarning ro‘yxatlarini qayta yozish"""
+    now = now or timezone.now()
+    posts = list(posts)
+    entries = [
+        RelatedPost(post_id=post.pk, related_id=related_id, score=score)
+        for post in posts if post.is_published
+        for related_id, score in compute_related(post, now)
+    ]
+    with transaction.atomic():
+        RelatedPost.objects.filter(post__in=[post.pk for post in posts]).delete()
+        RelatedPost.objects.bulk_create(entries)
+
+
+def affected_post_ids(post_ids, now=None):
+    """O‘zgargan maqolalar tufayli ro‘yxati o‘zgarishi mumkin bo‘lgan maqolalar"""
+    now = now or timezone.now()
+    post_ids = set(post_ids)
+    affected = set(post_ids)
+
+    # 1. Hozir ro‘yxatida o‘zgargan maqola bor bo‘lganlar
+    affected.update(RelatedPost.objects.filter(related_id__in=post_ids).values_list('post_id', flat=True))
+
+    # 2. Qo‘shnilar — agar o‘zgargan maqola ularning ro‘yxatiga kira olsa
+    changed = list(Post.objects.filter(pk__in=post_ids, is_published=True).values_list('pk', 'category_id', 'published_at'))
+    changed_tags = _tag_sets([pk for pk, _, _ in changed])
+    for pk, category_id, published_at in changed:
+        # _candidate_ids dagi kabi cheklangan: katta teg / kategoriyada eski maqolalar
+        # ro‘yxati bulk rebuild gacha eskirib turishi mumkin
+        neighbours = set()
+        for tag_id in changed_tags[pk]:
+            neighbours.update(
+                PostTag.objects.filter(tag_id=tag_id, post__is_published=True)
+                .order_by('-post__published_at').values_list('post_id', flat=True)[:NEIGHBOUR_LIMIT]
+            )
+        if category_id is not None:
+            neighbours.update(
+                Post.objects.filter(is_published=True, category_id=category_id)
+                .order_by('-published_at').values_list('pk', flat=True)[:NEIGHBOUR_LIMIT]
+            )
+        neighbours -= affected
+        if not neighbours:
+            continue
+
+        thresholds = _thresholds(neighbours)
+        neighbour_tags = _tag_sets(neighbours)
+        for neighbour_id, neighbour_category in Post.objects.filter(pk__in=neighbours).values_list('pk', 'category_id'):
+            same_category = category_id is not None and neighbour_category == category_id
+            score = similarity(neighbour_tags[neighbour_id], changed_tags[pk], same_category, published_at, now)
+            if score > thresholds.get(neighbour_id, 0.0):
+                affected.add(neighbour_id)
+    return affected
+
+
+def _thresholds(post_ids):
+    """To‘liq ro‘yxatlar uchun eng past ball (to‘lmaganlar — 0)"""
+    scores = defaultdict(list)
+    for post_id, score in RelatedPost.objects.filter(post_id__in=post_ids).values_list('post_id', 'score'):
+        scores[post_id].append(score)
+    return {post_id: min(values) for post_id, values in scores.items() if len(values) >= RELATED_LIMIT}
+
+
+def refresh_related(post_ids):
+    """Faqat ta'sirlangan maqolalarni qayta hisoblash (signallar navbat orqali chaqiradi — blogs.tasks)"""
+    now = timezone.now()
+    affected = affected_post_ids(post_ids, now)
+    store_related(Post.objects.filter(pk__in=affected).only('pk', 'category_id', 'is_published'), now)
+
+
+def rebuild_all(batch_size=200):
+    """Butun indeksni qayta qurish — qaytaradi: maqolalar soni"""
+    now = timezone.now()
+    RelatedPost.objects.all().delete()
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            Post.objects.filter(is_published=True, pk__gt=last_pk).order_by('pk')
+            .only('pk', 'category_id', 'is_published')[:batch_size]
+        )
+        if not batch:
+            break
+        store_related(batch, now)
+        total += len(batch)
+        last_pk = batch[-1].pk
+    return total
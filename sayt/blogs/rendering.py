@@ -0,0 +1,223 @@
+# blogs/rendering.py
+import math
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+# ------------------------------------------------------------------
+# CKEditor HTML ni saqlash paytida bir marta qayta ishlash:
+# tozalangan HTML (lazy-loading rasmlar), oddiy matn, so‘zlar soni.
+# ------------------------------------------------------------------
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'code', 'col', 'colgroup', 'div', 'em',
+    'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'iframe', 'img',
+    'li', 'ol', 'p', 'pre', 's', 'span', 'strike', 'strong', 'sub', 'sup', 'table', 'tbody',
+    'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'col', 'hr', 'img'}
+# Ichidagi matn bilan birga tashlab yuboriladi
+DROP_CONTENT_TAGS = {'script', 'style', 'noscript', 'template', 'object', 'embed', 'head', 'title', 'textarea', 'select'}
+# Matnda so‘zlar yopishib qolmasligi uchun bo‘sh joy qo‘yiladigan teglar
+BLOCK_TAGS = {
+    'blockquote', 'br', 'caption', 'div', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'hr', 'li', 'p', 'pre', 'td', 'th', 'tr',
+}
+
+GLOBAL_ATTRS = {'class', 'style', 'title', 'dir', 'lang'}
+TAG_ATTRS = {
+    'a': {'href', 'target', 'rel', 'name'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'iframe': {'src', 'width', 'height', 'allowfullscreen', 'frameborder'},
+    'td': {'colspan', 'rowspan', 'align', 'valign'},
+    'th': {'colspan', 'rowspan', 'align', 'valign', 'scope'},
+    'table': {'border', 'cellpadding', 'cellspacing', 'align'},
+    'ol': {'start', 'type'},
+    'col': {'span', 'width'},
+}
+URL_ATTRS = {'href', 'src'}
+SAFE_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+IFRAME_HOSTS = {'www.youtube.com', 'youtube.com', 'www.youtube-nocookie.com', 'player.vimeo.com'}
+# style — faqat ruxsat etilgan xossalar va oddiy qiymatlar (url(), expression(), \ escape lar o‘tmaydi)
+ALLOWED_STYLES = {
+    'color', 'background-color', 'text-align', 'text-decoration', 'text-indent', 'vertical-align',
+    'font-weight', 'font-style', 'font-size', 'font-family', 'line-height', 'list-style-type',
+    'float', 'width', 'height', 'max-width',
+    'margin', 'margin-top', 'margin-right', 'margin-bottom', 'margin-left',
+    'padding', 'padding-top', 'padding-right', 'padding-bottom', 'padding-left',
+    'border', 'border-width', 'border-style', 'border-color', 'border-collapse',
+}
+_STYLE_VALUE_RE = re.compile(r"""(?:[-#\w\s.,%'"]|rgba?\([\d\s.,%]*\))+""")
+
+# Post modelidagi hosila maydonlar
+RENDERED_FIELDS = ('body_html', 'excerpt', 'word_count', 'reading_time')
+
+EXCERPT_WORDS = 20  # Muallif sahifasidagi kartochka uchun
+WORDS_PER_MINUTE = 200
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _clean_style(value):
+    declarations = []
+    for declaration in (value or '').split(';'):
+        name, _, rule = declaration.partition(':')
+        name, rule = name.strip().lower(), rule.strip()
+        if name in ALLOWED_STYLES and rule and _STYLE_VALUE_RE.fullmatch(rule):
+            declarations.append(f"{name}: {rule}")
+    return '; '.join(declarations) or None
+
+
+def _safe_url(value, tag):
+    value = (value or '').strip()
+    parts = urlsplit(value)
+    if parts.scheme.lower() not in SAFE_SCHEMES:
+        return None
+    if tag == 'iframe' and (parts.scheme.lower() != 'https' or parts.hostname not in IFRAME_HOSTS):
+        return None
+    return value
+
+
+class _BodyRenderer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self._open = []
+        self._drop_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self._drop_depth += 1
+            return
+        if self._drop_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in ALLOWED_TAGS:
+            return
+
+        allowed = GLOBAL_ATTRS | TAG_ATTRS.get(tag, set())
+        clean = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed:
+                continue  # on* hodisalari va boshqalar
+            if name in URL_ATTRS:
+                value = _safe_url(value, tag)
+                if value is None:
+                    continue
+            if name == 'style':
+                value = _clean_style(value)
+                if value is None:
+                    continue
+            clean[name] = value
+
+        if tag == 'iframe' and 'src' not in clean:
+            self._drop_depth += 1
+            return
+        if tag in ('img', 'iframe'):
+            clean.setdefault('loading', 'lazy')
+        if tag == 'img':
+            if 'src' not in clean:
+                return
+            clean.setdefault('decoding', 'async')
+            clean.setdefault('alt', '')
+        if tag == 'a' and clean.get('target') == '_blank':
+            clean['rel'] = 'noopener noreferrer'
+
+        rendered = ''.join(
+            f' {name}' if value is None else f' {name}="{escape(value, quote=True)}"'
+            for name, value in clean.items()
+        )
+        self.html.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self._open and self._open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS or (tag == 'iframe' and self._drop_depth and tag not in self._open):
+            self._drop_depth = max(self._drop_depth - 1, 0)
+            return
+        if self._drop_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag in self._open:
+            # Yopilmagan ichki teglarni ham yopamiz — to‘g‘ri daraxt
+            while self._open:
+                current = self._open.pop()
+                self.html.append(f'</{current}>')
+                if current == tag:
+                    break
+
+    def handle_data(self, data):
+        if self._drop_depth:
+            return
+        self.html.append(escape(data, quote=False))
+        self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self._open:
+            self.html.append(f'</{self._open.pop()}>')
+
+
+class RenderedBody:
+    def __init__(self, html, text):
+        self.html = html
+        self.text = text
+        self.words = text.split()
+
+    @property
+    def word_count(self):
+        return len(self.words)
+
+    @property
+    def reading_time(self):
+        """Daqiqalarda: matn bo‘lsa kamida 1, bo‘sh matn — 0"""
+        return math.ceil(self.word_count / WORDS_PER_MINUTE)
+
+    @property
+    def excerpt(self):
+        if len(self.words) <= EXCERPT_WORDS:
+            return ' '.join(self.words)
+        return ' '.join(self.words[:EXCERPT_WORDS]) + '…'
+
+
+def render_body(raw_html):
+    renderer = _BodyRenderer()
+    renderer.feed(raw_html or '')
+    renderer.close()
+    text = _SPACE_RE.sub(' ', ''.join(renderer.text)).strip()
+    return RenderedBody(''.join(renderer.html), text)
+
+
+def html_to_text(raw_html):
+    return render_body(raw_html).text
+
+
+def rerender_posts(post_model, batch_size=200):
+    """Barcha maqolalar uchun hosila maydonlarni qayta yozish — qaytaradi: maqolalar soni.
+
+    Model argument sifatida — migratsiyada tarixiy model bilan ham ishlaydi.
+    """
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(post_model.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', 'body')[:batch_size])
+        if not batch:
+            break
+        for post in batch:
+            rendered = render_body(post.body)
+            post.body_html = rendered.html
+            post.excerpt = rendered.excerpt
+            post.word_count = rendered.word_count
+            post.reading_time = rendered.reading_time
+        post_model.objects.bulk_update(batch, RENDERED_FIELDS)
+        total += len(batch)
+        last_pk = batch[-1].pk
+    return total
@@ -0,0 +1,126 @@
+# blogs/search.py
+import re
+
+from django.db import connection, transaction
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .rendering import html_to_text
+
+# ------------------------------------------------------------------
+# SQLite FTS5 qidiruv indeksi (rowid = Post.id)
+# Ustunlar: sarlavha, tozalangan matn, teglar, muallif
+# ------------------------------------------------------------------
+FTS_TABLE = 'blogs_post_fts'
+SEARCH_RESULT_LIMIT = 500
+
+# bm25 og‘irliklari: sarlavha, matn, teglar, muallif
+RANK_WEIGHTS = (10.0, 1.0, 5.0, 3.0)
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, body, tags, author, tokenize='unicode61 remove_diacritics 2')"
+)
+DROP_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Snippet belgilari — avval escape qilinadi, keyin <mark> ga almashtiriladi
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available():
+    """FTS5 faqat SQLite da — boshqa bazalarda icontains ishlatiladi"""
+    return connection.vendor == 'sqlite'
+
+
+def document_row(post_id, title, body, tag_names, author_username):
+    return (post_id, title, html_to_text(body), ' '.join(tag_names), author_username)
+
+
+def _post_rows(posts):
+    return [
+        document_row(post.pk, post.title, post.body, [tag.name for tag in post.tags.all()], post.author.username)
+        for post in posts
+    ]
+
+
+def _write_rows(cursor, rows):
+    cursor.executemany(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, body, tags, author) VALUES (%s, %s, %s, %s, %s)",
+        rows,
+    )
+
+
+def remove_posts(post_ids):
+    post_ids = list(post_ids)
+    if not post_ids or not is_available():
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", post_ids)
+
+
+def index_posts(post_ids):
+    """Berilgan maqolalarni qayta indekslash (nashr qilinmaganlari olib tashlanadi)"""
+    from .models import Post
+
+    post_ids = list(post_ids)
+    if not post_ids or not is_available():
+        return
+    posts = Post.objects.filter(pk__in=post_ids, is_published=True).select_related('author').prefetch_related('tags')
+    rows = _post_rows(posts)
+    remove_posts(post_ids)
+    with connection.cursor() as cursor:
+        _write_rows(cursor, rows)
+
+
+def rebuild_index(batch_size=500):
+    """Indeksni noldan qurish — qaytaradi: indekslangan maqolalar soni.
+    Bitta tranzaksiya: qidiruv qurilish davomida eski indeksni ko‘radi, xato bo‘lsa — u o‘zgarishsiz qoladi"""
+    from .models import Post
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(DROP_TABLE_SQL)
+            cursor.execute(CREATE_TABLE_SQL)
+
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(is_published=True, pk__gt=last_pk).order_by('pk')
+                .select_related('author').prefetch_related('tags')[:batch_size]
+            )
+            if not batch:
+                break
+            with connection.cursor() as cursor:
+                _write_rows(cursor, _post_rows(batch))
+            total += len(batch)
+            last_pk = batch[-1].pk
+    return total
+
+
+def build_match_query(query):
+    """Foydalanuvchi matnini xavfsiz FTS5 so‘roviga aylantirish: "so‘z"* ..."""
+    tokens = _TOKEN_RE.findall(query or '')[:10]
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _highlight(snippet):
+    return mark_safe(escape(snippet).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>'))
+
+
+def search_posts(query, limit=SEARCH_RESULT_LIMIT):
+    """Reyting bo‘yicha [(post_id, snippet), ...] ro‘yxati"""
+    match = build_match_query(query)
+    if not match:
+        return []
+    weights = ', '.join(str(w) for w in RANK_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, 1, %s, %s, '…', 24) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s",
+            [_MARK_START, _MARK_END, match, limit],
+        )
+        return [(post_id, _highlight(snippet)) for post_id, snippet in cursor.fetchall()]
@@ -0,0 +1,206 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from . import search, images, events
+from .counters import apply_reaction_change, apply_comment_change, apply_author_deltas, refresh_author_stats
+from .cache import bump_list_generation_on_commit
+from .tasks import refresh_related_posts
+from .models import Post, Comment, PostReaction, CommentReaction, Category, Tag, RelatedPost
+
+# Qidiruv indeksiga ta'sir qiluvchi maydonlar
+SEARCH_FIELDS = {'title', 'body', 'is_published', 'author'}
+# O‘xshash maqolalar indeksiga ta'sir qiluvchi maydonlar
+RELATED_FIELDS = {'category', 'is_published', 'published_at'}
+
+
+# 1️⃣ Ro‘yxat keshini eskirtirish — maqola, izoh, like, teg va kategoriya o‘zgarganda
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=PostReaction)
+@receiver(post_delete, sender=PostReaction)
+@receiver(post_save, sender=CommentReaction)
+@receiver(post_delete, sender=CommentReaction)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_list_cache(sender, **kwargs):
+    bump_list_generation_on_commit()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_list_cache_on_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_list_generation_on_commit()
+
+
+# 2️⃣ Qidiruv indeksini sinxron ushlab turish
+@receiver(post_save, sender=Post)
+def index_post_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return  # Masalan, faqat views yangilandi
+    search.index_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_index(sender, instance, **kwargs):
+    search.remove_posts([instance.pk])
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def index_post_on_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        search.index_posts([instance.pk])
+    elif pk_set:
+        search.index_posts(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+def index_tag_posts(sender, instance, created, **kwargs):
+    if not created:
+        search.index_posts(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tag_posts(sender, instance, **kwargs):
+    instance._search_post_ids = list(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def index_deleted_tag_posts(sender, instance, **kwargs):
+    search.index_posts(getattr(instance, '_search_post_ids', []))
+
+
+# 3️⃣ Like/dislike va izoh hisoblagichlari
+def _reaction_target(instance):
+    """Reaksiya → (Post yoki Comment, id)"""
+    if isinstance(instance, PostReaction):
+        return Post, instance.post_id
+    return Comment, instance.comment_id
+
+
+@receiver(post_save, sender=PostReaction)
+@receiver(post_save, sender=CommentReaction)
+def count_reaction_on_save(sender, instance, created, **kwargs):
+    old_value = None if created else getattr(instance, '_loaded_value', None)
+    if old_value != instance.value:
+        apply_reaction_change(*_reaction_target(instance), old_value, instance.value)
+    instance._loaded_value = instance.value
+
+
+@receiver(post_delete, sender=PostReaction)
+@receiver(post_delete, sender=CommentReaction)
+def count_reaction_on_delete(sender, instance, **kwargs):
+    apply_reaction_change(*_reaction_target(instance), instance.value, None)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment_on_save(sender, instance, created, **kwargs):
+    was_approved = False if created else getattr(instance, '_loaded_is_approved', instance.is_approved)
+    activity = apply_comment_change(instance.post_id, was_approved, instance.is_approved)
+    events.publish_comment(instance, int(instance.is_approved) - int(was_approved), activity, created=created)
+    instance._loaded_is_approved = instance.is_approved
+
+
+@receiver(post_delete, sender=Comment)
+def count_comment_on_delete(sender, instance, **kwargs):
+    activity = apply_comment_change(instance.post_id, instance.is_approved, False)
+    events.publish_comment(instance, -int(instance.is_approved), activity)
+
+
+# 4️⃣ O‘xshash maqolalar — faqat ta'sirlangan ro‘yxatlarni (jobs navbati orqali) qayta hisoblash
+def queue_related_refresh(post_ids):
+    post_ids = sorted(post_ids)
+    if post_ids:
+        # Vazifa yozuvi o‘zgarish bilan bitta tranzaksiyada — ishchi commit dan keyin ko‘radi
+        refresh_related_posts.delay(post_ids=post_ids)
+
+
+@receiver(post_save, sender=Post)
+def refresh_related_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not RELATED_FIELDS.intersection(update_fields):
+        return
+    queue_related_refresh([instance.pk])
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_related_on_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    queue_related_refresh((pk_set or []) if reverse else [instance.pk])
+
+
+@receiver(post_delete, sender=Tag)
+def refresh_related_on_tag_delete(sender, instance, **kwargs):
+    queue_related_refresh(getattr(instance, '_search_post_ids', []))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_related_lists(sender, instance, **kwargs):
+    # CASCADE yozuvlarni o‘chirib yuboradi — kimning ro‘yxatida borligini oldindan eslab qolamiz
+    instance._related_post_ids = list(
+        RelatedPost.objects.filter(related=instance).values_list('post_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def refresh_related_on_delete(sender, instance, **kwargs):
+    queue_related_refresh(getattr(instance, '_related_post_ids', []))
+
+
+# 5️⃣ Muqova rasmi nusxalari — rasm almashganda, so‘rovdan tashqarida
+@receiver(post_save, sender=Post)
+def build_image_variants_on_save(sender, instance, **kwargs):
+    if getattr(instance, '_image_changed', False):
+        images.schedule_variants(instance.pk, getattr(instance, '_stale_image_variants', None))
+        instance._image_changed = False
+
+
+# 6️⃣ Muallif statistikasi — maqola nashri, izohlar (like va ko‘rishlar — counters.py da)
+def refresh_author_stats_on_commit(author_ids):
+    author_ids = {author_id for author_id in author_ids if author_id is not None}
+    if author_ids:
+        transaction.on_commit(lambda: [refresh_author_stats(author_id, create=True) for author_id in author_ids])
+
+
+@receiver(post_save, sender=Post)
+def count_author_post_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {'is_published', 'author'}.intersection(update_fields):
+        return
+    was_published = False if created else getattr(instance, '_loaded_is_published', instance.is_published)
+    old_author_id = instance.author_id if created else getattr(instance, '_loaded_author_id', instance.author_id)
+    instance._loaded_is_published = instance.is_published
+    instance._loaded_author_id = instance.author_id
+
+    if old_author_id != instance.author_id:
+        # Kam uchraydi — ikkala muallifni to‘liq qayta hisoblaymiz
+        refresh_author_stats_on_commit([old_author_id, instance.author_id])
+    elif was_published != instance.is_published:
+        sign = 1 if instance.is_published else -1
+        # Xotiradagi views eskirgan bo‘lishi mumkin — bazadagi qiymatlar
+        views, likes = (0, 0) if created else Post.objects.filter(pk=instance.pk).values_list('views', 'likes_count').get()
+        apply_author_deltas(instance.author_id, {
+            'post_count': sign, 'total_views': sign * views, 'total_likes': sign * likes,
+        })
+
+
+@receiver(post_delete, sender=Post)
+def count_author_post_on_delete(sender, instance, **kwargs):
+    # CASCADE bilan o‘chgan reaksiyalar tartibi kafolatlanmagan — to‘liq qayta hisoblash
+    refresh_author_stats_on_commit([instance.author_id])
+
+
+@receiver(post_save, sender=Comment)
+def count_author_comment_on_save(sender, instance, created, **kwargs):
+    if created:
+        apply_author_deltas(instance.author_id, {'comment_count': 1})
+
+
+@receiver(post_delete, sender=Comment)
+def count_author_comment_on_delete(sender, instance, **kwargs):
+    apply_author_deltas(instance.author_id, {'comment_count': -1})
@@ -0,0 +1,14 @@
+from jobs.queue import task
+
+from . import related
+
+
+# Maqola / teg o‘zgarganda — qo‘shnilar ro‘yxati so‘rov yo‘lida emas, ishchida hisoblanadi
+@task('blogs.refresh_related')
+def refresh_related_posts(post_ids):
+    related.refresh_related(post_ids)
+
+
+@task('blogs.rebuild_related', max_attempts=1)
+def rebuild_related_posts():
+    related.rebuild_all()
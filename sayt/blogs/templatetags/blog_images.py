@@ -0,0 +1,59 @@
+from django import template
+from django.utils.html import format_html
+
+register = template.Library()
+
+# Kartalar: lg — 3 ustun, md — 2 ustun, kichik ekranda — to‘liq kenglik
+CARD_SIZES = "(min-width: 992px) 33vw, (min-width: 768px) 50vw, 100vw"
+
+
+def _variants(post, fmt):
+    by_width = (post.image_variants or {}).get(fmt) or {}
+    return sorted((int(width), name) for width, name in by_width.items())
+
+
+def _srcset(post, fmt):
+    storage = post.main_image.storage
+    return ', '.join(f"{storage.url(name)} {width}w" for width, name in _variants(post, fmt))
+
+
+@register.filter
+def srcset(post, fmt='webp'):
+    """{{ post|srcset:"webp" }} → "url 320w, url 640w, ..." """
+    if not post.main_image:
+        return ''
+    return _srcset(post, fmt)
+
+
+@register.simple_tag
+def image_variant_url(post, width, fmt='jpeg'):
+    """Kamida `width` kenglikdagi eng kichik nusxa; nusxa bo‘lmasa — asl rasm"""
+    if not post.main_image:
+        return ''
+    variants = _variants(post, fmt)
+    for variant_width, name in variants:
+        if variant_width >= width:
+            return post.main_image.storage.url(name)
+    if variants:
+        return post.main_image.storage.url(variants[-1][1])
+    return post.main_image.url
+
+
+@register.simple_tag
+def responsive_image(post, sizes=CARD_SIZES, css_class='', alt='', style=''):
+    """<picture>: WebP + JPEG srcset, lazy-loading; nusxalar hali tayyor bo‘lmasa — asl rasm"""
+    if not post.main_image:
+        return ''
+    webp, jpeg = _srcset(post, 'webp'), _srcset(post, 'jpeg')
+    if not jpeg:
+        return format_html(
+            '<img src="{}" class="{}" style="{}" alt="{}" loading="lazy" decoding="async">',
+            post.main_image.url, css_class, style, alt,
+        )
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" class="{}" style="{}" alt="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        webp, sizes, image_variant_url(post, 640), jpeg, sizes, css_class, style, alt,
+    )
@@ -1,3 +1,574 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .counters import recount_all
+from .events import EventBus, bus
+from jobs.models import Job
+from jobs.queue import run_pending
+
+from .models import AuthorStats, Category, Comment, CommentReaction, Post, PostReaction, Reaction, RelatedPost, Tag
+from .pagination import decode_cursor, encode_cursor, paginate_by_cursor
+from .related import rebuild_all, similarity
+from .rendering import EXCERPT_WORDS, render_body
+from . import search
+from .viewcounts import ViewCountBuffer, view_counts
+from .views import _post_snapshot
+
+User = get_user_model()
+
+
+def make_post(author, **kwargs):
+    fields = {'title': 'Sarlavha', 'body': '<p>Matn</p>', 'main_image': 'blog/test.jpg', **kwargs}
+    return Post.objects.create(author=author, **fields)
+
+
+# ------------------------------------------------------------------
+# Hisoblagichlar: signallar orqali F() yangilanishlari recount_all bilan bir xil bo‘lsin
+# ------------------------------------------------------------------
+class CounterDriftTests(TestCase):
+    COUNTERS = ('likes_count', 'dislikes_count', 'comments_count')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('muallif', password='x')
+        cls.readers = [User.objects.create_user(f'oquvchi{i}', password='x') for i in range(3)]
+
+    def snapshot(self):
+        posts = list(Post.objects.order_by('pk').values_list('pk', *self.COUNTERS))
+        comments = list(Comment.objects.order_by('pk').values_list('pk', 'likes_count', 'dislikes_count'))
+        return posts, comments
+
+    def assertNoDrift(self):
+        before = self.snapshot()
+        recount_all(Post, Comment, PostReaction, CommentReaction)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_reactions_created_changed_and_deleted(self):
+        post = make_post(self.author)
+        first, second, third = self.readers
+        PostReaction.objects.create(user=first, post=post, value=Reaction.LIKE)
+        PostReaction.objects.create(user=second, post=post, value=Reaction.LIKE)
+        disliked = PostReaction.objects.create(user=third, post=post, value=Reaction.DISLIKE)
+
+        changed = PostReaction.objects.get(user=second, post=post)
+        changed.value = Reaction.DISLIKE
+        changed.save()
+        disliked.delete()
+
+        post.refresh_from_db()
+        self.assertEqual((post.likes_count, post.dislikes_count), (1, 1))
+        self.assertNoDrift()
+
+    def test_comment_approval_and_comment_reactions(self):
+        post = make_post(self.author)
+        comment = Comment.objects.create(post=post, author=self.readers[0], content='Zo‘r')
+        hidden = Comment.objects.create(post=post, author=self.readers[1], content='Spam', is_approved=False)
+        CommentReaction.objects.create(user=self.readers[1], comment=comment, value=Reaction.LIKE)
+        CommentReaction.objects.create(user=self.readers[2], comment=comment, value=Reaction.DISLIKE)
+
+        hidden.is_approved = True
+        hidden.save()
+        comment.is_approved = False
+        comment.save()
+        Comment.objects.get(pk=hidden.pk).delete()
+
+        post.refresh_from_db()
+        self.assertEqual(post.comments_count, 0)
+        comment.refresh_from_db()
+        self.assertEqual((comment.likes_count, comment.dislikes_count), (1, 1))
+        self.assertNoDrift()
+
+    def test_cascade_delete_keeps_other_posts_consistent(self):
+        kept, removed = make_post(self.author), make_post(self.author, title='Boshqa')
+        for reader in self.readers:
+            PostReaction.objects.create(user=reader, post=kept, value=Reaction.LIKE)
+            PostReaction.objects.create(user=reader, post=removed, value=Reaction.DISLIKE)
+        Comment.objects.create(post=removed, author=self.readers[0], content='...')
+        removed.delete()
+
+        kept.refresh_from_db()
+        self.assertEqual(kept.likes_count, len(self.readers))
+        self.assertNoDrift()
+
+    def test_full_save_of_stale_instance_keeps_counters(self):
+        post = make_post(self.author)
+        comment = Comment.objects.create(post=post, author=self.readers[0], content='Zo‘r')
+        PostReaction.objects.create(user=self.readers[1], post=post, value=Reaction.LIKE)
+        CommentReaction.objects.create(user=self.readers[1], comment=comment, value=Reaction.DISLIKE)
+
+        # Xotiradagi nusxalarda hisoblagichlar hali 0
+        post.title = 'Yangi sarlavha'
+        post.save()
+        comment.content = 'Tahrirlangan'
+        comment.save()
+
+        post.refresh_from_db()
+        comment.refresh_from_db()
+        self.assertEqual((post.title, post.likes_count, post.comments_count), ('Yangi sarlavha', 1, 1))
+        self.assertEqual((comment.content, comment.dislikes_count), ('Tahrirlangan', 1))
+        self.assertNoDrift()
+
+    @mock.patch.object(ViewCountBuffer, '_ensure_thread')
+    def test_full_save_keeps_background_written_fields(self, ensure_thread):
+        post = make_post(self.author)
+        stale = Post.objects.get(pk=post.pk)
+
+        # Ko‘rishlar buferi va rasm ishchisi yuklash bilan saqlash orasida yozdi
+        buffer = ViewCountBuffer()
+        for _ in range(3):
+            buffer.record(post.pk)
+        self.assertEqual(buffer.flush(), 3)
+        variants = {'webp': {'640': 'blog/test.w640.webp'}}
+        Post.objects.filter(pk=post.pk).update(image_variants=variants)
+
+        stale.title = 'Yangi sarlavha'
+        stale.save()
+        post.refresh_from_db()
+        self.assertEqual((post.title, post.views, post.image_variants), ('Yangi sarlavha', 3, variants))
+
+    def test_recount_repairs_drift(self):
+        post = make_post(self.author)
+        PostReaction.objects.create(user=self.readers[0], post=post, value=Reaction.LIKE)
+        Post.objects.filter(pk=post.pk).update(likes_count=7, comments_count=3)
+
+        recount_all(Post, Comment, PostReaction, CommentReaction)
+        post.refresh_from_db()
+        self.assertEqual((post.likes_count, post.dislikes_count, post.comments_count), (1, 0, 0))
+
+
+# ------------------------------------------------------------------
+# Kursor pagination: sahifalar takrorsiz va bo‘shliqsiz, bir xil vaqtlar ham
+# ------------------------------------------------------------------
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('muallif', password='x')
+        cls.posts = [make_post(author, title=f"Maqola {i}") for i in range(7)]
+        # Uchtasi bir xil published_at — tartib pk bo‘yicha hal bo‘lishi kerak
+        now = timezone.now()
+        for offset, post in enumerate(cls.posts):
+            post.published_at = now - timedelta(minutes=offset // 3)
+        Post.objects.bulk_update(cls.posts, ['published_at'])
+        Post.objects.filter(pk=cls.posts[0].pk).update(is_published=False)
+
+    def expected(self):
+        return list(Post.objects.filter(is_published=True).order_by('-published_at', '-pk').values_list('pk', flat=True))
+
+    def walk(self, per_page):
+        pages, cursor = [], None
+        while True:
+            page = paginate_by_cursor(Post.objects.filter(is_published=True), cursor, per_page)
+            pages.append([post.pk for post in page])
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once(self):
+        for per_page in (1, 2, 4, 6, 10):
+            with self.subTest(per_page=per_page):
+                pages = self.walk(per_page)
+                self.assertEqual([pk for page in pages for pk in page], self.expected())
+                self.assertTrue(all(len(page) == per_page for page in pages[:-1]))
+
+    def test_exact_multiple_has_no_empty_last_page(self):
+        pages = self.walk(3)
+        self.assertEqual([len(page) for page in pages], [3, 3])
+
+    def test_cursor_round_trip(self):
+        post = Post.objects.get(pk=self.posts[1].pk)
+        self.assertEqual(decode_cursor(encode_cursor(post)), (post.published_at, post.pk))
+
+    def test_invalid_cursor_is_404(self):
+        for token in ('@@@', 'bm90LWEtY3Vyc29y', ''.join(['A'] * 7)):
+            with self.subTest(token=token), self.assertRaises(Http404):
+                decode_cursor(token)
+
+    def test_cards_endpoint_returns_next_cursor(self):
+        response = self.client.get(reverse('blogs:post_cards'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn('html', data)
+        self.assertIsNone(data['next_cursor'])  # 6 ta maqola, sahifada 9 ta
+
+        response = self.client.get(reverse('blogs:post_cards'), {'cursor': 'buzuq'})
+        self.assertEqual(response.status_code, 404)
+
+
+# ------------------------------------------------------------------
+# Body sanitizer — foydalanuvchi HTML i uchun xavfsizlik chegarasi
+# ------------------------------------------------------------------
+class BodySanitizerTests(SimpleTestCase):
+    def html(self, raw):
+        return render_body(raw).html
+
+    def test_script_and_style_elements_dropped_with_content(self):
+        html = self.html('<p>a<script>alert(1)</script><style>p{}</style><noscript>x</noscript>b</p>')
+        self.assertEqual(html, '<p>ab</p>')
+
+    def test_event_handlers_and_unknown_attributes_dropped(self):
+        html = self.html('<p onclick="alert(1)" data-x="1" class="lead">a</p><svg onload="alert(1)"><b>b</b></svg>')
+        self.assertEqual(html, '<p class="lead">a</p><b>b</b>')
+
+    def test_unsafe_url_schemes_removed(self):
+        for href in ('javascript:alert(1)', ' JaVaScRiPt:alert(1)', 'data:text/html,x', 'vbscript:x'):
+            with self.subTest(href=href):
+                self.assertEqual(self.html(f'<a href="{href}">x</a>'), '<a>x</a>')
+        self.assertEqual(self.html('<a href="/blog/?a=1&b=2">x</a>'), '<a href="/blog/?a=1&amp;b=2">x</a>')
+
+    def test_attribute_values_are_escaped(self):
+        html = self.html("""<img src="/a.png" alt='"><script>alert(1)</script>'>""")
+        self.assertNotIn('<script', html)
+        self.assertIn('alt="&quot;&gt;&lt;script&gt;alert(1)&lt;/script&gt;"', html)
+
+    def test_iframes_only_from_allowed_hosts(self):
+        self.assertEqual(self.html('<p>a<iframe src="https://evil.example/x">b</iframe>c</p>'), '<p>ac</p>')
+        self.assertEqual(self.html('<iframe src="http://www.youtube.com/embed/x"></iframe>'), '')
+        self.assertEqual(
+            self.html('<iframe src="https://www.youtube.com/embed/x"></iframe>'),
+            '<iframe src="https://www.youtube.com/embed/x" loading="lazy"></iframe>',
+        )
+
+    def test_images_get_lazy_loading_and_need_src(self):
+        self.assertEqual(
+            self.html('<img src="/m/a.png">'),
+            '<img src="/m/a.png" loading="lazy" decoding="async" alt="">',
+        )
+        self.assertEqual(self.html('<img src="javascript:x"><img>'), '')
+
+    def test_blank_target_links_get_noopener(self):
+        self.assertEqual(
+            self.html('<a href="https://x.uz" target="_blank" rel="opener">x</a>'),
+            '<a href="https://x.uz" target="_blank" rel="noopener noreferrer">x</a>',
+        )
+
+    def test_style_keeps_only_allowed_properties(self):
+        html = self.html(
+            '<p style="color: red; position: fixed; TEXT-ALIGN:center; background-image: url(/x.png)">a</p>'
+        )
+        self.assertEqual(html, '<p style="color: red; text-align: center">a</p>')
+        self.assertEqual(
+            self.html('<span style="background-color: rgba(0, 0, 0, .5)">a</span>'),
+            '<span style="background-color: rgba(0, 0, 0, .5)">a</span>',
+        )
+
+    def test_style_rejects_css_tricks(self):
+        for style in (
+            'width: expression(alert(1))',
+            r'color: red\;background: url(x)',
+            r'color: \72 ed',
+            'font-family: x/**/',
+            'color: var(--x)',
+            'behavior: url(x.htc)',
+        ):
+            with self.subTest(style=style):
+                self.assertEqual(self.html(f'<p style="{style}">a</p>'), '<p>a</p>')
+
+    def test_unclosed_and_stray_tags_balanced(self):
+        self.assertEqual(self.html('<div><p><b>a</div>c</i>'), '<div><p><b>a</b></p></div>c')
+        self.assertEqual(self.html('1 < 2 & <b>3</b>'), '1 &lt; 2 &amp; <b>3</b>')
+
+    def test_text_excerpt_and_reading_time(self):
+        rendered = render_body('<h2>Sarlavha</h2><p>bir<br>ikki</p><script>yashirin</script>')
+        self.assertEqual(rendered.text, 'Sarlavha bir ikki')
+        self.assertEqual((rendered.word_count, rendered.reading_time), (3, 1))
+
+        long = render_body('<p>' + 'so‘z ' * 401 + '</p>')
+        self.assertEqual(long.reading_time, 3)
+        self.assertEqual(len(long.excerpt.split()), EXCERPT_WORDS)
+        self.assertTrue(long.excerpt.endswith('…'))
+
+    def test_empty_body_has_no_reading_time(self):
+        for raw in (None, '', '<p> </p>', '<script>x</script>'):
+            with self.subTest(raw=raw):
+                rendered = render_body(raw)
+                self.assertEqual((rendered.word_count, rendered.reading_time, rendered.excerpt), (0, 0, ''))
+
+
+# ------------------------------------------------------------------
+# Shartli GET: 304 javob ham ko‘rish sifatida yoziladi
+# ------------------------------------------------------------------
+class ConditionalDetailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = make_post(User.objects.create_user('muallif', password='x'))
+
+    def test_not_modified_response_still_counts_view(self):
+        url = reverse('blogs:post_detail', args=[self.post.pk])
+        with mock.patch.object(view_counts, 'record') as record:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(url, headers={'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, 304)
+        self.assertEqual(record.call_args_list, [mock.call(self.post.pk)] * 2)
+
+    def test_missing_post_is_not_counted(self):
+        Post.objects.filter(pk=self.post.pk).update(is_published=False)
+        with mock.patch.object(view_counts, 'record') as record:
+            response = self.client.get(reverse('blogs:post_detail', args=[self.post.pk]))
+        self.assertEqual(response.status_code, 404)
+        record.assert_not_called()
+
+
+# ------------------------------------------------------------------
+# /reactions/ va /like/: takroriy so‘rovlar, hisoblagichlar, almashtirish
+# ------------------------------------------------------------------
+class ReactionEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('oquvchi', password='x')
+        cls.post = make_post(User.objects.create_user('muallif', password='x'))
+        cls.comment = Comment.objects.create(post=cls.post, author=cls.user, content='Zo‘r')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def send(self, *ops):
+        ops = [{'type': type_name, 'id': pk, 'state': state} for type_name, pk, state in ops]
+        return self.client.post(reverse('blogs:reactions'), {'ops': ops}, content_type='application/json')
+
+    def counts(self, obj):
+        obj.refresh_from_db()
+        return obj.likes_count, obj.dislikes_count
+
+    def test_repeated_request_is_idempotent(self):
+        for _ in range(3):
+            response = self.send(('post', self.post.pk, 'like'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['results'], [
+                {'type': 'post', 'id': self.post.pk, 'likes': 1, 'dislikes': 0, 'user_like': Reaction.LIKE},
+            ])
+        self.assertEqual(PostReaction.objects.count(), 1)
+        self.assertEqual(self.counts(self.post), (1, 0))
+
+    def test_state_changes_update_counters(self):
+        self.send(('post', self.post.pk, 'like'), ('comment', self.comment.pk, 'dislike'))
+        self.assertEqual((self.counts(self.post), self.counts(self.comment)), ((1, 0), (0, 1)))
+
+        self.send(('post', self.post.pk, 'dislike'), ('comment', self.comment.pk, None))
+        self.assertEqual((self.counts(self.post), self.counts(self.comment)), ((0, 1), (0, 0)))
+        self.assertFalse(CommentReaction.objects.exists())
+
+        # Bir nishonga bir nechta amal — oxirgisi
+        response = self.send(('post', self.post.pk, 'like'), ('post', self.post.pk, 'none'))
+        self.assertIsNone(response.json()['results'][0]['user_like'])
+        self.assertEqual(self.counts(self.post), (0, 0))
+
+    def test_invalid_and_hidden_targets(self):
+        self.assertEqual(self.send(('post', self.post.pk, 'love')).status_code, 400)
+        self.assertEqual(self.client.post(reverse('blogs:reactions'), 'x', content_type='application/json').status_code, 400)
+        Comment.objects.filter(pk=self.comment.pk).update(is_approved=False)
+        self.assertEqual(self.send(('comment', self.comment.pk, 'like')).json(), {'results': []})
+
+        self.client.logout()
+        self.assertEqual(self.send(('post', self.post.pk, 'like')).status_code, 401)
+
+    def test_like_endpoint_toggles(self):
+        def click(action):
+            data = {'content_type': 'post', 'object_id': self.post.pk, 'action': action}
+            return self.client.post(reverse('blogs:like_dislike'), data).json()
+
+        self.assertEqual(click('like'), {'likes': 1, 'dislikes': 0, 'user_like': Reaction.LIKE})
+        self.assertEqual(click('dislike'), {'likes': 0, 'dislikes': 1, 'user_like': Reaction.DISLIKE})
+        self.assertEqual(click('dislike'), {'likes': 0, 'dislikes': 0, 'user_like': None})
+        self.assertFalse(PostReaction.objects.exists())
+        self.assertEqual(self.counts(self.post), (0, 0))
+
+
+# ------------------------------------------------------------------
+# SSE: deltalar seq bilan, snapshot ga kirganlari ajratib olinadi
+# ------------------------------------------------------------------
+@mock.patch.object(EventBus, 'active', new_callable=mock.PropertyMock, return_value=True)
+class LiveEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user('oquvchi', password='x')
+        cls.post = make_post(User.objects.create_user('muallif', password='x'))
+
+    def published(self, action):
+        with mock.patch.object(bus, 'publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            action()
+        return [call.args for call in publish.call_args_list]
+
+    def test_events_carry_increasing_seq(self, active):
+        events = self.published(lambda: PostReaction.objects.create(user=self.reader, post=self.post, value=Reaction.LIKE))
+        events += self.published(lambda: Comment.objects.create(post=self.post, author=self.reader, content='Zo‘r'))
+        self.assertEqual([(post_id, name) for post_id, name, _ in events], [(self.post.pk, 'reaction'), (self.post.pk, 'comment')])
+        reaction, comment = (data for _, _, data in events)
+        self.assertEqual((reaction['likes'], comment['delta'], comment['comment']['content']), (1, 1, 'Zo‘r'))
+        self.assertLess(reaction['seq'], comment['seq'])
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.activity_seq, comment['seq'])
+
+    def test_snapshot_includes_exactly_the_events_up_to_its_seq(self, active):
+        before = self.published(lambda: PostReaction.objects.create(user=self.reader, post=self.post, value=Reaction.LIKE))
+        snapshot = async_to_sync(_post_snapshot)(self.post.pk)
+        after = self.published(lambda: PostReaction.objects.filter(user=self.reader).delete())
+
+        self.assertEqual(snapshot['counts'][0], {'type': 'post', 'id': self.post.pk, 'likes': 1, 'dislikes': 0})
+        self.assertLessEqual(before[0][2]['seq'], snapshot['seq'])  # Mijoz tashlaydi — allaqachon hisobda
+        self.assertGreater(after[0][2]['seq'], snapshot['seq'])
+        self.assertEqual(after[0][2]['likes'], -1)
+
+    def test_full_save_keeps_activity_seq(self, active):
+        stale = Post.objects.get(pk=self.post.pk)
+        PostReaction.objects.create(user=self.reader, post=self.post, value=Reaction.DISLIKE)
+        stale.title = 'Yangi sarlavha'
+        stale.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.activity_seq, 1)
+
+
+# ------------------------------------------------------------------
+# O‘xshash maqolalar: ball va navbat orqali qayta hisoblash
+# ------------------------------------------------------------------
+class RelatedPostsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('muallif', password='x')
+        cls.python, cls.django, cls.sql = (Tag.objects.create(name=name, slug=name) for name in ('python', 'django', 'sql'))
+        cls.category = Category.objects.create(name='Dasturlash', slug='dasturlash')
+
+    def tagged(self, *tags, **kwargs):
+        post = make_post(self.author, **kwargs)
+        post.tags.set(tags)
+        return post
+
+    def related_ids(self, post):
+        return list(RelatedPost.objects.filter(post=post).order_by('-score').values_list('related_id', flat=True))
+
+    def test_similarity_weights_tags_category_and_age(self):
+        now = timezone.now()
+        tags = {1, 2}
+        self.assertEqual(similarity(tags, {1, 2}, False, now, now), 1.0)
+        self.assertEqual(similarity(tags, {3}, False, now, now), 0.0)
+        self.assertGreater(similarity(tags, {1}, True, now, now), similarity(tags, {1}, False, now, now))
+        self.assertAlmostEqual(similarity(tags, {1, 2}, False, now - timedelta(days=180), now), 0.5)
+
+    def test_rebuild_orders_by_score(self):
+        post = self.tagged(self.python, self.django)
+        exact = self.tagged(self.python, self.django)
+        partial = self.tagged(self.python, self.sql, category=self.category)  # 1/3 + 0.5
+        same_category = self.tagged(self.sql, category=self.category)
+        self.tagged(self.sql)  # Umumiy teg ham, kategoriya ham yo‘q
+        Post.objects.filter(pk=post.pk).update(category=self.category)
+
+        rebuild_all()
+        self.assertEqual(self.related_ids(post), [exact.pk, partial.pk, same_category.pk])
+
+    def test_tag_change_is_recomputed_by_the_queue(self):
+        post, other = self.tagged(self.python), self.tagged(self.sql)
+        rebuild_all()
+        self.assertEqual(self.related_ids(post), [])
+        Job.objects.all().delete()
+
+        other.tags.add(self.python)  # So‘rov yo‘lida hisoblanmaydi — faqat vazifa
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.payload), ('blogs.refresh_related', {'post_ids': [other.pk]}))
+        self.assertEqual(self.related_ids(post), [])
+
+        run_pending()
+        self.assertEqual(self.related_ids(post), [other.pk])
+        self.assertEqual(self.related_ids(other), [post.pk])
+
+
+# ------------------------------------------------------------------
+# Muallif sahifasi: statistika — ko‘rsatish uchun, sahifalash — haqiqiy COUNT
+# ------------------------------------------------------------------
+class AuthorPostsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('muallif', password='x')
+
+    def page(self, **params):
+        return self.client.get(reverse('blogs:author_posts', args=[self.author.username]), params)
+
+    @mock.patch('blogs.images.schedule_variants')  # Rasm ishchisi bu yerda kerak emas
+    def test_first_post_and_comment_create_the_stats_row(self, schedule_variants):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = make_post(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=post, author=User.objects.create_user('oquvchi', password='x'), content='...')
+        self.assertEqual(
+            list(AuthorStats.objects.order_by('author__username').values_list('author__username', 'post_count', 'comment_count')),
+            [('muallif', 1, 0), ('oquvchi', 0, 1)],
+        )
+
+    def test_missing_stats_row_is_not_written_on_read(self):
+        for _ in range(3):
+            make_post(self.author)
+        AuthorStats.objects.all().delete()
+
+        response = self.page()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['author_stats'].post_count, 3)
+        self.assertFalse(AuthorStats.objects.exists())
+
+    def test_pagination_ignores_stale_post_count(self):
+        for _ in range(12):
+            make_post(self.author)
+        AuthorStats.objects.filter(author=self.author).update(post_count=40)
+
+        response = self.page()
+        self.assertEqual(response.context['paginator'].num_pages, 2)
+        self.assertEqual(len(self.page(page=2).context['posts']), 2)
+        self.assertEqual(self.page(page=3).status_code, 404)
+
+
+# ------------------------------------------------------------------
+# FTS5 qidiruv: reyting og‘irliklari va indeksning signallar orqali sinxronligi
+# ------------------------------------------------------------------
+class SearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('muallif', password='x')
+
+    def found(self, query):
+        return [post_id for post_id, _ in search.search_posts(query)]
+
+    def test_title_match_outranks_body_match(self):
+        in_body = make_post(self.author, title='Boshqa mavzu', body='<p>Bu yerda django haqida gap bor</p>')
+        in_title = make_post(self.author, title='Django asoslari', body='<p>Kirish</p>')
+        self.assertEqual(self.found('django'), [in_title.pk, in_body.pk])
+
+    def test_snippet_is_escaped_and_highlighted(self):
+        make_post(self.author, body='<p>&lt;script&gt; va django</p>')
+        [(_, snippet)] = search.search_posts('django')
+        self.assertIn('<mark>django</mark>', snippet)
+        self.assertNotIn('<script>', snippet)
+
+    def test_signals_keep_index_in_sync(self):
+        post = make_post(self.author, title='Python')
+        self.assertEqual(self.found('python'), [post.pk])
+
+        tag = Tag.objects.create(name='ormlar', slug='ormlar')
+        post.tags.add(tag)
+        self.assertEqual(self.found('ormlar'), [post.pk])
+        tag.name = 'sqlalchemy'
+        tag.save()
+        self.assertEqual((self.found('ormlar'), self.found('sqlalchemy')), ([], [post.pk]))
+
+        post.is_published = False
+        post.save()
+        self.assertEqual(self.found('python'), [])
+        post.is_published = True
+        post.save()
+        self.assertEqual(self.found('python'), [post.pk])
+
+        post.delete()
+        self.assertEqual(self.found('python'), [])
+
+    def test_failed_rebuild_keeps_the_old_index(self):
+        post = make_post(self.author, title='Python')
+        with mock.patch('blogs.search._post_rows', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            search.rebuild_index()
+        self.assertEqual(self.found('python'), [post.pk])
+        self.assertEqual(search.rebuild_index(), 1)
+        self.assertEqual(self.found('python'), [post.pk])
@@ -5,10 +5,13 @@ app_name = 'blogs'
 
 urlpatterns = [
     path('', views.BlogListView.as_view(), name='post_list'),
+    path('posts/more/', views.PostCardsView.as_view(), name='post_cards'),
     path('post/<int:pk>/', views.BlogDetailView.as_view(), name='post_detail'), 
     path('post/new/', views.PostCreateView.as_view(), name='post_create'),
     path('post/<int:pk>/edit/', views.PostUpdateView.as_view(), name='post_update'),
     path('post/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post_delete'),
     path('author/<str:username>/', views.AuthorPostsListView.as_view(), name='author_posts'),
     path('like/', views.like_dislike, name='like_dislike'),
+    path('reactions/', views.reactions, name='reactions'),
+    path('post/<int:pk>/events/', views.post_events, name='post_events'),
 ]
\ No newline at end of file
@@ -0,0 +1,132 @@
+# blogs/viewcounts.py
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, Value, When
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Ko‘rishlar hisoblagichi — write-behind bufer.
+# So‘rovlar faqat xotiradagi deltani oshiradi, fon oqimi esa deltalarni
+# bitta UPDATE bilan bazaga yozadi (vaqt yoki chegara bo‘yicha).
+# ------------------------------------------------------------------
+FLUSH_INTERVAL = getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 10)  # soniya
+FLUSH_THRESHOLD = getattr(settings, 'VIEW_COUNT_FLUSH_THRESHOLD', 200)  # ko‘rish
+FLUSH_REQUEST_KEY = 'post_views_flush_requested'
+POLL_INTERVAL = 1
+
+
+def _merge(target, deltas, sign=1):
+    for pk, delta in deltas.items():
+        total = target.get(pk, 0) + sign * delta
+        if total:
+            target[pk] = total
+        else:
+            target.pop(pk, None)
+
+
+class ViewCountBuffer:
+    def __init__(self, interval=FLUSH_INTERVAL, threshold=FLUSH_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._deltas = {}
+        self._inflight = {}  # Yozilayotgan deltalar — commit gacha ko‘rsatiladigan songa qo‘shiladi
+        self._total = 0
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._last_flush = time.time()
+
+    def record(self, post_id):
+        """Bitta ko‘rishni qayd etish — bazaga tegmaydi"""
+        with self._lock:
+            self._deltas[post_id] = self._deltas.get(post_id, 0) + 1
+            self._total += 1
+            due = self._total >= self.threshold
+        self._ensure_thread()
+        if due:
+            self._wakeup.set()
+
+    def pending(self, post_id):
+        """Hali bazaga yozilmagan ko‘rishlar (ko‘rsatiladigan son uchun)"""
+        with self._lock:
+            return self._deltas.get(post_id, 0) + self._inflight.get(post_id, 0)
+
+    def flush(self):
+        """Barcha deltalarni bitta UPDATE bilan yozish — qaytaradi: yozilgan ko‘rishlar"""
+        from .counters import apply_author_views
+        from .models import Post
+
+        with self._lock:
+            deltas, self._deltas, self._total = self._deltas, {}, 0
+            _merge(self._inflight, deltas)
+            self._last_flush = time.time()
+        if not deltas:
+            return 0
+        try:
+            with transaction.atomic():
+                Post.objects.filter(pk__in=deltas).update(views=F('views') + Case(
+                    *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                    default=Value(0),
+                ))
+                apply_author_views(deltas)
+        except Exception:
+            # Yo‘qotmaslik uchun deltalarni buferga qaytaramiz
+            with self._lock:
+                _merge(self._inflight, deltas, sign=-1)
+                _merge(self._deltas, deltas)
+                self._total += sum(deltas.values())
+            raise
+        # Faqat commit dan keyin — oraliqdagi o‘quvchi eski qiymat + 0 ni ko‘rmasin
+        with self._lock:
+            _merge(self._inflight, deltas, sign=-1)
+        return sum(deltas.values())
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+                self._thread.start()
+
+    def _flush_requested(self):
+        requested_at = cache.get(FLUSH_REQUEST_KEY)
+        return requested_at is not None and requested_at > self._last_flush
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(POLL_INTERVAL)
+            self._wakeup.clear()
+            if time.time() - self._last_flush < self.interval and not self._flush_requested():
+                with self._lock:
+                    if self._total < self.threshold:
+                        continue
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Ko‘rishlar sonini yozib bo‘lmadi")
+            finally:
+                connection.close()
+
+
+view_counts = ViewCountBuffer()
+
+
+def request_flush():
+    """Barcha jarayonlarga (umumiy kesh orqali) bir zumda yozishni so‘rash"""
+    cache.set(FLUSH_REQUEST_KEY, time.time(), FLUSH_INTERVAL * 6)
+
+
+@atexit.register
+def _flush_on_shutdown():
+    try:
+        view_counts.flush()
+    except Exception:
+        logger.exception("To‘xtash paytida ko‘rishlar sonini yozib bo‘lmadi")
@@ -1,51 +1,91 @@
 # blogs/views.py
+import asyncio
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.views.decorators.http import require_POST, require_safe, condition
+from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt  # AJAX uchun ixtiyoriy, lekin xavfsizlik uchun CSRF token ishlatiladi
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count, Q, Prefetch, F
+from django.db.models import Count, Q, Prefetch, F, Case, When, IntegerField
 from django.core.cache import cache  # Performance uchun caching
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse_lazy
 from django.urls import reverse
 
-from .models import Post, Category, Tag, Comment, LikeDislike
+from database.replica import PRIMARY
+from database.routers import primary_reads
+
+from .models import Post, Category, Tag, Comment, Reaction, RelatedPost, AuthorStats
 from .forms import PostForm, CommentForm
+from .cache import list_page_cache_key, LIST_CACHE_TIMEOUT
+from . import search
+from .viewcounts import view_counts
+from .pagination import paginate_by_cursor, CURSOR_ORDERING
+from .reactions import ReactionError, apply_reactions, load_user_reactions, parse_operations
+from .related import RELATED_LIMIT
+from .counters import author_totals
+from .conditional import count_post_view, post_list_etag, post_detail_etag, post_detail_last_modified
+from .events import bus, format_event
 
 User = get_user_model()
 
 # ------------------------------------------------------------------
 # 1. Blog ro‘yxati (Bosh sahifa) - Optimallashtirilgan: Caching + optimal queries
 # ------------------------------------------------------------------
+# Mehmonlar keshi va ETag — asosiy bazadan (replikadagi eski sahifa yangi avlod ostida qolmasin)
+@method_decorator(primary_reads, name='dispatch')
+@method_decorator(condition(etag_func=post_list_etag), name='get')
 class BlogListView(ListView):
     model = Post
     template_name = 'blogs/post_list.html'
     context_object_name = 'posts'
     paginate_by = 9
     ordering = ['-published_at']
+    search_snippets = None
+
+    def get(self, request, *args, **kwargs):
+        # Mehmonlar uchun tayyor HTML keshdan — SQL umuman ishlamaydi
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        cache_key = list_page_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda r: cache.set(cache_key, (r.content, r['Content-Type']), LIST_CACHE_TIMEOUT) if not r.cookies else None
+        )
+        return response
 
     def get_queryset(self):
-        cache_key = f"blog_list_{self.request.GET.urlencode()}"
-        cached_qs = cache.get(cache_key)
-        if cached_qs is not None:
-            return cached_qs
-
+        # Like va izoh sonlari — Post ustunlarida (likes_count, comments_count)
+        # Katta matn ustunlari ro‘yxatda kerak emas (kartochkada — excerpt)
         queryset = Post.objects.filter(is_published=True).select_related('author', 'category').prefetch_related(
             Prefetch('tags', queryset=Tag.objects.all()),
-            Prefetch('likes', queryset=LikeDislike.objects.all())
-        ).annotate(
-            comment_count=Count('comments', filter=Q(comments__is_approved=True)),
-            like_count=Count('likes', filter=Q(likes__value=1))
-        )
+        ).defer('body', 'body_html').order_by(*CURSOR_ORDERING)
 
         # Qidiruv
         q = self.request.GET.get('q')
-        if q:
+        if q and search.is_available():
+            # FTS5 indeksi — reyting bo‘yicha tartiblangan natijalar
+            results = search.search_posts(q)
+            self.search_snippets = dict(results)
+            ranking = [When(pk=pk, then=position) for position, (pk, _) in enumerate(results)]
+            if not ranking:
+                return queryset.none()
+            queryset = queryset.filter(pk__in=self.search_snippets).order_by(
+                Case(*ranking, output_field=IntegerField())
+            )
+        elif q:
             queryset = queryset.filter(
                 Q(title__icontains=q) | Q(body__icontains=q) | Q(tags__name__icontains=q) | Q(author__username__icontains=q)
             ).distinct()
@@ -60,12 +100,54 @@ class BlogListView(ListView):
         if tag:
             queryset = queryset.filter(tags__slug=tag)
 
-        cache.set(cache_key, queryset, 60 * 5)  # 5 minut cache
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        # Qidiruv (reyting tartibi) va eski ?page=N havolalari — oddiy Paginator
+        if self.search_snippets is not None or self.request.GET.get('page'):
+            return super().paginate_queryset(queryset, page_size)
+        # Qolgan hamma holatda — kursor: COUNT va OFFSET yo‘q
+        page = paginate_by_cursor(queryset, self.request.GET.get('cursor'), page_size)
+        return (None, page, page.object_list, page.has_next())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Qidiruvda topilgan parchalarni kartalarga biriktirish
+        if self.search_snippets:
+            for post in context['page_obj']:
+                post.search_snippet = self.search_snippets.get(post.pk)
+        return context
+
+
+# ------------------------------------------------------------------
+# 1.1. "Keyingi" tugmasi uchun — faqat kartalar (HTML parcha) + keyingi kursor
+# ------------------------------------------------------------------
+class PostCardsView(BlogListView):
+    template_name = 'blogs/includes/post_cards.html'
+
+    def render_to_response(self, context, **response_kwargs):
+        page = context['page_obj']
+        if page.has_next():
+            next_cursor = getattr(page, 'next_cursor', None)
+            next_page = None if next_cursor else page.next_page_number()
+        else:
+            next_cursor = next_page = None
+        response = super().render_to_response(context, **response_kwargs)
+        response.add_post_render_callback(lambda r: JsonResponse({
+            'html': r.content.decode(),
+            'next_cursor': next_cursor,
+            'next_page': next_page,
+        }))
+        return response
+
 # ------------------------------------------------------------------
 # 2. Maqola batafsil ko‘rish + views hisoblash + izoh qoldirish + Author profil link
 # ------------------------------------------------------------------
+@method_decorator(primary_reads, name='dispatch')  # ETag va sahifa bitta (asosiy) bazadan
+@method_decorator([
+    count_post_view,  # Tashqarida: 304 javob ham ko‘rish sifatida yoziladi
+    condition(etag_func=post_detail_etag, last_modified_func=post_detail_last_modified),
+], name='get')
 class BlogDetailView(DetailView):
     model = Post
     template_name = 'blogs/post_detail.html'
@@ -73,17 +155,16 @@ class BlogDetailView(DetailView):
     pk_url_kwarg = 'pk'  # ID bilan ishlaydi
 
     def get_queryset(self):
-        return Post.objects.filter(is_published=True).select_related('author', 'category').prefetch_related(
+        # Xom body kerak emas — sahifada tayyor body_html ko‘rsatiladi
+        return Post.objects.filter(is_published=True).select_related('author', 'category').defer('body').prefetch_related(
             Prefetch('tags', queryset=Tag.objects.all()),
             Prefetch('comments', queryset=Comment.objects.filter(is_approved=True).select_related('author').order_by('-created_at'), to_attr='approved_comments'),
-            Prefetch('likes', queryset=LikeDislike.objects.all())
         )
 
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        # Views ni atomik oshirish
-        Post.objects.filter(pk=obj.pk).update(views=F('views') + 1)
-        obj.refresh_from_db(fields=['views'])
+        # Views — bazaga emas, buferga (count_post_view yozadi, fon oqimi yig‘ib bazaga)
+        obj.views += view_counts.pending(obj.pk)
         return obj
 
     def get_context_data(self, **kwargs):
@@ -93,37 +174,18 @@ class BlogDetailView(DetailView):
         # Izoh formasi
         context['comment_form'] = CommentForm()
 
-        # O‘xshash maqolalar
-        related_qs = Post.objects.filter(
-            Q(category=post.category) | Q(tags__in=post.tags.all()),
-            is_published=True
-        ).exclude(pk=post.pk).select_related('author').distinct()[:6]
-        context['related_posts'] = related_qs
-
-        # Like holati (post uchun)
-        if self.request.user.is_authenticated:
-            like = LikeDislike.objects.filter(
-                user=self.request.user,
-                content_type=ContentType.objects.get_for_model(Post),
-                object_id=post.pk
-            ).first()
-            context['user_like'] = like.value if like else None
-        else:
-            context['user_like'] = None
-
-        # Izohlar uchun user_liked qo‘shish — TO‘G‘RI USUL!
-        if self.request.user.is_authenticated:
-            user_liked_comment_ids = LikeDislike.objects.filter(
-                user=self.request.user,
-                content_type=ContentType.objects.get_for_model(Comment),
-                value=1
-            ).values_list('object_id', flat=True)
-
-            for comment in post.approved_comments:
-                comment.user_liked = comment.pk in user_liked_comment_ids
-        else:
-            for comment in post.approved_comments:
-                comment.user_liked = False
+        # O‘xshash maqolalar — oldindan hisoblangan indeksdan, bitta so‘rov
+        context['related_posts'] = [
+            entry.related for entry in RelatedPost.objects.filter(post=post)
+            .select_related('related__author').defer('related__body', 'related__body_html')
+            .order_by('-score')[:RELATED_LIMIT]
+        ]
+
+        # Like holati — post va barcha izohlar uchun bitta so‘rov
+        load_user_reactions([post, *post.approved_comments], self.request.user)
+        context['user_like'] = post.user_reaction
+        for comment in post.approved_comments:
+            comment.user_liked = comment.user_reaction == Reaction.LIKE
 
         return context
     def post(self, request, *args, **kwargs):
@@ -227,20 +289,44 @@ class AuthorPostsListView(ListView):
     context_object_name = 'posts'
     paginate_by = 10
 
+    def get(self, request, *args, **kwargs):
+        # Muallif va uning statistikasi — bitta so‘rov (blog_stats — OneToOne)
+        self.author = get_object_or_404(User.objects.select_related('blog_stats'), username=self.kwargs['username'])
+        try:
+            self.author_stats = self.author.blog_stats
+        except AuthorStats.DoesNotExist:
+            # Qatorni signallar yaratadi — o‘qish so‘rovida faqat hisoblab ko‘rsatamiz
+            self.author_stats = AuthorStats(author=self.author, **author_totals(self.author.pk))
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
-        author = get_object_or_404(User, username=self.kwargs['username'])
-        return Post.objects.filter(author=author, is_published=True).select_related('category').prefetch_related('tags').order_by('-published_at')
+        # Sahifalash — haqiqiy COUNT bo‘yicha (AuthorStats faqat ko‘rsatish uchun, eskirgan bo‘lishi mumkin)
+        return Post.objects.filter(author=self.author, is_published=True).select_related('category').prefetch_related('tags').defer('body', 'body_html').order_by('-published_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        author = get_object_or_404(User, username=self.kwargs['username'])
-        context['author'] = author
-        context['post_count'] = self.object_list.count()
+        context['author'] = self.author
+        context['author_stats'] = self.author_stats
+        context['post_count'] = self.author_stats.post_count
         return context
 
 
 # ------------------------------------------------------------------
-# AJAX: Like / Dislike (optimallashtirilgan + CSRF exempt ixtiyoriy)
+# AJAX: reaksiyalar — bir nechta (tur, id, holat) amali bitta so‘rovda
+# ------------------------------------------------------------------
+@require_POST
+def reactions(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Kirish talab qilinadi'}, status=401)
+    try:
+        desired = parse_operations(json.loads(request.body))
+    except (ValueError, ReactionError) as exc:  # JSONDecodeError ham ValueError
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse({'results': apply_reactions(request.user, desired)})
+
+
+# ------------------------------------------------------------------
+# AJAX: Like / Dislike — eski forma API si (bosish = almashtirish), reactions ustida
 # ------------------------------------------------------------------
 @csrf_exempt  # AJAX uchun, lekin frontendda CSRF token jo‘natilsin!
 @require_POST
@@ -252,35 +338,84 @@ def like_dislike(request):
     object_id = request.POST.get('object_id')
     action = request.POST.get('action')  # 'like' yoki 'dislike'
 
-    if not all([content_type_str, object_id, action]):
+    if not all([content_type_str, object_id, action]) or content_type_str not in ('post', 'comment') or not object_id.isdigit():
         return JsonResponse({'error': 'Maʼlumot yetishmayapti'}, status=400)
 
+    # Bosish — almashtirish: xuddi shu reaksiya bo‘lsa olib tashlanadi (tranzaksiya ichida)
     try:
-        model_class = Post if content_type_str == 'post' else Comment
-        obj = model_class.objects.get(pk=object_id)
-    except model_class.DoesNotExist:
-        return JsonResponse({'error': 'Obʼyekt topilmadi'}, status=404)
+        desired = parse_operations({'ops': [{'type': content_type_str, 'id': object_id, 'state': action}]})
+    except ReactionError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
 
-    content_type = ContentType.objects.get_for_model(model_class)
-    value = 1 if action == 'like' else -1
+    results = apply_reactions(request.user, desired, toggle=True)
+    if not results:
+        return JsonResponse({'error': 'Obʼyekt topilmadi'}, status=404)
+    return JsonResponse({
+        'likes': results[0]['likes'],
+        'dislikes': results[0]['dislikes'],
+        'user_like': results[0]['user_like'],
+    })
 
-    # Update or create
-    like_obj, created = LikeDislike.objects.update_or_create(
-        user=request.user,
-        content_type=content_type,
-        object_id=object_id,
-        defaults={'value': value}
-    )
 
-    if not created and like_obj.value == value:
-        like_obj.delete()
-        user_like = None
-    else:
-        user_like = value
+# ------------------------------------------------------------------
+# SSE: maqola sahifasi uchun jonli like va izoh hisoblagichlari (faqat ASGI da oqim)
+# ------------------------------------------------------------------
+EVENTS_KEEPALIVE = 20  # soniya: proksi ulanishni yopmasin
+EVENTS_RETRY = 5000  # ms: uzilsa, brauzer shuncha vaqtdan keyin qayta ulanadi
+EVENTS_POLL_RETRY = 15000  # ms: WSGI da — faqat snapshot, keyin qayta so‘rov
+SNAPSHOT_ATTEMPTS = 3  # Izchil snapshot uchun urinishlar (band maqolada)
+
+
+async def _post_snapshot(pk):
+    """Boshlang‘ich sonlar va seq — keyingi deltalardan faqat seq i kattalari qo‘shiladi.
+
+    Asosiy bazadan (replika eski bo‘lishi mumkin). Izohlar alohida so‘rovda o‘qiladi:
+    oraliqda o‘zgarish commit bo‘lsa, activity_seq farq qiladi — qayta o‘qiymiz.
+    """
+    posts = Post.objects.using(PRIMARY).filter(pk=pk, is_published=True)
+    for _ in range(SNAPSHOT_ATTEMPTS):
+        post = await posts.values('likes_count', 'dislikes_count', 'comments_count', 'activity_seq').afirst()
+        if post is None:
+            return None
+        counts = [{'type': 'post', 'id': pk, 'likes': post['likes_count'], 'dislikes': post['dislikes_count']}]
+        async for comment_id, likes, dislikes in Comment.objects.using(PRIMARY).filter(
+            post_id=pk, is_approved=True
+        ).values_list('pk', 'likes_count', 'dislikes_count'):
+            counts.append({'type': 'comment', 'id': comment_id, 'likes': likes, 'dislikes': dislikes})
+        if await posts.values_list('activity_seq', flat=True).afirst() == post['activity_seq']:
+            break
+    return {'comments': post['comments_count'], 'counts': counts, 'seq': post['activity_seq']}
+
+
+async def _event_stream(pk, entry, snapshot):
+    _, queue = entry
+    try:
+        yield f"retry: {EVENTS_RETRY}\n" + format_event('snapshot', snapshot)
+        while True:
+            try:
+                name, data = await asyncio.wait_for(queue.get(), EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(name, data)
+    finally:
+        bus.unsubscribe(pk, entry)  # Mijoz uzildi (ASGI generatorni bekor qiladi)
+
+
+@require_safe
+async def post_events(request, pk):
+    # Avval obuna — snapshot va obuna orasidagi hodisalar yo‘qolmasin
+    entry = bus.subscribe(pk) if isinstance(request, ASGIRequest) else None
+    snapshot = await _post_snapshot(pk)
+    if snapshot is None:
+        if entry is not None:
+            bus.unsubscribe(pk, entry)
+        raise Http404
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    if entry is None:
+        # WSGI: cheksiz oqim ishchini band qiladi — bitta snapshot, brauzer qayta so‘raydi
+        content = f"retry: {EVENTS_POLL_RETRY}\n" + format_event('snapshot', snapshot)
+        return HttpResponse(content, content_type='text/event-stream', headers=headers)
+    return StreamingHttpResponse(_event_stream(pk, entry, snapshot), content_type='text/event-stream', headers=headers)
 
-    # Yangi sonlarni qaytarish
-    return JsonResponse({
-        'likes': obj.total_likes(),
-        'dislikes': obj.total_dislikes(),
-        'user_like': user_like
-    })
\ No newline at end of file
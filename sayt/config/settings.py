@@ -27,10 +27,19 @@ INSTALLED_APPS = [
     'blogs',
     'pages',
     'sert',
+    'filestore',
+    'jobs',
+    'database',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Xeshlangan, oldindan siqilgan static fayllar (collectstatic dan keyin)
+    'filestore.middleware.StaticFilesMiddleware',
+    # prerender_pages yozgan sahifalar (shablon o‘zgarsa — jonli render)
+    'pages.middleware.PrerenderedPagesMiddleware',
+    # GET → replika, yozgan mijoz — asosiy bazada (sessiya yozuvlari ham hisoblanadi)
+    'database.middleware.PrimaryReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -64,8 +73,29 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'OPTIONS': {
+            # Yozuvchi tranzaksiya boshida qulfni oladi — o‘rtada "database is locked" bo‘lmaydi
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,  # busy_timeout, soniya
+        },
+        # Ulanish so‘rovlar orasida saqlanadi (PRAGMA lar har so‘rovda qayta bajarilmaydi)
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # O‘qish replikasi — manage.py refresh_replica --loop yangilab turadi
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db-replica.sqlite3',
+        'OPTIONS': {'timeout': 20},
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    },
 }
+# WAL, synchronous, mmap va kesh — database/sqlite.py (connection_created)
+DATABASE_ROUTERS = ['database.routers.PrimaryReplicaRouter']
+REPLICA_REFRESH_INTERVAL = 30  # soniya
+REPLICA_MAX_LAG = 300  # soniya: bundan eski snapshot ishlatilmaydi (o‘qish — asosiy bazadan)
 
 
 
@@ -105,6 +135,27 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Yuklangan fayllar (maqola rasmlari, sertifikatlar, CKEditor) — kontent bo‘yicha deduplikatsiya
+STORAGES = {
+    'default': {
+        'BACKEND': 'filestore.storage.DeduplicatingStorage',
+    },
+    'staticfiles': {
+        # Kontent xeshli nomlar + .gz/.br nusxalar (brotli — ixtiyoriy paket)
+        'BACKEND': 'filestore.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+# Oldindan render qilingan sahifalar (manage.py prerender_pages)
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+# Admin orqali yuklangan sertifikat importlari va manifestlar (ommaga ochiq emas — MEDIA_ROOT dan tashqarida)
+CERTIFICATE_IMPORT_ROOT = BASE_DIR / 'imports'
+
+# Fayl uzatishni veb-serverga topshirish: None | 'x-accel' (nginx) | 'x-sendfile' (Apache)
+# nginx:  location /protected/media/ { internal; alias /path/to/media/; }
+FILE_OFFLOAD = os.environ.get('FILE_OFFLOAD') or None
+FILE_OFFLOAD_PREFIX = '/protected/media/'
+
 CKEDITOR_UPLOAD_PATH = 'uploads/'  # Body ichida yuklangan rasmlar uchun
 CKEDITOR_CONFIGS = {
     'default': {
@@ -117,3 +168,18 @@ CKEDITOR_CONFIGS = {
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Umumiy kesh — barcha ishchi jarayonlar bitta katalogni ko‘radi (LocMemCache jarayon ichida:
+# bir ishchidagi avlod oshishi yoki invalidatsiya boshqalariga yetmas edi).
+# Ro‘yxat sahifalari, ro‘yxat avlodi, sertifikat metama'lumoti, ko‘rishlarni yozish so‘rovi.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR') or BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# Ko‘rishlar hisoblagichi: bufer har N soniyada yoki M ta ko‘rishda bazaga yoziladi
+VIEW_COUNT_FLUSH_INTERVAL = 10
+VIEW_COUNT_FLUSH_THRESHOLD = 200
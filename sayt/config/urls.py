@@ -1,7 +1,10 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from filestore.views import serve as serve_media
 
 urlpatterns = [
     path('ckeditor/', include('ckeditor_uploader.urls')),
@@ -11,5 +14,8 @@ urlpatterns = [
     path('c/', include('sert.urls')),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT) 
\ No newline at end of file
+# MEDIA — Range, If-Range va 304 bilan (static() faqat DEBUG da ishlaydi va Range ni bilmaydi)
+urlpatterns += [
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+]
+# STATIC_ROOT ni filestore.middleware.StaticFilesMiddleware beradi 
\ No newline at end of file
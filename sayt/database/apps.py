@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class DatabaseConfig(AppConfig):
+    name = 'database'
+    verbose_name = "Ma'lumotlar bazasi"
+
+    def ready(self):
+        from .sqlite import configure_connection
+        # Har bir yangi ulanishda PRAGMA lar (CONN_MAX_AGE bilan — jarayonda bir marta)
+        connection_created.connect(configure_connection, dispatch_uid='database.configure_connection')
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from database.sqlite import checkpoint_status, current_pragmas, probe_write_lock
+
+
+class Command(BaseCommand):
+    help = "SQLite holati: PRAGMA lar, yozish qulfini kutish vaqti va WAL checkpoint ortda qolishi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="DATABASES kaliti")
+        parser.add_argument('--samples', type=int, default=5, help="BEGIN IMMEDIATE o‘lchovlari soni")
+        parser.add_argument(
+            '--checkpoint', choices=['PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'], default='PASSIVE',
+            help="wal_checkpoint rejimi (TRUNCATE — WAL faylini qisqartiradi)",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Faqat SQLite uchun (bu: {connection.vendor})")
+        if connection.is_in_memory_db():
+            raise CommandError("Xotiradagi baza — WAL va qulflar o‘lchanmaydi")
+
+        connection.ensure_connection()
+        self.stdout.write("PRAGMA:")
+        for name, value in current_pragmas(connection).items():
+            self.stdout.write(f"  {name} = {value}")
+
+        waits = probe_write_lock(str(connection.settings_dict['NAME']), samples=options['samples'])
+        taken = [wait for wait in waits if wait is not None]
+        self.stdout.write("Yozish qulfi (BEGIN IMMEDIATE):")
+        if taken:
+            self.stdout.write(
+                f"  o‘rtacha {sum(taken) / len(taken) * 1000:.1f} ms, eng ko‘p {max(taken) * 1000:.1f} ms"
+            )
+        failed = len(waits) - len(taken)
+        if failed:
+            self.stdout.write(self.style.ERROR(f"  {failed}/{len(waits)} urinishda qulf olinmadi (database is locked)"))
+
+        status = checkpoint_status(connection, options['checkpoint'])
+        self.stdout.write(f"WAL checkpoint ({options['checkpoint']}):")
+        self.stdout.write(
+            f"  WAL: {status['wal_frames']} sahifa ({status['wal_size'] / 1024:.0f} KiB), "
+            f"ko‘chirilgan: {status['checkpointed']}, ortda: {status['lag_frames']} sahifa "
+            f"({status['lag_bytes'] / 1024:.0f} KiB)"
+        )
+        if status['busy']:
+            self.stdout.write(self.style.WARNING("  Checkpoint to‘liq bajarilmadi — o‘quvchi yoki yozuvchi band"))
+
+        if failed or status['busy']:
+            self.stdout.write(self.style.WARNING("Baza band"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Baza sog‘lom"))
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from database import replica
+
+
+class Command(BaseCommand):
+    help = "O‘qish replikasini asosiy bazadan yangilash (SQLite backup API)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=None, help="Har N soniyada takrorlash (berilmasa — bir marta)")
+        parser.add_argument('--loop', action='store_true', help="REPLICA_REFRESH_INTERVAL bilan takrorlash")
+
+    def handle(self, *args, **options):
+        if not replica.is_configured():
+            raise CommandError("DATABASES da 'replica' aliasi yo‘q")
+        interval = options['interval'] or (settings.REPLICA_REFRESH_INTERVAL if options['loop'] else None)
+        try:
+            while True:
+                duration = replica.take_snapshot()
+                self.stdout.write(self.style.SUCCESS(f"Replika yangilandi: {replica.replica_path()} ({duration:.2f} s)"))
+                if interval is None:
+                    break
+                time.sleep(max(interval - duration, 0))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,72 @@
+import math
+import time
+
+from django.conf import settings
+
+from . import replica
+from .routers import allow_replica, deny_replica, reset_route, wrote_to_primary
+
+PIN_COOKIE = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_SLACK = 5  # soniya: snapshot nusxalanishi davom etayotgan bo‘lishi mumkin
+
+
+def _pinned_until_snapshot(request):
+    """Cookie dagi yozuv vaqti hali replikaga tushmagan bo‘lsa — True"""
+    try:
+        wrote_at = float(request.COOKIES[PIN_COOKIE])
+    except (KeyError, ValueError):
+        return False
+    taken = replica.snapshot_time()
+    return taken is None or taken <= wrote_at
+
+
+def _pin_max_age(now):
+    """Cookie muddati — yozuvni o‘z ichiga oladigan snapshot kutilguncha (soniya, 0 — kerak emas).
+
+    Navbatdagi snapshot: oxirgisi + REPLICA_REFRESH_INTERVAL. U kechiksa — replika
+    eskirib (REPLICA_MAX_LAG) o‘z-o‘zidan ishlatilmay qolguncha.
+    """
+    taken = replica.snapshot_time()
+    if taken is None:
+        return 0  # Replika yo‘q — barcha o‘qishlar asosiy bazada
+    expected = taken + settings.REPLICA_REFRESH_INTERVAL + PIN_SLACK
+    if expected <= now:
+        expected = taken + settings.REPLICA_MAX_LAG
+    return max(math.ceil(expected - now), 0)
+
+
+class PrimaryReplicaMiddleware:
+    """O‘qish so‘rovlariga replikani ochish va yozgan mijozni asosiy bazaga "yopishtirish".
+
+    Yozuv bo‘lgan javobga primary_pin cookie (yozuv vaqti) qo‘yiladi: shu vaqtdan
+    keyingi snapshot paydo bo‘lguncha mijozning barcha o‘qishlari asosiy bazada —
+    o‘z izohi, like yoki login sessiyasini doim ko‘radi.
+    Sessiya yozuvlari ham hisoblansin — SessionMiddleware dan oldin turadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        allowed = request.method in SAFE_METHODS and not _pinned_until_snapshot(request)
+        tokens = allow_replica(allowed)
+        try:
+            response = self.get_response(request)
+            wrote = wrote_to_primary()
+        finally:
+            reset_route(tokens)
+        if wrote and replica.is_configured():
+            now = time.time()
+            max_age = _pin_max_age(now)
+            if max_age:
+                response.set_cookie(
+                    PIN_COOKIE, f"{now:.3f}", max_age=max_age,
+                    httponly=True, samesite='Lax', secure=request.is_secure(),
+                )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # @primary_reads: kesh to‘ldiradigan va validator hisoblaydigan view lar
+        if getattr(view_func, 'reads_primary', False):
+            deny_replica()
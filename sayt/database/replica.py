@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+# ------------------------------------------------------------------
+# Lokal replika: asosiy bazaning SQLite backup API bilan olingan nusxasi.
+# refresh_replica buyrug‘i uni davriy yangilaydi; o‘quvchi so‘rovlar
+# (database.routers) shu nusxadan o‘qiydi va yozuvchi bilan raqobatlashmaydi.
+#
+# <replika>.snapshot belgi faylining mtime — snapshot boshlangan vaqt:
+# ma'lumotlar kamida shu paytdagidek yangi. Belgi yo‘q (replikaga tasodifan
+# ulanib bo‘sh fayl yaratilgan) yoki REPLICA_MAX_LAG dan eski bo‘lsa — ishlatilmaydi.
+# ------------------------------------------------------------------
+PRIMARY = 'default'
+REPLICA = 'replica'
+STAT_INTERVAL = 1.0  # soniya: fayl holati shuncha vaqt keshlanadi
+
+_lock = threading.Lock()
+_state = {'checked_at': 0.0, 'snapshot_time': None}
+
+
+def is_configured():
+    return REPLICA in settings.DATABASES
+
+
+def replica_path():
+    return str(settings.DATABASES[REPLICA]['NAME'])
+
+
+def marker_path():
+    return replica_path() + '.snapshot'
+
+
+def snapshot_time():
+    """Oxirgi snapshot vaqti (unix) yoki None — fayl yo‘q"""
+    now = time.monotonic()
+    if now - _state['checked_at'] < STAT_INTERVAL:
+        return _state['snapshot_time']
+    with _lock:
+        try:
+            _state['snapshot_time'] = os.stat(marker_path()).st_mtime
+        except (FileNotFoundError, KeyError):
+            _state['snapshot_time'] = None
+        _state['checked_at'] = now
+    return _state['snapshot_time']
+
+
+def is_fresh():
+    taken = snapshot_time()
+    return taken is not None and time.time() - taken <= settings.REPLICA_MAX_LAG
+
+
+def take_snapshot(timeout=20):
+    """Asosiy bazadan replikaga to‘liq nusxa (bitta qadamda) — qaytaradi: davomiyligi, soniya.
+
+    Nusxa joyida yoziladi: replikaga ulangan o‘quvchilar (WAL) to‘xtamaydi va
+    yangilangan sahifalarni keyingi tranzaksiyasida ko‘radi.
+    """
+    started = time.time()
+    source = sqlite3.connect(str(settings.DATABASES[PRIMARY]['NAME']), timeout=timeout)
+    target = sqlite3.connect(replica_path(), timeout=timeout)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    with open(marker_path(), 'w') as marker:
+        marker.write(f"{started:.3f}\n")
+    os.utime(marker_path(), (started, started))
+    _state['checked_at'] = 0.0
+    return time.time() - started
@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+from . import replica
+
+# ------------------------------------------------------------------
+# O‘qish → replika, yozish → asosiy baza.
+#
+# Replika faqat PrimaryReplicaMiddleware ruxsat bergan so‘rovlarda
+# (GET/HEAD, yaqinda yozmagan mijoz) ishlatiladi. Fon oqimlari, ishchilar
+# va buyruqlar — har doim asosiy bazada (ContextVar standart qiymati).
+# So‘rov ichida birinchi yozuvdan keyin qolgan o‘qishlar ham asosiy bazaga.
+#
+# Keshni to‘ldiradigan yoki validator (ETag, Last-Modified) hisoblaydigan kod
+# replikadan o‘qimasin — eski ma'lumot yangi kalit ostida saqlanib qoladi:
+# view lar uchun @primary_reads, qolganlari uchun use_primary().
+# ------------------------------------------------------------------
+_replica_allowed = ContextVar('replica_allowed', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+
+def allow_replica(allowed):
+    """So‘rov boshida — qaytaradi: tokenlar (reset_route uchun)"""
+    return _replica_allowed.set(allowed), _wrote.set(False)
+
+
+def reset_route(tokens):
+    allowed_token, wrote_token = tokens
+    _replica_allowed.reset(allowed_token)
+    _wrote.reset(wrote_token)
+
+
+def wrote_to_primary():
+    return _wrote.get()
+
+
+def deny_replica():
+    """So‘rovning qolgan qismi — faqat asosiy baza (reset_route qaytaradi)"""
+    _replica_allowed.set(False)
+
+
+@contextmanager
+def use_primary():
+    """Blok ichidagi o‘qishlar — asosiy bazadan"""
+    token = _replica_allowed.set(False)
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+def primary_reads(view):
+    """View va uning javobini chizish (TemplateResponse) — asosiy bazadan.
+    Belgini PrimaryReplicaMiddleware.process_view o‘qiydi."""
+    view.reads_primary = True
+    return view
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            _replica_allowed.get()
+            and not _wrote.get()
+            # Tranzaksiya ichida o‘qish-yozish izchil bo‘lsin
+            and not connections[replica.PRIMARY].in_atomic_block
+            and replica.is_configured()
+            and replica.is_fresh()
+        ):
+            return replica.REPLICA
+        return replica.PRIMARY
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)  # Shu so‘rovning qolgan o‘qishlari — o‘z yozuvini ko‘rsin
+        return replica.PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Ikkala alias — bir xil ma'lumot
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == replica.PRIMARY  # Replika sxemani snapshot bilan oladi
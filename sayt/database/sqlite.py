@@ -0,0 +1,115 @@
+import logging
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+
+from .replica import REPLICA
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# SQLite ishlash profili — connection_created signalida qo‘llanadi.
+#
+#   journal_mode=WAL      — o‘quvchilar yozuvchini to‘smaydi (va aksincha)
+#   synchronous=NORMAL    — WAL da xavfsiz, har commit da fsync yo‘q
+#   mmap_size / cache_size — o‘qishlar sahifa keshidan va xotiraga proyeksiyadan
+#
+# busy_timeout — DATABASES OPTIONS 'timeout' orqali, BEGIN IMMEDIATE —
+# OPTIONS 'transaction_mode' orqali (config/settings.py).
+# Sozlamada SQLITE_PRAGMAS bilan alohida qiymatlarni almashtirish mumkin.
+# ------------------------------------------------------------------
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # 256 MB
+    'cache_size': -64 * 1024,  # Manfiy — KiB da: 64 MB
+    'temp_store': 'MEMORY',
+    'wal_autocheckpoint': 1000,  # sahifa
+}
+LOCK_WAIT_WARNING = 0.2  # soniya: yozish qulfini bundan uzoq kutish — logga
+
+
+def get_pragmas():
+    return {**DEFAULT_PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if connection.alias == REPLICA:
+            cursor.execute("PRAGMA query_only = 1")  # Router xatosi replikaga yoza olmasin
+    if log_lock_waits not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_lock_waits)
+
+
+def log_lock_waits(execute, sql, params, many, context):
+    """BEGIN (IMMEDIATE) — yozish qulfi shu yerda kutiladi: uzoq kutish va 'locked' xatolari logga"""
+    if not sql.startswith('BEGIN'):
+        return execute(sql, params, many, context)
+    start = time.monotonic()
+    try:
+        return execute(sql, params, many, context)
+    except Exception as exc:
+        if 'locked' in str(exc):
+            logger.error("Yozish qulfi olinmadi (%.2f s kutildi): %s", time.monotonic() - start, exc)
+        raise
+    finally:
+        waited = time.monotonic() - start
+        if waited >= LOCK_WAIT_WARNING:
+            logger.warning("Yozish qulfi %.2f s kutildi", waited)
+
+
+# ------------------------------------------------------------------
+# dbhealth buyrug‘i uchun o‘lchovlar
+# ------------------------------------------------------------------
+def current_pragmas(connection):
+    names = [*DEFAULT_PRAGMAS, 'busy_timeout', 'page_size', 'foreign_keys']
+    with connection.cursor() as cursor:
+        values = {}
+        for name in names:
+            cursor.execute(f"PRAGMA {name}")
+            values[name] = cursor.fetchone()[0]
+    return values
+
+
+def checkpoint_status(connection, mode='PASSIVE'):
+    """WAL holati: busy, wal dagi sahifalar, ko‘chirilganlari, lag (sahifa va bayt)"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA wal_checkpoint({mode})")
+        busy, log_frames, checkpointed = cursor.fetchone()
+        cursor.execute("PRAGMA page_size")
+        page_size = cursor.fetchone()[0]
+    wal_path = f"{connection.settings_dict['NAME']}-wal"
+    lag = max(log_frames - checkpointed, 0) if log_frames >= 0 else 0
+    return {
+        'busy': bool(busy),
+        'wal_frames': max(log_frames, 0),
+        'checkpointed': max(checkpointed, 0),
+        'lag_frames': lag,
+        'lag_bytes': lag * page_size,
+        'wal_size': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+    }
+
+
+def probe_write_lock(path, samples=5, timeout=5.0):
+    """Alohida ulanishda BEGIN IMMEDIATE ni o‘lchash — qaytaradi: [kutish soniyalari] (None — olinmadi)"""
+    waits = []
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    try:
+        for _ in range(samples):
+            start = time.monotonic()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                waits.append(None)
+                continue
+            waits.append(time.monotonic() - start)
+            conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+    return waits
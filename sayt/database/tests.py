@@ -0,0 +1,139 @@
+import copy
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock
+
+from django.db import OperationalError, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from blogs.views import BlogDetailView, BlogListView, PostCardsView
+from . import replica
+from .middleware import PIN_COOKIE, PIN_SLACK, PrimaryReplicaMiddleware
+from .routers import PrimaryReplicaRouter, primary_reads, use_primary
+from .sqlite import current_pragmas, log_lock_waits
+
+
+# ------------------------------------------------------------------
+# Marshrut: kesh to‘ldiradigan / validator hisoblaydigan o‘qishlar — asosiy bazadan
+# ------------------------------------------------------------------
+@mock.patch.object(replica, 'is_fresh', return_value=True)
+@mock.patch.object(replica, 'is_configured', return_value=True)
+class PrimaryReadsTests(SimpleTestCase):
+    def route(self, view, method='get'):
+        """Middleware orqali so‘rov: view ichida tanlangan o‘qish bazasi"""
+        chosen = []
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            chosen.append(PrimaryReplicaRouter().db_for_read(None))
+            with use_primary():
+                chosen.append(PrimaryReplicaRouter().db_for_read(None))
+            chosen.append(PrimaryReplicaRouter().db_for_read(None))
+            return mock.Mock(spec=['set_cookie'])
+
+        middleware = PrimaryReplicaMiddleware(get_response)
+        middleware(getattr(RequestFactory(), method)('/'))
+        return chosen
+
+    def test_plain_read_uses_replica_outside_use_primary(self, *mocks):
+        self.assertEqual(self.route(lambda request: None), [replica.REPLICA, replica.PRIMARY, replica.REPLICA])
+
+    def test_marked_view_reads_primary(self, *mocks):
+        view = primary_reads(lambda request: None)
+        self.assertEqual(self.route(view), [replica.PRIMARY] * 3)
+
+    def test_writes_never_use_replica(self, *mocks):
+        self.assertEqual(self.route(lambda request: None, 'post'), [replica.PRIMARY] * 3)
+
+    def test_cached_and_conditional_blog_views_are_marked(self, *mocks):
+        for view_class in (BlogListView, PostCardsView, BlogDetailView):
+            with self.subTest(view=view_class.__name__):
+                self.assertTrue(view_class.as_view().reads_primary)
+
+
+# ------------------------------------------------------------------
+# primary_pin cookie: muddati — navbatdagi snapshot gacha, REPLICA_MAX_LAG emas
+# ------------------------------------------------------------------
+@override_settings(REPLICA_REFRESH_INTERVAL=30, REPLICA_MAX_LAG=300)
+@mock.patch.object(replica, 'is_configured', return_value=True)
+class PinCookieTests(SimpleTestCase):
+    NOW = 1_000_000.0
+
+    def post(self, snapshot_taken):
+        def get_response(request):
+            PrimaryReplicaRouter().db_for_write(None)
+            return HttpResponse()
+
+        with mock.patch.object(replica, 'snapshot_time', return_value=snapshot_taken), \
+                mock.patch('database.middleware.time.time', return_value=self.NOW):
+            response = PrimaryReplicaMiddleware(get_response)(RequestFactory().post('/'))
+        return response.cookies.get(PIN_COOKIE)
+
+    def test_pin_lasts_until_the_next_snapshot(self, is_configured):
+        cookie = self.post(snapshot_taken=self.NOW - 10)
+        self.assertEqual(cookie['max-age'], 20 + PIN_SLACK)
+        self.assertEqual(float(cookie.value), self.NOW)
+
+    def test_late_refresher_pins_until_replica_goes_stale(self, is_configured):
+        self.assertEqual(self.post(snapshot_taken=self.NOW - 100)['max-age'], 200)
+
+    def test_no_pin_when_replica_is_unused(self, is_configured):
+        for taken in (None, self.NOW - 400):
+            with self.subTest(taken=taken):
+                self.assertIsNone(self.post(snapshot_taken=taken))
+
+
+# ------------------------------------------------------------------
+# SQLite profili: yangi fayl ulanishiga PRAGMA lar, replika — faqat o‘qish
+# ------------------------------------------------------------------
+class SqliteProfileTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'db.sqlite3')
+
+    def connect(self, alias='profile', **options):
+        settings_dict = copy.deepcopy(connections['default'].settings_dict)
+        settings_dict['NAME'] = self.path
+        settings_dict['OPTIONS'].update(options)
+        connection = DatabaseWrapper(settings_dict, alias=alias)
+        connection.ensure_connection()
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_new_connection_gets_the_profile(self):
+        connection = self.connect()
+        pragmas = current_pragmas(connection)
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['synchronous'], 1)  # NORMAL
+        self.assertEqual(pragmas['busy_timeout'], 20000)
+        self.assertEqual(pragmas['cache_size'], -64 * 1024)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+        self.assertEqual(connection.execute_wrappers.count(log_lock_waits), 1)
+
+    @override_settings(SQLITE_PRAGMAS={'synchronous': 'FULL'})
+    def test_setting_overrides_a_pragma(self):
+        self.assertEqual(current_pragmas(self.connect())['synchronous'], 2)
+
+    def test_replica_connection_is_read_only(self):
+        with self.connect().cursor() as cursor:
+            cursor.execute("CREATE TABLE t (x)")
+        with mock.patch('database.sqlite.REPLICA', 'profile-replica'):  # Haqiqiy replika aliasi testda band
+            replica_connection = self.connect(alias='profile-replica')
+        with self.assertRaises(OperationalError), replica_connection.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+
+    def test_lock_timeout_is_logged(self):
+        connection = self.connect(timeout=0.1)
+        holder = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(holder.close)
+        holder.execute("BEGIN IMMEDIATE")
+        with self.assertLogs('database.sqlite', 'WARNING') as logs, self.assertRaises(OperationalError):
+            with connection.cursor() as cursor:
+                cursor.execute("BEGIN IMMEDIATE")  # atomic() ham shu so‘rovni yuboradi
+        self.assertIn('Yozish qulfi olinmadi', logs.output[0])
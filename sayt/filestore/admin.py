@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import Blob, StoredFile
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('digest', 'size', 'refcount', 'created_at')
+    search_fields = ('digest',)
+    readonly_fields = ('digest', 'size', 'refcount', 'created_at')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ('name', 'blob')
+    search_fields = ('name', 'blob__digest')
+    readonly_fields = ('name', 'blob')
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,179 @@
+import mimetypes
+import os
+import re
+from stat import S_ISREG
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+from .storage import CHUNK_SIZE
+
+# ------------------------------------------------------------------
+# Fayllarni HTTP orqali berish: ETag / Last-Modified (304),
+# Range (206, If-Range bilan) va ixtiyoriy ravishda uzatishni
+# veb-serverga topshirish (X-Accel-Redirect / X-Sendfile).
+#
+#   FILE_OFFLOAD = 'x-accel'     — nginx, FILE_OFFLOAD_PREFIX = '/protected/'
+#   FILE_OFFLOAD = 'x-sendfile'  — Apache mod_xsendfile / lighttpd
+#   FILE_OFFLOAD = None          — Python o‘zi uzatadi (standart)
+# ------------------------------------------------------------------
+OFFLOAD_X_ACCEL = 'x-accel'
+OFFLOAD_X_SENDFILE = 'x-sendfile'
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_metadata(storage, name):
+    """Kesh uchun yengil lug‘at: name, size, mtime, etag.
+
+    Deduplikatsiya qilingan fayllar uchun ETag — kontentning sha256 xeshi,
+    boshqalar uchun hajm va o‘zgartirilgan vaqtdan.
+    """
+    from .models import StoredFile
+
+    size = storage.size(name)
+    mtime = int(storage.get_modified_time(name).timestamp())
+    digest = StoredFile.objects.filter(name=name).values_list('blob__digest', flat=True).first()
+    return {
+        'name': name,
+        'size': size,
+        'mtime': mtime,
+        'etag': quote_etag(digest or f"{size:x}-{mtime:x}"),
+    }
+
+
+def stat_metadata(storage, name):
+    """file_metadata ning bazasiz varianti — faqat os.stat (har so‘rovda arzon)"""
+    path = storage.path(name)
+    stat = os.stat(path)
+    if not S_ISREG(stat.st_mode):
+        raise IsADirectoryError(path)
+    size, mtime = stat.st_size, int(stat.st_mtime)
+    return {'name': name, 'size': size, 'mtime': mtime, 'etag': quote_etag(f"{size:x}-{mtime:x}")}
+
+
+def parse_range(header, size):
+    """'bytes=a-b' → (start, end) yoki None (butun fayl) yoki False (qondirib bo‘lmaydi).
+
+    Bir nechta oraliqli so‘rovlar butun fayl bilan javob oladi.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # bytes=-500 — oxirgi 500 bayt
+        length = int(last)
+        if not length or not size:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def pick_encoding(request, available):
+    """Mavjud kodlashlardan (afzallik tartibida) mijoz qabul qiladigan birinchisi yoki None"""
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding'))
+    return next((encoding for encoding in available if encoding in accepted), None)
+
+
+def _if_range_matches(request, meta):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == meta['etag']  # Faqat kuchli ETag
+    return parse_http_date_safe(if_range) == meta['mtime']
+
+
+def _read_range(file, start, length):
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def serve_file(request, storage, meta, content_type=None, filename=None, cache_control=None, offload=True):
+    """meta — file_metadata() natijasi (odatda keshdan), diskka stat so‘rovisiz.
+
+    offload=False — FILE_OFFLOAD sozlamasidan qat'i nazar Python o‘zi uzatadi.
+    """
+    content_type = content_type or mimetypes.guess_type(meta['name'])[0] or 'application/octet-stream'
+    headers = {
+        'ETag': meta['etag'],
+        'Last-Modified': http_date(meta['mtime']),
+        'Accept-Ranges': 'bytes',
+    }
+    if cache_control:
+        headers['Cache-Control'] = cache_control
+
+    not_modified = get_conditional_response(request, etag=meta['etag'], last_modified=meta['mtime'])
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified.headers.setdefault(header, value)
+        return not_modified
+
+    if filename:
+        headers['Content-Disposition'] = content_disposition_header(False, filename)
+
+    offload = getattr(settings, 'FILE_OFFLOAD', None) if offload else None
+    if offload:
+        # Range va uzatishni veb-server bajaradi — Python ishchisi darhol bo‘shaydi
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if offload == OFFLOAD_X_ACCEL:
+            response['X-Accel-Redirect'] = settings.FILE_OFFLOAD_PREFIX.rstrip('/') + '/' + meta['name']
+        elif offload == OFFLOAD_X_SENDFILE:
+            response['X-Sendfile'] = storage.path(meta['name'])
+        else:
+            raise ValueError(f"Noma'lum FILE_OFFLOAD: {offload!r}")
+        return response
+
+    size = meta['size']
+    byte_range = parse_range(request.headers.get('Range'), size) if _if_range_matches(request, meta) else None
+    if byte_range is False:
+        response = HttpResponse(status=416, headers=headers)
+        response['Content-Range'] = f"bytes */{size}"
+        return response
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response['Content-Length'] = size
+        return response
+
+    if byte_range is None:
+        response = FileResponse(storage.open(meta['name'], 'rb'), content_type=content_type)
+        for header, value in headers.items():  # FileResponse o‘zining Content-Disposition ini qo‘yadi
+            response[header] = value
+        return response
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _read_range(storage.open(meta['name'], 'rb'), start, length),
+        status=206, content_type=content_type, headers=headers,
+    )
+    response['Content-Range'] = f"bytes {start}-{end}/{size}"
+    response['Content-Length'] = length
+    return response
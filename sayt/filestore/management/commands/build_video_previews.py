@@ -0,0 +1,27 @@
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from filestore.video import FFmpegError, build_poster, build_preview, make_faststart, poster_name, preview_name
+
+
+class Command(BaseCommand):
+    help = "Static videolar uchun poster kadr va past bitreytli preview yaratish (ffmpeg), keyin collectstatic"
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', default=['main.mp4'], help="Static nomlar (standart: main.mp4)")
+        parser.add_argument('--faststart', action='store_true', help="Asl faylni ham faststart ga qayta joylash")
+
+    def handle(self, *args, **options):
+        for name in options['names']:
+            source = finders.find(name)
+            if not source:
+                raise CommandError(f"Static fayl topilmadi: {name}")
+            base = source[:-len(name)]  # static katalogi
+            try:
+                if options['faststart']:
+                    make_faststart(source)
+                build_poster(source, base + poster_name(name))
+                build_preview(source, base + preview_name(name))
+            except FFmpegError as exc:
+                raise CommandError(f"{name}: {exc}")
+            self.stdout.write(self.style.SUCCESS(f"{name}: {poster_name(name)}, {preview_name(name)}"))
@@ -0,0 +1,59 @@
+import os
+import uuid
+
+from django.core.files.storage import storages
+from django.core.management.base import BaseCommand, CommandError
+
+from filestore.models import StoredFile
+from filestore.storage import BLOB_DIR, DeduplicatingStorage, blob_name, path_digest
+
+
+class Command(BaseCommand):
+    help = "MEDIA_ROOT dagi mavjud fayllarni bloblarga ko‘chirish: takroriy nusxalar qattiq havolaga aylanadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Faqat hisobot, hech narsa o‘zgartirilmaydi")
+
+    def handle(self, *args, **options):
+        storage = storages['default']
+        if not isinstance(storage, DeduplicatingStorage):
+            raise CommandError("STORAGES['default'] DeduplicatingStorage emas")
+
+        dry_run = options['dry_run']
+        registered = set(StoredFile.objects.values_list('name', flat=True))
+        scanned = duplicates = freed = 0
+
+        for root, dirs, files in os.walk(storage.location):
+            if os.path.relpath(root, storage.location) == '.':
+                dirs[:] = [d for d in dirs if d != BLOB_DIR]
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, storage.location).replace('\\', '/')
+                if name in registered:
+                    continue
+                scanned += 1
+                digest, size = path_digest(path)
+                blob_path = storage.path(blob_name(digest))
+
+                if os.path.exists(blob_path):
+                    if not os.path.samefile(path, blob_path):
+                        duplicates += 1
+                        freed += size
+                        if not dry_run:
+                            # Atomik almashtirish: avval havola, keyin o‘rniga qo‘yish
+                            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+                            os.link(blob_path, tmp)
+                            os.replace(tmp, path)
+                elif not dry_run:
+                    # Birinchi nusxa — o‘zi blob bo‘ladi (nusxa ko‘chirilmaydi)
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    os.link(path, blob_path)
+
+                if not dry_run:
+                    storage.register(name, digest, size)
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Tekshirildi: {scanned} ta fayl, takroriy: {duplicates} ta, "
+            f"bo‘shagan joy: {freed / 1024 / 1024:.1f} MB"
+        ))
@@ -0,0 +1,79 @@
+import mimetypes
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.storage import FileSystemStorage
+
+from .http import pick_encoding, serve_file
+from .staticfiles import ENCODINGS, ENCODING_SUFFIXES
+
+# ------------------------------------------------------------------
+# STATIC_ROOT dan fayllarni berish (WSGI va ASGI uchun bir xil):
+#   - xeshlangan nomlar — bir yillik immutable kesh;
+#   - Accept-Encoding bo‘yicha oldindan siqilgan .br / .gz nusxa;
+#   - ETag/304 va Range — filestore.http.serve_file orqali.
+# Fayllar ro‘yxati birinchi so‘rovda bir marta o‘qiladi (deploy → restart).
+# ------------------------------------------------------------------
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+
+class StaticFilesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL
+        self.storage = FileSystemStorage(location=settings.STATIC_ROOT)
+        self._index = None
+        self._immutable = None
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def _load(self):
+        with self._lock:
+            if self._index is not None:
+                return
+            index = {}
+            root = str(settings.STATIC_ROOT)
+            for directory, _, files in os.walk(root):
+                for filename in files:
+                    path = os.path.join(directory, filename)
+                    stat = os.stat(path)
+                    name = os.path.relpath(path, root).replace('\\', '/')
+                    index[name] = (stat.st_size, int(stat.st_mtime))
+            self._immutable = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+            self._index = index
+
+    def _meta(self, name):
+        size, mtime = self._index[name]
+        return {'name': name, 'size': size, 'mtime': mtime, 'etag': f'"{size:x}-{mtime:x}"'}
+
+    def serve(self, request, name):
+        if self._index is None:
+            self._load()
+        if name not in self._index:
+            return None  # Keyingi ishlovchilar (DEBUG da — finders) yoki 404
+
+        # Eng yaxshi mavjud nusxa: br → gzip → asl fayl
+        encodings = [encoding for encoding in ENCODINGS if name + ENCODING_SUFFIXES[encoding] in self._index]
+        encoding = pick_encoding(request, encodings)
+        variant = name + ENCODING_SUFFIXES[encoding] if encoding else name
+
+        response = serve_file(
+            request, self.storage, self._meta(variant),
+            content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream',
+            cache_control=IMMUTABLE_CACHE_CONTROL if name in self._immutable else REVALIDATE_CACHE_CONTROL,
+            offload=False,
+        )
+        if encoding and response.status_code in (200, 206):
+            response['Content-Encoding'] = encoding
+        if encodings:
+            response['Vary'] = 'Accept-Encoding'
+        return response
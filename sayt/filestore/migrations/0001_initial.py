@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Hajmi (bayt)')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='Havolalar soni')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Blob',
+                'verbose_name_plural': 'Bloblar',
+            },
+        ),
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=500, unique=True, verbose_name='Fayl nomi')),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='files', to='filestore.blob')),
+            ],
+            options={
+                'verbose_name': 'Fayl',
+                'verbose_name_plural': 'Fayllar',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+# ------------------------------------------------------------------
+# Kontent bo‘yicha manzillanadigan bloblar (sha256) va ularga havolalar
+# ------------------------------------------------------------------
+class Blob(models.Model):
+    digest = models.CharField(max_length=64, unique=True, verbose_name="SHA-256")
+    size = models.PositiveBigIntegerField(verbose_name="Hajmi (bayt)")
+    refcount = models.PositiveIntegerField(default=0, verbose_name="Havolalar soni")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Blob"
+        verbose_name_plural = "Bloblar"
+
+    def __str__(self):
+        return f"{self.digest[:12]}… ({self.refcount})"
+
+
+class StoredFile(models.Model):
+    name = models.CharField(max_length=500, unique=True, verbose_name="Fayl nomi")
+    blob = models.ForeignKey(Blob, on_delete=models.PROTECT, related_name='files')
+
+    class Meta:
+        verbose_name = "Fayl"
+        verbose_name_plural = "Fayllar"
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,82 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli  # ixtiyoriy: pip install brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# ------------------------------------------------------------------
+# collectstatic: fayl nomlariga kontent xeshi (app.3f2a9c.css) va
+# har bir matnli fayl yoniga oldindan siqilgan .gz / .br nusxalar.
+# Ularni filestore.middleware.StaticFilesMiddleware beradi.
+# ------------------------------------------------------------------
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.htm',
+    '.ico', '.eot', '.ttf', '.otf',
+}
+MIN_COMPRESS_SIZE = 512  # bayt
+MIN_SAVING = 0.95  # Siqilgan nusxa 95% dan kichik bo‘lmasa — saqlanmaydi
+ENCODINGS = ('br', 'gzip')
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def _compressors():
+    compressors = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors['br'] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def compress_file(path):
+    """Bitta fayl uchun .gz / .br yozish — qaytaradi: yaratilgan kodlashlar"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return []
+    created = []
+    for encoding, compress in _compressors().items():
+        compressed = compress(data)
+        if len(compressed) < len(data) * MIN_SAVING:
+            with open(path + ENCODING_SUFFIXES[encoding], 'wb') as f:
+                f.write(compressed)
+            created.append(encoding)
+    return created
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Shablonda manifestda yo‘q fayl bo‘lsa — xato emas, xeshsiz nom
+    manifest_strict = False
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def tolerant_converter(matchobj):
+            try:
+                return converter(matchobj)
+            except ValueError:
+                # Havola qilingan fayl yo‘q (masalan, kutubxonadagi .map) — o‘zgarishsiz qoldiramiz
+                return matchobj.group(0)
+
+        return tolerant_converter
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = []
+        for name, hashed_name, result in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(result, Exception):
+                processed.append(name)
+                processed.append(hashed_name)
+            yield name, hashed_name, result
+
+        if dry_run:
+            return
+        targets = sorted({
+            self.path(name) for name in processed
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS and self.exists(name)
+        })
+        # zlib/brotli GIL ni bo‘shatadi — oqimlar yetarli
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(compress_file, targets))
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import shutil
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+# ------------------------------------------------------------------
+# Deduplikatsiya qiluvchi fayl ombori.
+# Har bir kontent bir marta saqlanadi: .blobs/ab/cd/<sha256>
+# Fayl nomlari (upload_to bo‘yicha) — blobga qattiq havola (hardlink),
+# ya'ni URL va yo‘llar o‘zgarmaydi, takroriy yuklash esa qo‘shimcha disk
+# joyi talab qilmaydi (vaqtinchalik fayl xeshlangach o‘chadi).
+# ------------------------------------------------------------------
+BLOB_DIR = '.blobs'
+TMP_DIR = f'{BLOB_DIR}/tmp'
+CHUNK_SIZE = 64 * 1024
+
+
+def blob_name(digest):
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+def file_digest(chunks):
+    """Bo‘laklar oqimidan (sha256, hajm)"""
+    sha = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        sha.update(chunk)
+        size += len(chunk)
+    return sha.hexdigest(), size
+
+
+def path_digest(path):
+    with open(path, 'rb') as f:
+        return file_digest(iter(lambda: f.read(CHUNK_SIZE), b''))
+
+
+class DeduplicatingStorage(FileSystemStorage):
+
+    def _save(self, name, content):
+        # Bitta o‘tish: vaqtinchalik faylga yozish bilan birga xeshlaymiz.
+        # Blob allaqachon bo‘lsa — vaqtinchalik fayl o‘chadi, nom mavjud blobga bog‘lanadi
+        tmp, digest, size = self._write_tmp(content)
+        self._store_blob(tmp, digest)
+        name = self._link(blob_name(digest), name)
+        self.register(name, digest, size)
+        return name
+
+    def _write_tmp(self, content):
+        """Kontentni vaqtinchalik faylga yozish — qaytaradi: (nom, sha256, hajm)"""
+        name = f"{TMP_DIR}/{uuid.uuid4().hex}"
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            with open(path, 'xb') as tmp:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+        return name, sha.hexdigest(), size
+
+    def _store_blob(self, tmp, digest):
+        target = self.path(blob_name(digest))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(self.path(tmp), target)
+        except FileExistsError:
+            pass  # Parallel yuklash — kontent bir xil
+        finally:
+            os.remove(self.path(tmp))
+
+    def _link(self, source, name):
+        source_path = self.path(source)
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        while True:
+            try:
+                os.link(source_path, full_path)
+            except FileExistsError:
+                name = self.get_available_name(name)
+                full_path = self.path(name)
+            except OSError:
+                # Qattiq havola qo‘llab-quvvatlanmaydi (boshqa disk) — oddiy nusxa
+                with open(source_path, 'rb') as src, open(full_path, 'xb') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                break
+            else:
+                break
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return os.path.relpath(full_path, self.location).replace('\\', '/')
+
+    def register(self, name, digest, size):
+        """Diskdagi nomni blobga bog‘lash (havolalar soni bilan).
+        _save va dedupe_media (mavjud fayllar) chaqiradi; takroriy chaqiruv — o‘zgarishsiz."""
+        from .models import Blob, StoredFile
+
+        with transaction.atomic():
+            blob, _ = Blob.objects.get_or_create(digest=digest, defaults={'size': size})
+            # Nom bazada qolgan bo‘lishi mumkin (fayl diskdan tashqaridan o‘chirilgan) — eski blob havolasi bo‘shaydi
+            previous = StoredFile.objects.select_for_update().filter(name=name).values_list('blob_id', flat=True).first()
+            if previous == blob.pk:
+                return  # Havola allaqachon hisoblangan
+            StoredFile.objects.update_or_create(name=name, defaults={'blob': blob})
+            Blob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1)
+            orphaned = _release_blob(previous) if previous is not None else None
+        if orphaned:
+            super().delete(blob_name(orphaned))
+
+    def delete(self, name):
+        from .models import StoredFile
+
+        super().delete(name)
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is None:
+                return
+            stored.delete()
+            orphaned = _release_blob(stored.blob_id)
+        if orphaned:
+            super().delete(blob_name(orphaned))
+
+
+def _release_blob(blob_id):
+    """Havolalar sonini kamaytirish; 0 ga tushsa — blob qatori o‘chiriladi.
+    Qaytaradi: o‘chgan blob digesti (faylini commit dan keyin o‘chirish uchun) yoki None"""
+    from .models import Blob
+
+    # refcount__gt=0: takroriy bo‘shatish (masalan, saqlash xatosidan keyin delete) CHECK ni buzmasin
+    Blob.objects.filter(pk=blob_id, refcount__gt=0).update(refcount=F('refcount') - 1)
+    digest = Blob.objects.filter(pk=blob_id, refcount__lte=0).values_list('digest', flat=True).first()
+    if digest is not None:
+        Blob.objects.filter(pk=blob_id).delete()
+    return digest
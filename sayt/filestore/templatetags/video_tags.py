@@ -0,0 +1,27 @@
+from django import template
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+from filestore.video import poster_name, preview_name
+
+register = template.Library()
+
+
+def _static_variant_url(name):
+    """Hosila fayl mavjud bo‘lsa — uning static URL i, aks holda bo‘sh satr.
+    Keshlanmaydi: build_video_previews keyin yaratgan (yoki yangilagan) nusxa qayta ishga tushirishsiz ko‘rinadi"""
+    if staticfiles_storage.exists(name) or finders.find(name):
+        return staticfiles_storage.url(name)
+    return ''
+
+
+@register.simple_tag
+def video_poster(name):
+    """{% video_poster 'main.mp4' as poster %} — build_video_previews yaratgan kadr"""
+    return _static_variant_url(poster_name(name))
+
+
+@register.simple_tag
+def video_preview(name):
+    """{% video_preview 'main.mp4' as preview %} — mobil uchun past bitreytli nusxa"""
+    return _static_variant_url(preview_name(name))
@@ -0,0 +1,256 @@
+import os
+import shutil
+import gzip
+import tempfile
+from unittest import mock
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.http import HttpResponseNotFound
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.http import http_date
+
+from .http import parse_range, serve_file, stat_metadata
+from .middleware import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, StaticFilesMiddleware
+from .models import Blob, StoredFile
+from .storage import TMP_DIR, DeduplicatingStorage, _release_blob, blob_name
+from .templatetags.video_tags import video_poster, video_preview
+
+
+# ------------------------------------------------------------------
+# Deduplikatsiya: havolalar soni va yetim bloblar
+# ------------------------------------------------------------------
+class DeduplicatingStorageTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = DeduplicatingStorage(location=self.root)
+
+    def test_same_content_shares_one_blob(self):
+        first = self.storage.save('a/one.txt', ContentFile(b'bir xil'))
+        second = self.storage.save('b/two.txt', ContentFile(b'bir xil'))
+        blob = Blob.objects.get()
+        self.assertEqual(blob.refcount, 2)
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+
+        self.storage.delete(first)
+        self.assertEqual(Blob.objects.get().refcount, 1)
+        self.storage.delete(second)
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(os.path.exists(self.storage.path(blob_name(blob.digest))))
+
+    def test_reused_name_releases_previous_blob(self):
+        name = self.storage.save('a/file.txt', ContentFile(b'eski'))
+        old = Blob.objects.get()
+        os.remove(self.storage.path(name))  # Fayl tashqaridan o‘chdi, qator qoldi
+
+        self.assertEqual(self.storage.save(name, ContentFile(b'yangi')), name)
+        self.assertFalse(Blob.objects.filter(pk=old.pk).exists())
+        self.assertFalse(os.path.exists(self.storage.path(blob_name(old.digest))))
+        self.assertEqual(StoredFile.objects.get(name=name).blob.refcount, 1)
+
+    def test_content_is_read_once(self):
+        content = ContentFile(b'bir marta')
+        with mock.patch.object(ContentFile, 'chunks', wraps=content.chunks) as chunks:
+            name = self.storage.save('a/once.txt', content)
+        self.assertEqual(chunks.call_count, 1)
+        with self.storage.open(name) as f:
+            self.assertEqual(f.read(), b'bir marta')
+        self.assertEqual(os.listdir(self.storage.path(TMP_DIR)), [])
+
+    def test_double_release_stops_at_zero(self):
+        # Avvalgi bo‘shatish sonni 0 ga tushirgan, lekin qator qolgan
+        blob = Blob.objects.create(digest='0' * 64, size=1, refcount=0)
+        self.assertEqual(_release_blob(blob.pk), blob.digest)  # CHECK (refcount >= 0) buzilmaydi
+        self.assertFalse(Blob.objects.exists())
+        self.assertIsNone(_release_blob(blob.pk))
+
+    def test_register_existing_file_is_idempotent(self):
+        name = self.storage.save('a/file.txt', ContentFile(b'bor'))
+        blob = Blob.objects.get()
+        for _ in range(2):  # dedupe_media qayta ishga tushdi
+            self.storage.register(name, blob.digest, blob.size)
+        self.assertEqual(Blob.objects.get().refcount, 1)
+
+    def test_reused_name_with_same_content_is_counted_once(self):
+        name = self.storage.save('a/file.txt', ContentFile(b'bir xil'))
+        os.remove(self.storage.path(name))
+        self.storage.save(name, ContentFile(b'bir xil'))
+        self.assertEqual(Blob.objects.get().refcount, 1)
+
+
+# ------------------------------------------------------------------
+# HTTP: Range (206/416), If-Range va shartli GET (304)
+# ------------------------------------------------------------------
+class ParseRangeTests(SimpleTestCase):
+    def test_satisfiable_ranges(self):
+        cases = {
+            'bytes=0-9': (0, 9),
+            'bytes=10-': (10, 99),
+            'bytes=90-200': (90, 99),
+            'bytes=-10': (90, 99),
+            'bytes=-500': (0, 99),
+            ' bytes=5-5 ': (5, 5),
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 100), expected)
+
+    def test_whole_file_for_missing_or_unsupported_ranges(self):
+        for header in (None, '', 'bytes=-', 'bytes=0-1,5-6', 'items=0-1', 'bytes=a-b'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_unsatisfiable_ranges(self):
+        for header, size in (('bytes=100-', 100), ('bytes=9-5', 100), ('bytes=-0', 100), ('bytes=-5', 0), ('bytes=0-', 0)):
+            with self.subTest(header=header, size=size):
+                self.assertIs(parse_range(header, size), False)
+
+
+class ServeFileTests(SimpleTestCase):
+    CONTENT = bytes(range(256)) * 4
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.storage = FileSystemStorage(location=root)
+        self.storage.save('doc.pdf', ContentFile(self.CONTENT))
+        self.meta = stat_metadata(self.storage, 'doc.pdf')
+        self.factory = RequestFactory()
+
+    def serve(self, method='get', **headers):
+        request = getattr(self.factory, method)('/doc.pdf', headers=headers)
+        return serve_file(request, self.storage, self.meta, cache_control='private, max-age=60', offload=False)
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_full_response_has_validators(self):
+        response = self.serve()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.CONTENT)
+        self.assertEqual(response['ETag'], self.meta['etag'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Cache-Control'], 'private, max-age=60')
+
+    def test_range_returns_206(self):
+        response = self.serve(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), self.CONTENT[10:20])
+        self.assertEqual(response['Content-Range'], f"bytes 10-19/{len(self.CONTENT)}")
+        self.assertEqual(response['Content-Length'], '10')
+
+        response = self.serve(Range='bytes=-4')
+        self.assertEqual(self.body(response), self.CONTENT[-4:])
+
+    def test_unsatisfiable_range_returns_416(self):
+        response = self.serve(Range=f"bytes={len(self.CONTENT)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f"bytes */{len(self.CONTENT)}")
+
+    def test_if_range_with_current_validator_honours_range(self):
+        for validator in (self.meta['etag'], http_date(self.meta['mtime'])):
+            with self.subTest(validator=validator):
+                response = self.serve(Range='bytes=0-0', If_Range=validator)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(self.body(response), self.CONTENT[:1])
+
+    def test_if_range_with_stale_validator_sends_whole_file(self):
+        for validator in ('"eski"', 'W/' + self.meta['etag'], http_date(self.meta['mtime'] - 60)):
+            with self.subTest(validator=validator):
+                response = self.serve(Range='bytes=0-0', If_Range=validator)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.body(response), self.CONTENT)
+
+    def test_conditional_get_returns_304(self):
+        for headers in ({'If-None-Match': self.meta['etag']}, {'If-Modified-Since': http_date(self.meta['mtime'])}):
+            with self.subTest(headers=headers):
+                response = self.serve(**headers)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], self.meta['etag'])
+                self.assertEqual(response.content, b'')
+        self.assertEqual(self.serve(If_None_Match='"boshqa"').status_code, 200)
+
+    def test_head_has_length_without_body(self):
+        response = self.serve('head')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], str(len(self.CONTENT)))
+        self.assertEqual(response.content, b'')
+
+    @override_settings(FILE_OFFLOAD='x-accel', FILE_OFFLOAD_PREFIX='/protected/media/')
+    def test_offload_hands_the_file_to_the_web_server(self):
+        request = self.factory.get('/doc.pdf', headers={'Range': 'bytes=0-9'})
+        response = serve_file(request, self.storage, self.meta)
+        self.assertEqual(response.status_code, 200)  # Range ni nginx bajaradi
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/media/doc.pdf')
+        self.assertEqual(response.content, b'')
+
+
+class VideoTagsTests(SimpleTestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.root = root
+        storages = {'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}
+        settings = self.settings(STATIC_ROOT=root, STATICFILES_DIRS=[], STORAGES=storages)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_variant_built_later_is_picked_up(self):
+        self.assertEqual(video_preview('main.mp4'), '')
+        with open(os.path.join(self.root, 'main.preview.mp4'), 'wb') as f:
+            f.write(b'mp4')
+        self.assertEqual(video_preview('main.mp4'), '/static/main.preview.mp4')
+        self.assertEqual(video_poster('main.mp4'), '')
+
+
+class CompressedStaticFilesTests(SimpleTestCase):
+    CSS = b'body { color: #333; }\n' * 100
+
+    def setUp(self):
+        source, root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        for directory in (source, root):
+            self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(source, 'app.css'), 'wb') as f:
+            f.write(self.CSS)
+        settings = self.settings(
+            STATIC_ROOT=root, STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={'staticfiles': {'BACKEND': 'filestore.staticfiles.CompressedManifestStaticFilesStorage'}},
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.hashed = staticfiles_storage.stored_name('app.css')
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponseNotFound())
+        self.factory = RequestFactory()
+
+    def get(self, name, **headers):
+        return self.middleware(self.factory.get(f'/static/{name}', headers=headers))
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_collectstatic_writes_hashed_and_gzip_copies(self):
+        self.assertNotEqual(self.hashed, 'app.css')
+        with open(staticfiles_storage.path(self.hashed + '.gz'), 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), self.CSS)
+
+    def test_hashed_name_is_served_compressed_and_immutable(self):
+        response = self.get(self.hashed, Accept_Encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(gzip.decompress(self.body(response)), self.CSS)
+
+    def test_plain_name_without_gzip_support(self):
+        response = self.get('app.css')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Cache-Control'], REVALIDATE_CACHE_CONTROL)
+        self.assertEqual(self.body(response), self.CSS)
+        self.assertEqual(self.get('yoq.css').status_code, 404)
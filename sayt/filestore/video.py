@@ -0,0 +1,55 @@
+import os
+import shutil
+import subprocess
+
+# ------------------------------------------------------------------
+# Fon videosi uchun hosila fayllar (asl fayl yonida):
+#   main.mp4 → main.poster.jpg (birinchi kadr), main.preview.mp4 (past bitreyt, mobil)
+# Hammasi "faststart" — moov atomi boshida, ijro birinchi bo‘lakdan boshlanadi.
+# ------------------------------------------------------------------
+POSTER_WIDTH = 1280
+PREVIEW_WIDTH = 854
+PREVIEW_MAXRATE = '600k'
+
+
+def poster_name(name):
+    return f"{os.path.splitext(name)[0]}.poster.jpg"
+
+
+def preview_name(name):
+    return f"{os.path.splitext(name)[0]}.preview.mp4"
+
+
+class FFmpegError(Exception):
+    pass
+
+
+def _ffmpeg(*args):
+    binary = shutil.which('ffmpeg')
+    if binary is None:
+        raise FFmpegError("ffmpeg topilmadi")
+    result = subprocess.run([binary, '-y', '-loglevel', 'error', *args], capture_output=True, text=True)
+    if result.returncode:
+        raise FFmpegError(result.stderr.strip())
+
+
+def build_poster(source, target):
+    _ffmpeg('-i', source, '-frames:v', '1', '-vf', f'scale={POSTER_WIDTH}:-2', '-q:v', '4', target)
+
+
+def build_preview(source, target):
+    # Fon videosi ovozsiz — audio yo‘lakchasi tashlanadi
+    _ffmpeg(
+        '-i', source, '-an', '-vf', f'scale={PREVIEW_WIDTH}:-2',
+        '-c:v', 'libx264', '-preset', 'slow', '-crf', '30',
+        '-maxrate', PREVIEW_MAXRATE, '-bufsize', '1200k',
+        '-pix_fmt', 'yuv420p', '-movflags', '+faststart', target,
+    )
+
+
+def make_faststart(source):
+    """Asl faylni qayta kodlamasdan moov atomini boshiga ko‘chirish"""
+    root, ext = os.path.splitext(source)
+    tmp = f"{root}.faststart{ext}"
+    _ffmpeg('-i', source, '-c', 'copy', '-movflags', '+faststart', tmp)
+    os.replace(tmp, source)
@@ -0,0 +1,24 @@
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.views.decorators.http import require_safe
+
+from .http import serve_file, stat_metadata
+
+# Yuklangan fayllar nomi o‘zgarmaydi (takrorda — yangi nom), lekin almashtirilishi mumkin:
+# bir kun keshlanadi, keyin ETag bilan tekshiriladi
+MEDIA_CACHE_CONTROL = 'public, max-age=86400'
+
+
+@require_safe
+def serve(request, path):
+    """MEDIA fayllari: Range / If-Range, 304 va FileResponse (wsgi.file_wrapper → sendfile).
+    FILE_OFFLOAD yoqilgan bo‘lsa — uzatishni veb-server bajaradi."""
+    # .blobs/ (kontent ombori) va boshqa yashirin yo‘llar ochiq emas
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404
+    try:
+        meta = stat_metadata(default_storage, path)
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError, SuspiciousFileOperation):
+        raise Http404
+    return serve_file(request, default_storage, meta, cache_control=MEDIA_CACHE_CONTROL)
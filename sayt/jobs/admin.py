@@ -0,0 +1,23 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = [field.name for field in Job._meta.fields]
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Qayta navbatga qo‘yish")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.PENDING, attempts=0, run_at=timezone.now(), finished_at=None,
+        )
+        self.message_user(request, f"{updated} ta vazifa navbatga qo‘yildi")
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = "Fon vazifalari"
+
+    def ready(self):
+        # Har bir ilovaning tasks.py dagi @task funksiyalarini ro‘yxatga olish
+        autodiscover_modules('tasks')
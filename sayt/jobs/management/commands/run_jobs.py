@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import requeue_stale, run_pending, worker_id
+
+
+class Command(BaseCommand):
+    help = "Fon vazifalari ishchisi: navbatdagi vazifalarni bajaradi (xatoda qayta urinadi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Navbat bo‘shagach chiqish")
+        parser.add_argument('--sleep', type=float, default=1.0, help="Navbat bo‘sh bo‘lganda kutish (soniya)")
+        parser.add_argument('--batch-size', type=int, default=10, help="Bir tsiklda egallanadigan vazifalar")
+
+    def handle(self, *args, **options):
+        worker = worker_id()
+        self.stdout.write(f"Ishchi ishga tushdi: {worker}")
+        try:
+            while True:
+                requeue_stale()
+                results = run_pending(worker, options['batch_size'])
+                if results:
+                    summary = ', '.join(f"{status}: {count}" for status, count in sorted(results.items()))
+                    self.stdout.write(summary)
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Ishchi to‘xtadi"))
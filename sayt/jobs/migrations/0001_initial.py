@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Vazifa')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Argumentlar')),
+                ('status', models.CharField(choices=[('pending', 'Navbatda'), ('running', 'Bajarilmoqda'), ('done', 'Bajarildi'), ('failed', 'Xato')], default='pending', max_length=10, verbose_name='Holat')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Urinishlar')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Urinishlar chegarasi')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Bajarish vaqti')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Ishchi')),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, verbose_name='Oxirgi xato')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Vazifa',
+                'verbose_name_plural': 'Vazifalar',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_at'], name='jobs_job_status_f5c023_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+# ------------------------------------------------------------------
+# Bazadagi vazifalar navbati — alohida broker kerak emas.
+# Ishchi: python manage.py run_jobs
+# ------------------------------------------------------------------
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, "Navbatda"),
+        (RUNNING, "Bajarilmoqda"),
+        (DONE, "Bajarildi"),
+        (FAILED, "Xato"),
+    )
+
+    name = models.CharField(max_length=100, verbose_name="Vazifa")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Argumentlar")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="Holat")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Urinishlar")
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name="Urinishlar chegarasi")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Bajarish vaqti")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Ishchi")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, verbose_name="Oxirgi xato")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Vazifa"
+        verbose_name_plural = "Vazifalar"
+        ordering = ['-created_at']
+        indexes = [
+            # Ishchi so‘rovi: status='pending' AND run_at <= now ORDER BY run_at
+            models.Index(fields=['status', 'run_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
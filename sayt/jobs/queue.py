@@ -0,0 +1,118 @@
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# @task bilan ro‘yxatga olingan funksiyalar, navbatga qo‘yish va
+# ishchi tomonidan bajarish (qayta urinishlar — eksponensial kechikish).
+# ------------------------------------------------------------------
+RETRY_BASE_DELAY = 10  # soniya: 10, 20, 40, ...
+STALE_AFTER = timedelta(minutes=10)  # Ishchi o‘lib qolsa — vazifa qayta navbatga
+
+_registry = {}
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def task(name, max_attempts=3):
+    """Funksiyani vazifa sifatida ro‘yxatga olish: func.delay(**kwargs) — navbatga qo‘yadi"""
+    def decorator(func):
+        _registry[name] = func
+        func.task_name = name
+        func.delay = lambda run_at=None, **kwargs: enqueue(name, kwargs, run_at=run_at, max_attempts=max_attempts)
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, run_at=None, max_attempts=3):
+    """Vazifa yozuvini yaratish — joriy tranzaksiya bilan birga saqlanadi"""
+    if name not in _registry:
+        raise UnknownTask(name)
+    return Job.objects.create(
+        name=name, payload=payload or {}, run_at=run_at or timezone.now(), max_attempts=max_attempts,
+    )
+
+
+def enqueue_many(name, payloads, max_attempts=3):
+    """Ko‘p vazifani bitta bulk_create bilan navbatga qo‘yish"""
+    if name not in _registry:
+        raise UnknownTask(name)
+    now = timezone.now()
+    return Job.objects.bulk_create(
+        [Job(name=name, payload=payload, run_at=now, max_attempts=max_attempts) for payload in payloads],
+        batch_size=500,
+    )
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def requeue_stale():
+    """Uzoq vaqt 'running' da qolgan (ishchi to‘xtab qolgan) vazifalarni qaytarish"""
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=timezone.now() - STALE_AFTER).update(
+        status=Job.PENDING, locked_by='', locked_at=None,
+    )
+
+
+def claim(worker, limit=10):
+    """Bajarilishi kerak bo‘lgan vazifalarni atomik egallash.
+
+    SQLite da SELECT ... FOR UPDATE SKIP LOCKED yo‘q — shartli UPDATE bilan:
+    boshqa ishchi ulgurib olgan vazifa 0 qator qaytaradi.
+    """
+    claimed = []
+    candidates = Job.objects.filter(status=Job.PENDING, run_at__lte=timezone.now()).order_by('run_at', 'pk')
+    for pk in candidates.values_list('pk', flat=True)[:limit]:
+        now = timezone.now()
+        if Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+        ):
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'pk'))
+
+
+def run_job(job):
+    """Bitta vazifani bajarish — qaytaradi: yakuniy holat"""
+    try:
+        func = _registry.get(job.name)
+        if func is None:
+            raise UnknownTask(job.name)
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Vazifa %s #%s xato bilan tugadi (%s-urinish)", job.name, job.pk, job.attempts)
+        if job.attempts < job.max_attempts:
+            delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+            fields = {'status': Job.PENDING, 'run_at': timezone.now() + timedelta(seconds=delay)}
+        else:
+            fields = {'status': Job.FAILED, 'finished_at': timezone.now()}
+        Job.objects.filter(pk=job.pk).update(last_error=error, locked_by='', locked_at=None, **fields)
+        return fields['status']
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE, finished_at=timezone.now(), locked_by='', locked_at=None, last_error='',
+    )
+    return Job.DONE
+
+
+def run_pending(worker=None, limit=10):
+    """Bitta tsikl: egallash va bajarish — qaytaradi: {holat: soni}"""
+    worker = worker or worker_id()
+    results = {}
+    for job in claim(worker, limit):
+        close_old_connections()
+        status = run_job(job)
+        results[status] = results.get(status, 0) + 1
+    return results
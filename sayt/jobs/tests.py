@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import RETRY_BASE_DELAY, STALE_AFTER, UnknownTask, claim, enqueue, requeue_stale, run_pending, task
+
+calls = []
+
+
+@task('jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task('jobs.tests.fail', max_attempts=2)
+def fail():
+    raise ValueError("ataylab")
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_queues_and_worker_runs(self):
+        job = record.delay(value=7)
+        self.assertEqual((job.status, job.payload, job.max_attempts), (Job.PENDING, {'value': 7}, 3))
+        self.assertEqual(run_pending(worker='w1'), {Job.DONE: 1})
+        self.assertEqual(calls, [7])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.DONE, 1, ''))
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(UnknownTask):
+            enqueue('jobs.tests.yoq')
+
+    def test_future_job_waits(self):
+        record.delay(run_at=timezone.now() + timedelta(minutes=5), value=1)
+        self.assertEqual(run_pending(), {})
+        self.assertEqual(calls, [])
+
+    def test_failure_backs_off_then_fails(self):
+        job = fail.delay()
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertEqual(run_pending(), {Job.PENDING: 1})
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('ValueError: ataylab', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=RETRY_BASE_DELAY - 1))
+        self.assertEqual(run_pending(), {})  # Kechikish tugamagan
+
+        later = job.run_at + timedelta(seconds=1)
+        with mock.patch('django.utils.timezone.now', return_value=later), self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertEqual(run_pending(), {Job.FAILED: 1})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_claimed_job_is_not_taken_twice(self):
+        job = record.delay(value=1)
+        self.assertEqual([claimed.pk for claimed in claim('w1')], [job.pk])
+        self.assertEqual(claim('w2'), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.RUNNING, 'w1'))
+
+    def test_stale_running_job_is_requeued(self):
+        job = record.delay(value=1)
+        claim('w1')
+        self.assertEqual(requeue_stale(), 0)
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - STALE_AFTER - timedelta(seconds=1))
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(run_pending(worker='w2'), {Job.DONE: 1})
+        self.assertEqual(calls, [1])
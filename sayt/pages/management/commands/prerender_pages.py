@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from pages.prerender import PRERENDER_ROOT, render_pages
+
+
+class Command(BaseCommand):
+    help = "Rahbariyat va abituriyentlar sahifalarini oldindan render qilish (deploy paytida, collectstatic dan keyin)"
+
+    def handle(self, *args, **options):
+        manifest = render_pages()
+        for path, entry in manifest.items():
+            self.stdout.write(f"{path} → {entry['file']}")
+        self.stdout.write(self.style.SUCCESS(f"Tayyor: {len(manifest)} ta sahifa ({PRERENDER_ROOT})"))
@@ -0,0 +1,54 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+from filestore.http import pick_encoding, serve_file
+from filestore.staticfiles import ENCODINGS, ENCODING_SUFFIXES
+
+from .prerender import PRERENDER_ROOT, prerendered_pages
+
+# Brauzer bir soat qayta so‘ramaydi, keyin ETag bilan tekshiradi (304)
+PAGE_CACHE_CONTROL = 'public, max-age=3600, stale-while-revalidate=86400'
+
+
+class PrerenderedPagesMiddleware:
+    """prerender_pages yozgan HTML ni sessiya/auth/CSRF middleware laridan oldin berish.
+
+    Manifest yo‘q yoki shablon o‘zgargan bo‘lsa — so‘rov odatdagidek view ga o‘tadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.storage = FileSystemStorage(location=PRERENDER_ROOT)
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and not request.GET:
+            entry = prerendered_pages.get(request.path_info)
+            if entry is not None:
+                return self.serve(request, entry)
+        return self.get_response(request)
+
+    def serve(self, request, entry):
+        name = entry['file']
+        encodings = [encoding for encoding in ENCODINGS if self.storage.exists(name + ENCODING_SUFFIXES[encoding])]
+        encoding = pick_encoding(request, encodings)
+        variant = name + ENCODING_SUFFIXES[encoding] if encoding else name
+        size = self.storage.size(variant)
+        meta = {
+            'name': variant,
+            'size': size,
+            'mtime': int(os.stat(self.storage.path(variant)).st_mtime),
+            # Kodlash bo‘yicha farqlanadi — Range/If-Range uchun kuchli ETag
+            'etag': f'"{entry["digest"]}-{encoding or "identity"}"',
+        }
+        response = serve_file(
+            request, self.storage, meta,
+            content_type='text/html; charset=utf-8', cache_control=PAGE_CACHE_CONTROL, offload=False,
+        )
+        if encoding and response.status_code in (200, 206):
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        # XFrameOptionsMiddleware gacha yetib bormaymiz
+        response.setdefault('X-Frame-Options', getattr(settings, 'X_FRAME_OPTIONS', 'DENY'))
+        return response
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.template import loader
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.urls import reverse
+
+from filestore.staticfiles import ENCODING_SUFFIXES, compress_file
+
+# ------------------------------------------------------------------
+# O‘zgarmas sahifalarni deploy paytida oldindan render qilish:
+#   prerendered/leadership.html (+ .gz / .br) va manifest.json
+# Manifestda shablonlar (extends/include zanjiri) ning mtime lari saqlanadi —
+# shablon o‘zgarsa, sahifa yana jonli render qilinadi.
+# ------------------------------------------------------------------
+PRERENDER_ROOT = str(getattr(settings, 'PRERENDER_ROOT', settings.BASE_DIR / 'prerendered'))
+MANIFEST_NAME = 'manifest.json'
+
+# URL nomi → shablon (sahifalarda so‘rovga bog‘liq ma'lumot yo‘q)
+PAGES = {
+    'leadership': 'pages/leadership.html',
+    'students': 'pages/student.html',
+}
+
+
+def template_dependencies(template_name, seen=None):
+    """Shablon va u extends/include qilgan barcha shablonlar fayl yo‘llari"""
+    seen = seen if seen is not None else {}
+    template = loader.get_template(template_name).template
+    if template.origin.name in seen.values():
+        return seen
+    seen[template_name] = template.origin.name
+    for node_type, attr in ((ExtendsNode, 'parent_name'), (IncludeNode, 'template')):
+        for node in template.nodelist.get_nodes_by_type(node_type):
+            name = getattr(node, attr).var
+            if isinstance(name, str) and name not in seen:  # Faqat literal nomlar
+                template_dependencies(name, seen)
+    return seen
+
+
+def render_pages():
+    """Barcha sahifalarni yozish — qaytaradi: manifest lug‘ati"""
+    os.makedirs(PRERENDER_ROOT, exist_ok=True)
+    manifest = {}
+    for url_name, template_name in PAGES.items():
+        html = loader.render_to_string(template_name).encode()
+        filename = f"{url_name}.html"
+        path = os.path.join(PRERENDER_ROOT, filename)
+        with open(path, 'wb') as f:
+            f.write(html)
+        for suffix in ENCODING_SUFFIXES.values():
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)  # Eski nusxa yangi HTML ga mos emas
+        compress_file(path)
+        manifest[reverse(url_name)] = {
+            'file': filename,
+            'digest': hashlib.sha256(html).hexdigest()[:32],
+            'templates': {
+                origin: os.stat(origin).st_mtime_ns
+                for origin in template_dependencies(template_name).values()
+            },
+        }
+    tmp = os.path.join(PRERENDER_ROOT, MANIFEST_NAME + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(PRERENDER_ROOT, MANIFEST_NAME))
+    return manifest
+
+
+class PrerenderedPages:
+    """Manifest — jarayonda keshlanadi, fayl o‘zgarsa qayta o‘qiladi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._manifest = {}
+        self._manifest_mtime = None
+
+    def _reload(self):
+        path = os.path.join(PRERENDER_ROOT, MANIFEST_NAME)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._manifest, self._manifest_mtime = {}, None
+            return
+        if mtime != self._manifest_mtime:
+            with self._lock, open(path) as f:
+                self._manifest, self._manifest_mtime = json.load(f), mtime
+
+    def get(self, path):
+        """Yangi (shablonlari o‘zgarmagan) yozuv yoki None"""
+        self._reload()
+        entry = self._manifest.get(path)
+        if entry is None:
+            return None
+        for origin, mtime in entry['templates'].items():
+            try:
+                if os.stat(origin).st_mtime_ns != mtime:
+                    return None
+            except FileNotFoundError:
+                return None
+        return entry
+
+
+prerendered_pages = PrerenderedPages()
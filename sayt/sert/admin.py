@@ -1,11 +1,38 @@
-from django.contrib import admin
+import zipfile
+
+from django import forms
+from django.contrib import admin, messages
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.html import format_html
+from database.routers import use_primary
+from jobs.models import Job
 from .models import Certificate
+from .importer import import_status, queue_import
+from .tasks import import_certificate_archive
+
+
+class CertificateImportForm(forms.Form):
+    archive = forms.FileField(label="PDF lar arxivi (ZIP)")
+    titles = forms.FileField(label="Sarlavhalar (CSV: filename,title)")
+
+    def clean_archive(self):
+        archive = self.cleaned_data["archive"]
+        if not zipfile.is_zipfile(archive):
+            raise forms.ValidationError("ZIP arxivni o‘qib bo‘lmadi")
+        archive.seek(0)
+        return archive
+
 
 @admin.register(Certificate)
 class CertificateAdmin(admin.ModelAdmin):
-    list_display = ("title", "uuid", "created_at", "qr_preview")
-    readonly_fields = ("uuid", "qr_preview")
+    list_display = ("title", "uuid", "created_at", "page_preview", "page_count", "qr_preview")
+    readonly_fields = ("uuid", "page_preview", "page_count", "qr_preview", "text")
+    # PDF ichidagi matn (F.I.Sh. va h.k.) bo‘yicha ham qidiriladi
+    search_fields = ("title", "text")
+    change_list_template = "admin/sert/certificate/change_list.html"
 
     # QR kodni ko'rsatish
     def qr_preview(self, obj):
@@ -19,4 +46,79 @@ class CertificateAdmin(admin.ModelAdmin):
             )
         return "QR kod hali yaratilmagan"
 
-    qr_preview.short_description = "QR Kod"
\ No newline at end of file
+    qr_preview.short_description = "QR Kod"
+
+    # Birinchi sahifa eskizi — PDF ni ochmasdan tekshirish uchun
+    def page_preview(self, obj):
+        if obj.preview:
+            return format_html(
+                '<a href="{}" target="_blank"><img src="{}" width="120" loading="lazy" style="border:1px solid #ddd;"/></a>',
+                obj.pdf.url,
+                obj.preview.url
+            )
+        return "Eskiz hali yaratilmagan"
+
+    page_preview.short_description = "Eskiz"
+
+    def get_queryset(self, request):
+        # Ro‘yxatda katta matn ustuni kerak emas
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name == "sert_certificate_changelist":
+            queryset = queryset.defer("text")
+        return queryset
+
+    def get_urls(self):
+        return [
+            path("import/", self.admin_site.admin_view(self.import_view), name="sert_certificate_import"),
+            path("import/<int:job_id>/", self.admin_site.admin_view(self.import_status_view),
+                 name="sert_certificate_import_status"),
+            path("import/<int:job_id>/manifest.csv", self.admin_site.admin_view(self.import_manifest_view),
+                 name="sert_certificate_import_manifest"),
+        ] + super().get_urls()
+
+    # Ommaviy import — fayllar saqlanib, fon vazifasiga (run_jobs) topshiriladi;
+    # holat sahifasida jarayon va tayyor manifest CSV
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            return redirect("admin:sert_certificate_changelist")
+
+        form = CertificateImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            job = queue_import(form.cleaned_data["archive"], form.cleaned_data["titles"])
+            messages.success(request, "Import navbatga qo‘yildi — fon ishchisi bajaradi")
+            return redirect("admin:sert_certificate_import_status", job_id=job.pk)
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Sertifikatlarni import qilish",
+            "form": form,
+        }
+        return TemplateResponse(request, "admin/sert/certificate/import.html", context)
+
+    def _import_job(self, request, job_id):
+        if not self.has_add_permission(request):
+            raise Http404
+        with use_primary():  # Holat ishchida o‘zgaradi — replika snapshoti eski bo‘lishi mumkin
+            return get_object_or_404(Job, pk=job_id, name=import_certificate_archive.task_name)
+
+    def import_status_view(self, request, job_id):
+        job = self._import_job(request, job_id)
+        status = import_status(job.payload["token"])
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import holati",
+            "job": job,
+            "finished": job.status in (Job.DONE, Job.FAILED),
+            **status,
+        }
+        return TemplateResponse(request, "admin/sert/certificate/import_status.html", context)
+
+    def import_manifest_view(self, request, job_id):
+        job = self._import_job(request, job_id)
+        manifest = import_status(job.payload["token"])["manifest"]
+        if manifest is None:
+            raise Http404("Manifest hali tayyor emas")
+        return FileResponse(open(manifest, "rb"), as_attachment=True, filename=f"manifest-{job.pk}.csv",
+                            content_type="text/csv; charset=utf-8")
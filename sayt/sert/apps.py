@@ -6,3 +6,4 @@ class CertificatesConfig(AppConfig):
 
     def ready(self):
         import sert.signals
+        import sert.checks
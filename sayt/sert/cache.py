@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from database.routers import use_primary
+from filestore.http import file_metadata
+
+# ------------------------------------------------------------------
+# UUID → PDF metama'lumotlari keshi (QR skanerlashda bazaga va diskka
+# murojaat qilmaslik uchun). Sertifikat o‘zgarsa — signal o‘chiradi;
+# kesh umumiy (settings.CACHES), o‘chirish barcha ishchilarga yetadi.
+# Qisqa muddat — signalsiz o‘zgarishlar (fayl diskda almashtirildi) uchun.
+# Kesh asosiy bazadan to‘ldiriladi — replika snapshoti eski bo‘lishi mumkin.
+# ------------------------------------------------------------------
+CERTIFICATE_CACHE_TIMEOUT = 60 * 60
+MISSING = 'missing'
+
+
+def certificate_cache_key(uuid):
+    return f"certificate_meta:{uuid}"
+
+
+def get_certificate_meta(uuid):
+    """Keshdan yoki bazadan: {'name', 'size', 'mtime', 'etag', 'title'} yoki None"""
+    from .models import Certificate
+
+    key = certificate_cache_key(uuid)
+    meta = cache.get(key)
+    if meta is None:
+        with use_primary():
+            cert = Certificate.objects.filter(uuid=uuid).only('title', 'pdf').first()
+            if cert is None or not cert.pdf or not default_storage.exists(cert.pdf.name):
+                meta = MISSING
+            else:
+                meta = {**file_metadata(default_storage, cert.pdf.name), 'title': cert.title}
+        cache.set(key, meta, CERTIFICATE_CACHE_TIMEOUT)
+    return None if meta == MISSING else meta
+
+
+def invalidate_certificate_meta(uuid):
+    cache.delete(certificate_cache_key(uuid))
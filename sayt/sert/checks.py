@@ -0,0 +1,15 @@
+from django.core.checks import Warning, register
+
+from . import preview
+
+
+@register()
+def check_preview_renderer(app_configs, **kwargs):
+    """PyMuPDF yo‘q bo‘lsa — eskiz, sahifalar soni va matn jimgina yaratilmay qolmasin"""
+    if preview.is_available():
+        return []
+    return [Warning(
+        "PyMuPDF o‘rnatilmagan: sertifikat eskizlari, sahifalar soni va matni yaratilmaydi",
+        hint="pip install pymupdf, so‘ng: python manage.py build_certificate_previews",
+        id='sert.W001',
+    )]
@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from jobs.queue import enqueue_many
+
+from . import preview
+from .models import Certificate, certificate_upload_path
+from .qr import certificate_url, qr_file_name, render_qr_png
+from .tasks import render_certificate_preview
+
+# ------------------------------------------------------------------
+# Ommaviy import: PDF lar ZIP arxivi + CSV (filename,title).
+# Arxiv a'zolari xotiraga to‘liq o‘qilmasdan omborga oqim bilan yoziladi,
+# yozuvlar bulk_create bilan partiyalab yaratiladi, QR kodlar esa
+# jarayonlar hovuzida parallel chiziladi. Natija — manifest CSV.
+#
+# Hovuz forkserver orqali: bola jarayonlar ota jarayonning ochiq baza
+# ulanishlari va oqimlarini meros qilib olmaydi.
+# ------------------------------------------------------------------
+CHUNK_SIZE = 500
+MANIFEST_HEADER = ('uuid', 'title', 'filename', 'url')
+
+# Admin orqali import — fon vazifasi: CERTIFICATE_IMPORT_ROOT/<token>/ papkasi
+ARCHIVE_NAME = 'archive.zip'
+TITLES_NAME = 'titles.csv'
+MANIFEST_NAME = 'manifest.csv'
+RESULT_NAME = 'result.json'
+PROGRESS_TIMEOUT = 24 * 60 * 60
+
+
+class CertificateImportError(ValueError):
+    pass
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = []  # [(uuid, title, filename), ...]
+        self.missing_title = []  # Arxivda bor, CSV da yo‘q
+        self.missing_file = []  # CSV da bor, arxivda yo‘q
+
+    def write_manifest(self, out):
+        writer = csv.writer(out)
+        writer.writerow(MANIFEST_HEADER)
+        for cert_uuid, title, filename in self.created:
+            writer.writerow((cert_uuid, title, filename, certificate_url(cert_uuid)))
+
+
+def read_titles(csv_file):
+    """CSV (filename,title) → {filename: title}. Bayt oqimi ham, matn oqimi ham bo‘ladi."""
+    if not isinstance(csv_file, io.TextIOBase):
+        csv_file = io.TextIOWrapper(csv_file, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(csv_file)
+    if not reader.fieldnames or not {'filename', 'title'} <= {name.strip() for name in reader.fieldnames}:
+        raise CertificateImportError("CSV sarlavhasi: filename,title bo‘lishi kerak")
+    titles = {}
+    for row in reader:
+        row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        if row['filename'] and row['title']:
+            titles[os.path.basename(row['filename'])] = row['title']
+    return titles
+
+
+def _pdf_members(archive):
+    for member in archive.infolist():
+        filename = os.path.basename(member.filename)
+        if member.is_dir() or member.filename.startswith('__MACOSX/') or not filename.lower().endswith('.pdf'):
+            continue
+        yield member, filename
+
+
+def _store_chunk(archive, chunk):
+    """Fayllarni oqim bilan saqlab, yozuvlarni bitta bulk_create bilan yaratish"""
+    certificates = []
+    try:
+        for member, filename, title in chunk:
+            cert = Certificate(title=title, uuid=uuid.uuid4())
+            with archive.open(member) as stream:
+                cert.pdf.name = default_storage.save(certificate_upload_path(cert, filename), File(stream, filename))
+            certificates.append(cert)
+        with transaction.atomic():
+            Certificate.objects.bulk_create(certificates)
+    except Exception:
+        for cert in certificates:
+            default_storage.delete(cert.pdf.name)
+        raise
+    if any(cert.pk is None for cert in certificates):
+        # RETURNING qo‘llab-quvvatlanmaydigan baza — id larni uuid bo‘yicha olamiz
+        ids = dict(Certificate.objects.filter(uuid__in=[cert.uuid for cert in certificates]).values_list('uuid', 'pk'))
+        for cert in certificates:
+            cert.pk = ids[cert.uuid]
+    return certificates
+
+
+def _render_qr_codes(pool, certificates):
+    for cert, png in zip(certificates, pool.map(render_qr_png, [cert.uuid for cert in certificates])):
+        cert.qr_code.name = default_storage.save(qr_file_name(cert.pk), ContentFile(png))
+    Certificate.objects.bulk_update(certificates, ['qr_code'])
+
+
+def import_certificates(zip_file, csv_file, chunk_size=CHUNK_SIZE, workers=None, progress=None):
+    """zip_file, csv_file — yo‘l yoki fayl obyekti. progress(done, total) — ixtiyoriy."""
+    titles = read_titles(csv_file)
+    result = ImportResult()
+
+    try:
+        archive = zipfile.ZipFile(zip_file)
+    except zipfile.BadZipFile:
+        raise CertificateImportError("ZIP arxivni o‘qib bo‘lmadi")
+
+    with archive, ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver')) as pool:
+        pending = []
+        seen = set()
+        for member, filename in _pdf_members(archive):
+            title = titles.get(filename)
+            if title is None:
+                result.missing_title.append(filename)
+                continue
+            seen.add(filename)
+            pending.append((member, filename, title))
+        result.missing_file = sorted(set(titles) - seen)
+
+        total = len(pending)
+        for start in range(0, total, chunk_size):
+            certificates = _store_chunk(archive, pending[start:start + chunk_size])
+            _render_qr_codes(pool, certificates)
+            if preview.is_available():
+                # bulk_create signal yubormaydi — eskizlar navbatga partiya bilan
+                enqueue_many(render_certificate_preview.task_name, [{'certificate_id': cert.pk} for cert in certificates])
+            result.created.extend((cert.uuid, cert.title, os.path.basename(cert.pdf.name)) for cert in certificates)
+            if progress:
+                progress(len(result.created), total)
+    return result
+
+
+# ------------------------------------------------------------------
+# Admin importi: fayllar diskka saqlanadi, import — jobs navbatidagi vazifa
+# (veb ishchi band bo‘lmaydi). Natija va jarayon — holat sahifasida.
+# ------------------------------------------------------------------
+def import_dir(token):
+    return os.path.join(settings.CERTIFICATE_IMPORT_ROOT, token)
+
+
+def _progress_key(token):
+    return f"certificate_import:{token}"
+
+
+def queue_import(archive, titles):
+    """Yuklangan ZIP va CSV ni saqlab, import vazifasini navbatga qo‘yish — qaytaradi: Job"""
+    from .tasks import import_certificate_archive
+
+    token = uuid.uuid4().hex
+    directory = import_dir(token)
+    os.makedirs(directory)
+    for upload, name in ((archive, ARCHIVE_NAME), (titles, TITLES_NAME)):
+        with open(os.path.join(directory, name), 'wb') as out:
+            for chunk in upload.chunks():
+                out.write(chunk)
+    return import_certificate_archive.delay(token=token)
+
+
+def run_queued_import(token):
+    """Vazifa tanasi: import, manifest.csv va result.json; yuklangan fayllar o‘chiriladi"""
+    directory = import_dir(token)
+    progress = lambda done, total: cache.set(_progress_key(token), (done, total), PROGRESS_TIMEOUT)
+    try:
+        with open(os.path.join(directory, TITLES_NAME), 'rb') as csv_file:
+            result = import_certificates(os.path.join(directory, ARCHIVE_NAME), csv_file, progress=progress)
+    except CertificateImportError as exc:
+        _write_result(directory, {'error': str(exc)})
+        raise
+    finally:
+        for name in (ARCHIVE_NAME, TITLES_NAME):
+            os.remove(os.path.join(directory, name))
+
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', newline='', encoding='utf-8') as out:
+        result.write_manifest(out)
+    _write_result(directory, {
+        'created': len(result.created),
+        'missing_title': result.missing_title,
+        'missing_file': result.missing_file,
+    })
+
+
+def _write_result(directory, data):
+    with open(os.path.join(directory, RESULT_NAME), 'w', encoding='utf-8') as out:
+        json.dump(data, out, ensure_ascii=False)
+
+
+def import_status(token):
+    """{'progress': (done, total) | None, 'result': {...} | None, 'manifest': yo‘l | None}"""
+    directory = import_dir(token)
+    try:
+        with open(os.path.join(directory, RESULT_NAME), encoding='utf-8') as f:
+            result = json.load(f)
+    except FileNotFoundError:
+        result = None
+    manifest = os.path.join(directory, MANIFEST_NAME)
+    return {
+        'progress': cache.get(_progress_key(token)),
+        'result': result,
+        'manifest': manifest if os.path.exists(manifest) else None,
+    }
@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sert import preview
+from sert.models import Certificate
+
+
+class Command(BaseCommand):
+    help = "Sertifikatlar uchun birinchi sahifa eskizi, sahifalar soni va matnni parallel yaratish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--force', action='store_true', help="Eskizi borlarini ham qayta yaratish")
+
+    def handle(self, *args, **options):
+        if not preview.is_available():
+            raise CommandError("PyMuPDF o‘rnatilmagan: pip install pymupdf")
+
+        queryset = Certificate.objects.exclude(pdf='').only('pk', 'pdf').order_by('pk')
+        if not options['force']:
+            queryset = queryset.filter(page_count__isnull=True)
+        total = queryset.count()
+        done = failed = 0
+        last_pk = 0
+
+        # PDF ni chizish va matn olish — alohida jarayonlarda, saqlash — asosiy jarayonda
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                futures = {pool.submit(preview.render_preview, cert.pdf.path): cert for cert in batch}
+                for future in as_completed(futures):
+                    cert = futures[future]
+                    try:
+                        preview.save_preview(cert.pk, cert.pdf.name, future.result())
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"#{cert.pk} {cert.pdf.name}: {exc}")
+                    else:
+                        done += 1
+                self.stdout.write(f"{done + failed}/{total}")
+
+        self.stdout.write(self.style.SUCCESS(f"Tayyor: {done} ta sertifikat, xato: {failed}"))
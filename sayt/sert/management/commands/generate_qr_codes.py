@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from sert.models import Certificate
+from sert.qr import render_qr_png, save_qr
+
+
+class Command(BaseCommand):
+    help = "QR kodi yo‘q barcha sertifikatlar uchun QR yaratish (jarayonlar hovuzida parallel)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Jarayonlar soni (standart — CPU soni)")
+        parser.add_argument('--batch-size', type=int, default=200, help="Bir partiyadagi sertifikatlar soni")
+
+    def handle(self, *args, **options):
+        missing = Certificate.objects.filter(Q(qr_code='') | Q(qr_code__isnull=True)).order_by('pk')
+        total = missing.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS("Barcha sertifikatlarda QR kod bor"))
+            return
+
+        done = 0
+        last_pk = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                batch = list(missing.filter(pk__gt=last_pk).values_list('pk', 'uuid')[:options['batch_size']])
+                if not batch:
+                    break
+                # Rasm chizish — jarayonlarda, saqlash — asosiy jarayonda (bitta DB ulanishi)
+                for (pk, _), png in zip(batch, pool.map(render_qr_png, [uuid for _, uuid in batch])):
+                    save_qr(pk, png)
+                done += len(batch)
+                last_pk = batch[-1][0]
+                self.stdout.write(f"{done}/{total}")
+
+        self.stdout.write(self.style.SUCCESS(f"QR kod yaratildi: {done} ta sertifikat"))
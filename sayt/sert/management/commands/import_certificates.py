@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sert.importer import CHUNK_SIZE, CertificateImportError, import_certificates
+
+
+class Command(BaseCommand):
+    help = "Sertifikatlarni ommaviy import qilish: PDF lar ZIP arxivi + CSV (filename,title)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('zip_path', help="PDF fayllar arxivi")
+        parser.add_argument('csv_path', help="CSV: filename,title")
+        parser.add_argument('--manifest', help="Manifest CSV yo‘li (uuid,title,filename,url); standart — stdout")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Bitta bulk_create dagi yozuvlar")
+        parser.add_argument('--workers', type=int, default=None, help="QR chizuvchi jarayonlar soni")
+
+    def handle(self, *args, **options):
+        progress = lambda done, total: self.stderr.write(f"{done}/{total}")
+        try:
+            with open(options['csv_path'], 'rb') as csv_file:
+                result = import_certificates(
+                    options['zip_path'], csv_file,
+                    chunk_size=options['chunk_size'], workers=options['workers'], progress=progress,
+                )
+        except (OSError, CertificateImportError) as exc:
+            raise CommandError(str(exc))
+
+        if options['manifest']:
+            with open(options['manifest'], 'w', newline='', encoding='utf-8') as out:
+                result.write_manifest(out)
+        else:
+            result.write_manifest(sys.stdout)
+
+        for filename in result.missing_title:
+            self.stderr.write(self.style.WARNING(f"CSV da sarlavha yo‘q: {filename}"))
+        for filename in result.missing_file:
+            self.stderr.write(self.style.WARNING(f"Arxivda fayl yo‘q: {filename}"))
+        self.stderr.write(self.style.SUCCESS(f"Import qilindi: {len(result.created)} ta sertifikat"))
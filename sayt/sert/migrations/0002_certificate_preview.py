@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sert', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='page_count',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='preview',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='sertificate/previews/'),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
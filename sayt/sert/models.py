@@ -2,7 +2,9 @@ import uuid
 from django.db import models
 
 def certificate_upload_path(instance, filename):
-    return f"sertificate/{instance.id}-{instance.uuid}/{filename}"
+    # Ommaviy importda (bulk_create) id hali yo‘q — faqat uuid
+    prefix = f"{instance.id}-{instance.uuid}" if instance.id else instance.uuid
+    return f"sertificate/{prefix}/{filename}"
 
 class Certificate(models.Model):
     title = models.CharField(max_length=255)
@@ -11,5 +13,17 @@ class Certificate(models.Model):
     qr_code = models.ImageField(upload_to="qr_codes/", blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # PDF dan hosila (fon vazifasi to‘ldiradi — sert/preview.py)
+    preview = models.ImageField(upload_to="sertificate/previews/", blank=True, null=True, editable=False)
+    page_count = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    text = models.TextField(blank=True, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # PDF almashtirilganini aniqlash uchun (eskizni qayta yaratish)
+        instance._loaded_pdf = instance.__dict__.get('pdf')
+        return instance
+
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -0,0 +1,80 @@
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+try:
+    import fitz  # PyMuPDF — ixtiyoriy bog‘liqlik
+except ImportError:  # pragma: no cover
+    fitz = None
+
+# ------------------------------------------------------------------
+# Sertifikat PDF dan hosila ma'lumotlar: birinchi sahifa eskizi (WebP),
+# sahifalar soni va matn (admin qidiruvi uchun).
+# render_preview — Django ga bog‘liq emas (jarayonlar hovuzida ishlaydi).
+# ------------------------------------------------------------------
+PREVIEW_WIDTH = 480
+PREVIEW_DIR = 'sertificate/previews'
+MAX_TEXT_PAGES = 10
+
+
+class PreviewUnavailable(RuntimeError):
+    pass
+
+
+def is_available():
+    return fitz is not None
+
+
+def preview_name(certificate_id):
+    return f"{PREVIEW_DIR}/{certificate_id}.webp"
+
+
+def render_preview(source):
+    """PDF yo‘li yoki fayl obyektidan (webp_bytes, page_count, text)"""
+    if fitz is None:
+        raise PreviewUnavailable("PyMuPDF o‘rnatilmagan: pip install pymupdf")
+    if hasattr(source, 'read'):
+        document = fitz.open(stream=source.read(), filetype='pdf')
+    else:
+        document = fitz.open(source)
+    with document:
+        page = document[0]
+        zoom = PREVIEW_WIDTH / page.rect.width
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        image = Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+        buffer = io.BytesIO()
+        image.save(buffer, 'WEBP', quality=80, method=4)
+
+        text = '\n'.join(document[number].get_text().strip() for number in range(min(document.page_count, MAX_TEXT_PAGES)))
+        return buffer.getvalue(), document.page_count, text.strip()
+
+
+def save_preview(certificate_id, pdf_name, rendered):
+    """Natijani saqlash — PDF shu orada almashtirilmagan bo‘lsa. Bitta UPDATE, signalsiz."""
+    from .models import Certificate
+
+    image, page_count, text = rendered
+    old_preview = Certificate.objects.filter(pk=certificate_id).values_list('preview', flat=True).first()
+    name = default_storage.save(preview_name(certificate_id), ContentFile(image))
+    updated = Certificate.objects.filter(pk=certificate_id, pdf=pdf_name).update(
+        preview=name, page_count=page_count, text=text,
+    )
+    if not updated:
+        default_storage.delete(name)
+        return None
+    if old_preview and old_preview != name:
+        default_storage.delete(old_preview)
+    return name
+
+
+def build_preview(certificate_id):
+    from .models import Certificate
+
+    cert = Certificate.objects.filter(pk=certificate_id).only('pdf').first()
+    if cert is None or not cert.pdf:
+        return None
+    with cert.pdf.open('rb') as pdf_file:
+        rendered = render_preview(pdf_file)
+    return save_preview(cert.pk, cert.pdf.name, rendered)
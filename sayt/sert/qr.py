@@ -0,0 +1,39 @@
+from io import BytesIO
+
+import qrcode
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+
+# ------------------------------------------------------------------
+# Sertifikat QR kodlari.
+# render_qr_png — Django ga bog‘liq emas (jarayonlar hovuzida ishlaydi),
+# save_qr — faylni saqlab, bitta UPDATE (signalsiz, qayta save() siz).
+# ------------------------------------------------------------------
+CERTIFICATE_URL = "https://airforce.uz/c/{uuid}/"
+
+
+def certificate_url(uuid):
+    return CERTIFICATE_URL.format(uuid=uuid)
+
+
+def qr_file_name(certificate_id):
+    return f"qr_codes/qr_{certificate_id}.png"
+
+
+def render_qr_png(uuid):
+    buffer = BytesIO()
+    qrcode.make(certificate_url(uuid)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def save_qr(certificate_id, png):
+    """QR faylni saqlash — agar hali yo‘q bo‘lsa. Qaytaradi: fayl nomi yoki None"""
+    from .models import Certificate
+
+    name = default_storage.save(qr_file_name(certificate_id), ContentFile(png))
+    updated = Certificate.objects.filter(Q(qr_code='') | Q(qr_code__isnull=True), pk=certificate_id).update(qr_code=name)
+    if not updated:
+        default_storage.delete(name)  # Sertifikat o‘chirilgan yoki QR allaqachon bor
+        return None
+    return name
@@ -1,34 +1,40 @@
-import qrcode
-from io import BytesIO
-from django.core.files import File
-from django.db.models.signals import post_save
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Certificate
+from .cache import invalidate_certificate_meta
 
-def generate_qr_for_instance(instance):
-    """Berilgan sertifikat uchun QR kod yaratish"""
-    if not instance.qr_code:
-        url = f"https://airforce.uz/c/{instance.uuid}/"
-        qr = qrcode.make(url)
+logger = logging.getLogger(__name__)
 
-        buffer = BytesIO()
-        qr.save(buffer, format='PNG')
-        buffer.seek(0)
+# 1️⃣ Signals - yangi Certificate yaratilganda QR kod navbatga qo‘yiladi
+# (ishchi: python manage.py run_jobs; mavjudlari uchun: generate_qr_codes)
+@receiver(post_save, sender=Certificate)
+def generate_qr_on_save(sender, instance, created, **kwargs):
+    from .tasks import render_certificate_qr
 
-        instance.qr_code.save(
-            f"qr_{instance.id}.png",
-            File(buffer),
-            save=True
-        )
+    if created and not instance.qr_code:
+        render_certificate_qr.delay(certificate_id=instance.pk)
 
-# 1️⃣ Signals - yangi Certificate yaratilganda
+# 2️⃣ PDF yuklanganda yoki almashtirilganda — eskiz, sahifalar soni va matn (fon vazifasi)
 @receiver(post_save, sender=Certificate)
-def generate_qr_on_save(sender, instance, created, **kwargs):
-    if created:
-        generate_qr_for_instance(instance)
+def build_preview_on_save(sender, instance, created, **kwargs):
+    from . import preview
+    from .tasks import render_certificate_preview
+
+    pdf_changed = instance.pdf.name != getattr(instance, '_loaded_pdf', None)
+    instance._loaded_pdf = instance.pdf.name
+    if not (pdf_changed and instance.pdf):
+        return
+    if preview.is_available():
+        render_certificate_preview.delay(certificate_id=instance.pk)
+    else:
+        logger.warning("Sertifikat #%s eskizi yaratilmadi: PyMuPDF o‘rnatilmagan (sert.W001)", instance.pk)
 
-# 2️⃣ Management script - bazadagi barcha QR-larsiz Certificate-larni yaratish
-def generate_qr_for_all_missing():
-    for cert in Certificate.objects.filter(qr_code__isnull=True):
-        generate_qr_for_instance(cert)
-        print(f"QR kod yaratildi: {cert.id} - {cert.title}")
+# 3️⃣ Metama'lumotlar keshi — PDF almashtirilsa yoki sertifikat o‘chirilsa
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_certificate_cache(sender, instance, **kwargs):
+    uuid = instance.uuid
+    transaction.on_commit(lambda: invalidate_certificate_meta(uuid))
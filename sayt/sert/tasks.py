@@ -0,0 +1,25 @@
+from jobs.queue import task
+
+from .models import Certificate
+from .preview import build_preview
+from .qr import render_qr_png, save_qr
+
+
+@task('sert.render_qr')
+def render_certificate_qr(certificate_id):
+    cert = Certificate.objects.filter(pk=certificate_id).only('uuid', 'qr_code').first()
+    if cert is None or cert.qr_code:
+        return
+    save_qr(cert.pk, render_qr_png(cert.uuid))
+
+
+@task('sert.render_preview')
+def render_certificate_preview(certificate_id):
+    build_preview(certificate_id)
+
+
+# Qayta urinilmaydi: yarim bajarilgan import takrorlansa sertifikatlar ikki marta yaratiladi
+@task('sert.import_certificates', max_attempts=1)
+def import_certificate_archive(token):
+    from .importer import run_queued_import
+    run_queued_import(token)
@@ -1,3 +1,131 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
-# Create your tests here.
+from jobs.models import Job
+from jobs.queue import run_job, run_pending
+from . import preview
+from .checks import check_preview_renderer
+from .importer import MANIFEST_HEADER, import_status, queue_import
+from .models import Certificate
+
+
+class MediaTestCase(TestCase):
+    """Fayllar vaqtinchalik MEDIA_ROOT ga yoziladi"""
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings = self.settings(MEDIA_ROOT=root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def make_certificate(self, title='Ali Valiyev'):
+        cert = Certificate(title=title)
+        cert.pdf.save('sertifikat.pdf', ContentFile(b'%PDF-1.4 test'), save=False)
+        cert.save()
+        return cert
+
+
+# ------------------------------------------------------------------
+# Eskiz: PDF render qiluvchi (PyMuPDF) o‘rniga stub
+# ------------------------------------------------------------------
+class CertificatePreviewTests(MediaTestCase):
+    @mock.patch.object(preview, 'render_preview', return_value=(b'RIFF-webp', 2, 'Ali Valiyev\nKurs'))
+    @mock.patch.object(preview, 'is_available', return_value=True)
+    def test_saved_pdf_queues_preview_job(self, is_available, render_preview):
+        cert = self.make_certificate()
+        job = Job.objects.get(name='sert.render_preview')
+        self.assertEqual(job.payload, {'certificate_id': cert.pk})
+
+        self.assertEqual(run_job(job), Job.DONE)
+        cert.refresh_from_db()
+        self.assertEqual((cert.page_count, cert.text), (2, 'Ali Valiyev\nKurs'))
+        self.assertEqual(cert.preview.name, preview.preview_name(cert.pk))
+        with cert.preview.open('rb') as image:
+            self.assertEqual(image.read(), b'RIFF-webp')
+
+    @mock.patch.object(preview, 'render_preview', return_value=(b'webp', 1, ''))
+    @mock.patch.object(preview, 'is_available', return_value=True)
+    def test_replaced_pdf_keeps_result_out(self, is_available, render_preview):
+        cert = self.make_certificate()
+        rendered = preview.render_preview(None)
+        Certificate.objects.filter(pk=cert.pk).update(pdf='sertificate/boshqa.pdf')  # Render paytida almashtirildi
+        self.assertIsNone(preview.save_preview(cert.pk, cert.pdf.name, rendered))
+        self.assertIsNone(Certificate.objects.get(pk=cert.pk).page_count)
+
+    @mock.patch.object(preview, 'fitz', None)
+    def test_missing_renderer_is_reported(self):
+        self.assertEqual([warning.id for warning in check_preview_renderer(None)], ['sert.W001'])
+        with self.assertLogs('sert.signals', 'WARNING'):
+            self.make_certificate()
+        self.assertFalse(Job.objects.filter(name='sert.render_preview').exists())
+        with self.assertRaises(preview.PreviewUnavailable):
+            preview.render_preview('/yoq.pdf')
+
+
+# ------------------------------------------------------------------
+# Admin importi: ZIP + CSV → jobs vazifasi → sertifikatlar, QR kodlar va manifest
+# ------------------------------------------------------------------
+@mock.patch.object(preview, 'is_available', return_value=False)
+class CertificateImportTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings = self.settings(CERTIFICATE_IMPORT_ROOT=root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def archive(self, *names):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name in names:
+                archive.writestr(name, b'%PDF-1.4 ' + name.encode())
+        return SimpleUploadedFile('arxiv.zip', buffer.getvalue())
+
+    def titles(self, rows):
+        out = io.StringIO()
+        csv.writer(out).writerows([('filename', 'title'), *rows])
+        return SimpleUploadedFile('titles.csv', out.getvalue().encode())
+
+    def test_queued_import_creates_certificates_and_manifest(self, is_available):
+        job = queue_import(
+            self.archive('ali.pdf', 'papka/vali.pdf', 'ortiqcha.pdf', 'izoh.txt'),
+            self.titles([('ali.pdf', 'Ali'), ('vali.pdf', 'Vali'), ('yoq.pdf', 'Yo‘q')]),
+        )
+        self.assertEqual((job.name, job.max_attempts), ('sert.import_certificates', 1))
+        self.assertEqual(run_pending(), {Job.DONE: 1})
+
+        status = import_status(job.payload['token'])
+        self.assertEqual(status['progress'], (2, 2))
+        self.assertEqual(status['result'], {'created': 2, 'missing_title': ['ortiqcha.pdf'], 'missing_file': ['yoq.pdf']})
+        with open(status['manifest'], encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(tuple(rows[0]), MANIFEST_HEADER)
+        self.assertEqual(sorted((title, filename) for _, title, filename, _ in rows[1:]), [('Ali', 'ali.pdf'), ('Vali', 'vali.pdf')])
+
+        contents = {}
+        for cert in Certificate.objects.all():
+            self.assertTrue(cert.qr_code)
+            with cert.pdf.open('rb') as pdf:
+                contents[cert.title] = pdf.read()
+        self.assertEqual(contents, {'Ali': b'%PDF-1.4 ali.pdf', 'Vali': b'%PDF-1.4 papka/vali.pdf'})
+        # Yuklangan fayllar o‘chiriladi, faqat natijalar qoladi
+        self.assertEqual(sorted(os.listdir(os.path.dirname(status['manifest']))), ['manifest.csv', 'result.json'])
+
+    def test_bad_archive_is_reported_without_retry(self, is_available):
+        job = queue_import(SimpleUploadedFile('arxiv.zip', b'zip emas'), self.titles([('ali.pdf', 'Ali')]))
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertEqual(run_pending(), {Job.FAILED: 1})  # max_attempts=1
+        self.assertEqual(import_status(job.payload['token'])['result'], {'error': "ZIP arxivni o‘qib bo‘lmadi"})
+        self.assertFalse(Certificate.objects.exists())
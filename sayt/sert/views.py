@@ -1,7 +1,22 @@
-from django.shortcuts import get_object_or_404
-from django.http import FileResponse
-from .models import Certificate
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.views.decorators.http import require_safe
 
+from filestore.http import serve_file
+from .cache import get_certificate_meta
+
+# Brauzer/CDN bir soat qayta so‘ramaydi, keyin ETag bilan tekshiradi (304)
+CACHE_CONTROL = 'public, max-age=3600'
+
+
+@require_safe
 def certificate_view(request, uuid):
-    cert = get_object_or_404(Certificate, uuid=uuid)
-    return FileResponse(cert.pdf.open(), content_type='application/pdf')
\ No newline at end of file
+    meta = get_certificate_meta(uuid)
+    if meta is None:
+        raise Http404("Sertifikat topilmadi")
+    return serve_file(
+        request, default_storage, meta,
+        content_type='application/pdf',
+        filename=f"{meta['title']}.pdf",
+        cache_control=CACHE_CONTROL,
+    )